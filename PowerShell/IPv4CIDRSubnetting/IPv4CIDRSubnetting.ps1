@@ -645,6 +645,138 @@ function Get-IPv4CIDRTranslation
     #>
 }
 
+class IPv4CIDRRecord
+{
+    # Host mask and subnet mask for every subnet suffix from /0 to /32, filled in once when the script is loaded
+    static [uint[]]$HostMaskTable = [uint[]]::new(33)
+    static [uint[]]$SubnetMaskTable = [uint[]]::new(33)
+
+    [uint]$NetworkIP
+    [byte]$SubnetSuffix
+
+    IPv4CIDRRecord([uint]$NetworkIP, [byte]$SubnetSuffix)
+    {
+        $this.NetworkIP = $NetworkIP
+        $this.SubnetSuffix = $SubnetSuffix
+    }
+
+    [uint] BroadcastIP() { return $this.NetworkIP -bor [IPv4CIDRRecord]::HostMaskTable[$this.SubnetSuffix] }
+    [uint] SubnetMask() { return [IPv4CIDRRecord]::SubnetMaskTable[$this.SubnetSuffix] }
+    [uint] HostMask() { return [IPv4CIDRRecord]::HostMaskTable[$this.SubnetSuffix] }
+    # First and last host are not wrapped around to a [uint], same as Get-IPv4CIDRTranslation
+    [long] FirstHost() { return [long]$this.NetworkIP + 1 }
+    [long] LastHost() { return [long]$this.BroadcastIP() - 1 }
+    [long] TotalAddresses() { return [long]$this.HostMask() + 1 }
+
+    [long] Numerical([string]$Name)
+    {
+        if ($Name -eq "NetworkIP")
+        {
+            return $this.NetworkIP
+        }
+
+        return $this.$Name()
+    }
+
+    [string] Octets([string]$Name)
+    {
+        [uint]$value = $this.Numerical($Name) -band 0xFFFFFFFFL
+        return "{0}.{1}.{2}.{3}" -f ($value -shr 24), (($value -shr 16) -band 0xFF), (($value -shr 8) -band 0xFF), ($value -band 0xFF)
+    }
+
+    [string] Binary([string]$Name)
+    {
+        return [Convert]::ToString($this.Numerical($Name) -band 0xFFFFFFFFL, 2).PadLeft(32, '0')
+    }
+
+    [hashtable] ToTranslation()
+    {
+        $translation = @{ TotalAddresses = [uint]$this.TotalAddresses() }
+
+        foreach ($name in "NetworkIP", "BroadcastIP", "SubnetMask", "HostMask", "FirstHost", "LastHost")
+        {
+            $translation[$name] = @{
+                Numerical = $this.Numerical($name);
+                Octets = $this.Octets($name);
+                Binary = $this.Binary($name);
+            }
+        }
+
+        return $translation
+    }
+
+    [string] ToString()
+    {
+        return "$($this.Octets("NetworkIP"))/$($this.SubnetSuffix)"
+    }
+
+    <#
+        .SYNOPSIS
+        Lean version of the Get-IPv4CIDRTranslation hashtable.
+
+        .DESCRIPTION
+        Only the network IP and subnet suffix are stored. The broadcast IP, masks, first and last host and total addresses are methods that look up the masks
+        from the tables, and the octets & binary strings are only formatted when Octets() or Binary() are called. ToTranslation() builds the full hashtable.
+    #>
+}
+
+# Fills in the mask tables with the same cmdlets Get-IPv4CIDRTranslation calls. Debug output is turned off here, otherwise it would print 66 times
+# every time the script is loaded.
+& {
+    $DebugPreference = "SilentlyContinue"
+
+    foreach ($suffix in 0..32)
+    {
+        [IPv4CIDRRecord]::HostMaskTable[$suffix] = Get-HostMaskUInt -HostBitsByte (Get-HostBitsByte -SubnetSuffixNum $suffix)
+        [IPv4CIDRRecord]::SubnetMaskTable[$suffix] = Get-SubnetMaskUInt -SubnetSuffixNum $suffix
+    }
+}
+
+function ConvertTo-IPv4CIDRRecord
+{
+    param([Parameter(Mandatory=$true)][string][ValidatePattern("^(?:(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\/(?:3[0-2]|[1-2]?[0-9])$")]$CIDRAddress)
+
+    [uint]$IpPrefixUInt = Convert-IPStrToIPUInt -IPStr $($CIDRAddress -split "\/")[0]
+    $subnetSuffixNum = [byte]::Parse($($CIDRAddress -split "\/")[1])
+    Write-Debug "Subnet suffix: $($subnetSuffixNum)"
+
+    if (($IpPrefixUInt -band [IPv4CIDRRecord]::HostMaskTable[$subnetSuffixNum]) -ne 0)
+    {
+        Write-Warning "Host bit(s) is not valid when comparing to subnet mask, host bit(s) will be zero!"
+    }
+
+    return [IPv4CIDRRecord]::new($IpPrefixUInt -band [IPv4CIDRRecord]::SubnetMaskTable[$subnetSuffixNum], $subnetSuffixNum)
+
+    <#
+        .SYNOPSIS
+        Translates the IPv4 CIDR address into a lean IPv4CIDRRecord.
+
+        .DESCRIPTION
+        Same as Get-IPv4CIDRTranslation but returns an IPv4CIDRRecord, which only stores the network IP and subnet suffix instead of six hashtables
+        with the octets and binary strings already formatted. Use it when you mostly need the numbers, e.g. translating lots of CIDR addresses.
+
+        .PARAMETER CIDRAddress
+        Input is IPv4 CIDR Address
+
+        .INPUTS
+        None. You can't pipe objects to ConvertTo-IPv4CIDRRecord.
+
+        .OUTPUTS
+        IPv4CIDRRecord. Call BroadcastIP(), SubnetMask(), HostMask(), FirstHost(), LastHost() or TotalAddresses() for the numbers, Octets("BroadcastIP")
+        or Binary("BroadcastIP") for the strings and ToTranslation() for the same hashtable as Get-IPv4CIDRTranslation.
+
+        .EXAMPLE
+        PS> ConvertTo-IPv4CIDRRecord -CIDRAddress "192.168.1.0/24"
+         NetworkIP SubnetSuffix
+         --------- ------------
+        3232235776           24
+
+        .EXAMPLE
+        PS> (ConvertTo-IPv4CIDRRecord -CIDRAddress "10.28.0.0/16").Octets("BroadcastIP")
+        10.28.255.255
+    #>
+}
+
 function Compare-Subnets
 {
     param ([Parameter(Mandatory=$true)][string][ValidatePattern("^(?:(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\/(?:3[0-2]|[1-2]?[0-9])$")]$CIDRAddressA,
@@ -661,7 +793,7 @@ function Compare-Subnets
     [uint]$ipPrefixUIntB = Convert-IPStrToIPUInt -IPStr ($CIDRAddressB -split "\/")[0]
 
     $subnetSuffixNumB = [byte]::Parse($($CIDRAddressB -split "\/")[1])
-    [byte]$hostbitsByteB = Get-HostBitsByte -SubnetSuffixNum $subnetSuffixNumA
+    [byte]$hostbitsByteB = Get-HostBitsByte -SubnetSuffixNum $subnetSuffixNumB
     [uint]$subnetMaskUIntB = Get-SubnetMaskUInt -SubnetSuffixNum $subnetSuffixNumB
     [uint]$networkIpUIntB = Get-NetworkIpAddressUInt -IpPrefixUInt $ipPrefixUIntB -subnetMaskUInt $subnetMaskUIntB
     [uint]$hostMaskByteB = Get-HostMaskUInt -HostBitsByte $hostbitsByteB
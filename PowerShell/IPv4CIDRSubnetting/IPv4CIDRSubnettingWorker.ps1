@@ -0,0 +1,278 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+$dotSourceTimer = [System.Diagnostics.Stopwatch]::StartNew()
+. (Join-Path -Path $PSScriptRoot -ChildPath "IPv4CIDRSubnetting.ps1")
+$dotSourceTimer.Stop()
+
+[string]$FramePrefix = "@@PSWORKER@@"
+
+function Write-WorkerFrame
+{
+    param([Parameter(Mandatory=$true)][hashtable]$Frame)
+
+    [Console]::Out.WriteLine($FramePrefix + (ConvertTo-Json -InputObject $Frame -Compress -Depth 8))
+    [Console]::Out.Flush()
+
+    <#
+        .SYNOPSIS
+        Writes a reply frame back to the test harness.
+
+        .DESCRIPTION
+        Every reply is one line of compressed JSON with the frame prefix in front of it. Anything else that ends up on stdout (e.g. Write-Host) 
+        does not start with the prefix, so the Python side can skip over it.
+
+        .PARAMETER Frame
+        Hashtable that gets converted to JSON.
+
+        .INPUTS
+        None. You can't pipe objects to Write-WorkerFrame.
+
+        .OUTPUTS
+        None. The frame is written straight to stdout.
+    #>
+}
+
+function Invoke-WorkerExpression
+{
+    param([Parameter(Mandatory=$true)][string]$Command, [System.Collections.Generic.List[hashtable]]$TraceRecords)
+
+    if ($null -ne $TraceRecords)
+    {
+        $timer = [System.Diagnostics.Stopwatch]::StartNew()
+        try {
+            $records = & { $ErrorActionPreference = "Stop"; $DebugPreference = "Continue"; Invoke-Expression -Command $Command } 3>&1 5>&1 | ForEach-Object {
+                if ($_ -is [System.Management.Automation.DebugRecord])
+                {
+                    $TraceRecords.Add(@{ ms = $timer.Elapsed.TotalMilliseconds; message = $_.Message })
+                }
+                else
+                {
+                    $_
+                }
+            }
+        }
+        finally {
+            # Added when the cmdlet throws too, the caller still has the messages up to the error
+            $TraceRecords.Add(@{ ms = $timer.Elapsed.TotalMilliseconds; message = "End" })
+        }
+    }
+    else
+    {
+        $records = & { $ErrorActionPreference = "Stop"; Invoke-Expression -Command $Command } 3>&1
+    }
+
+    return @{
+        Output = @($records | Where-Object { $_ -isnot [System.Management.Automation.WarningRecord] });
+        Warnings = [string[]]@($records | Where-Object { $_ -is [System.Management.Automation.WarningRecord] } | ForEach-Object { $_.Message });
+    }
+
+    <#
+        .SYNOPSIS
+        Executes one cmdlet string and splits the output from the warnings.
+
+        .DESCRIPTION
+        Executes the cmdlet string with the IPv4CIDRSubnetting.ps1 functions that were dot-sourced once when the worker started. The warning 
+        stream is redirected to the output stream so warnings (e.g. host bits warning from Get-IPv4CIDRTranslation) can be returned separately.
+        Errors are terminating so the caller can catch them.
+
+        With -TraceRecords the debug stream is turned on and redirected as well, and every Write-Debug message is added to the list with the 
+        milliseconds since the cmdlet started, so the gaps between the messages show where the time goes inside the script. The list belongs 
+        to the caller, so the messages up to an error are kept when the cmdlet throws.
+
+        .PARAMETER Command
+        The cmdlet string to execute, e.g. 'Get-SubnetMaskUInt -SubnetSuffixNum 24'.
+
+        .PARAMETER TraceRecords
+        List the timed Write-Debug messages are added to, tracing is off without it.
+
+        .INPUTS
+        None. You can't pipe objects to Invoke-WorkerExpression.
+
+        .OUTPUTS
+        Hashtable with Output and Warnings keys.
+    #>
+}
+
+function Invoke-WorkerCommand
+{
+    param([Parameter(Mandatory=$true)][string]$Command, [switch]$Trace)
+
+    # Assigned directly, an empty list coming out of an if statement would be unrolled to $null
+    $traceRecords = $null
+    if ($Trace)
+    {
+        $traceRecords = [System.Collections.Generic.List[hashtable]]::new()
+    }
+
+    try {
+        $result = Invoke-WorkerExpression -Command $Command -TraceRecords $traceRecords
+        $reply = @{ output = ($result.Output | Out-String); warnings = $result.Warnings; error = $null }
+    }
+    catch {
+        $reply = @{ output = ""; warnings = @(); error = $_.Exception.Message }
+    }
+
+    if ($Trace)
+    {
+        # Only ever this invocation's messages, including when it failed
+        $reply.trace = $traceRecords.ToArray()
+    }
+
+    return $reply
+
+    <#
+        .SYNOPSIS
+        Executes one cmdlet invocation from the test harness.
+
+        .DESCRIPTION
+        The output is formatted with Out-String so it is exactly what 'pwsh -Command' would have printed. Warnings and errors are returned separately.
+
+        .PARAMETER Command
+        The cmdlet string to execute, e.g. 'Get-SubnetMaskUInt -SubnetSuffixNum 24'.
+
+        .PARAMETER Trace
+        Adds a trace key with the timed Write-Debug messages (see Invoke-WorkerExpression).
+
+        .INPUTS
+        None. You can't pipe objects to Invoke-WorkerCommand.
+
+        .OUTPUTS
+        Hashtable with output, warnings and error keys (and trace with -Trace).
+
+        .EXAMPLE
+        PS> (Invoke-WorkerCommand -Command "Get-SubnetMaskUInt -SubnetSuffixNum 24").output
+        4294967040
+    #>
+}
+
+function Invoke-WorkerBatch
+{
+    param([Parameter(Mandatory=$true)][AllowEmptyCollection()][string[]]$Commands)
+
+    $results = [System.Collections.Generic.List[hashtable]]::new($Commands.Length)
+
+    foreach ($command in $Commands)
+    {
+        try {
+            $result = Invoke-WorkerExpression -Command $command
+            $value = $null
+
+            if ($result.Output.Count -eq 1)
+            {
+                $value = $result.Output[0]
+            }
+            elseif ($result.Output.Count -gt 1)
+            {
+                $value = $result.Output
+            }
+
+            $results.Add(@{ value = $value; warnings = $result.Warnings; error = $null })
+        }
+        catch {
+            $results.Add(@{ value = $null; warnings = @(); error = $_.Exception.Message })
+        }
+    }
+
+    return @{ results = $results }
+
+    <#
+        .SYNOPSIS
+        Executes a batch of cmdlet invocations from the test harness in one round trip.
+
+        .DESCRIPTION
+        Executes every cmdlet string in the batch and returns the values as they are (not formatted with Out-String), so ConvertTo-Json 
+        keeps the types, e.g. unsigned integers are numbers, booleans are true or false and the Get-IPv4CIDRTranslation hashtable is a nested 
+        object. Every cmdlet gets its own error and warnings, so one bad input does not fail the whole batch.
+
+        .PARAMETER Commands
+        The cmdlet strings to execute.
+
+        .INPUTS
+        None. You can't pipe objects to Invoke-WorkerBatch.
+
+        .OUTPUTS
+        Hashtable with a results key, one hashtable with value, warnings and error keys per cmdlet.
+
+        .EXAMPLE
+        PS> (Invoke-WorkerBatch -Commands @("Get-SubnetMaskUInt -SubnetSuffixNum 24", "Get-SubnetMaskUInt -SubnetSuffixNum 33")).results
+        Name                           Value
+        ----                           -----
+        value                          4294967040
+        warnings                       {}
+        error
+        value
+        warnings                       {}
+        error                          Cannot validate argument on parameter 'SubnetSuffixNum'. The 33 argument is greater than the maximum allowed range of 32…
+    #>
+}
+
+Write-WorkerFrame -Frame @{ ready = $true; pid = $PID; dot_source_ms = $dotSourceTimer.Elapsed.TotalMilliseconds }
+
+while ($null -ne ($line = [Console]::In.ReadLine()))
+{
+    if ([string]::IsNullOrWhiteSpace($line))
+    {
+        continue
+    }
+
+    $request = ConvertFrom-Json -InputObject $line
+    $executeTimer = [System.Diagnostics.Stopwatch]::StartNew()
+
+    if ($request.PSObject.Properties.Name -contains "batch")
+    {
+        $reply = Invoke-WorkerBatch -Commands ([string[]]@($request.batch))
+    }
+    else
+    {
+        $reply = Invoke-WorkerCommand -Command $request.command -Trace:($request.trace -eq $true)
+    }
+
+    $reply.id = $request.id
+    $reply.execute_ms = $executeTimer.Elapsed.TotalMilliseconds
+    Write-WorkerFrame -Frame $reply
+}
+
+<#
+    .SYNOPSIS
+    Long running worker for the unit tests so PowerShell only starts and dot-sources IPv4CIDRSubnetting.ps1 once.
+
+    .DESCRIPTION
+    Starting pwsh and dot-sourcing IPv4CIDRSubnetting.ps1 for every assertion is where most of the time in test_ip_v4_cidr_subnetting.py went.
+    This worker dot-sources the script once and then reads requests from stdin, one JSON object per line:
+        {"id": 1, "command": "Get-SubnetMaskUInt -SubnetSuffixNum 24"}
+
+    And writes one framed JSON reply per request to stdout:
+        @@PSWORKER@@{"id":1,"output":"4294967040\n","warnings":[],"error":null}
+
+    Or a whole batch of cmdlets in one request, where every cmdlet gets its own value (as JSON), warnings and error:
+        {"id": 2, "batch": ["Get-SubnetMaskUInt -SubnetSuffixNum 24", "Test-IPInSubnet -IPStr \"10.28.0.23\" -CIDRAddress \"10.28.0.0/16\""]}
+        @@PSWORKER@@{"id":2,"results":[{"value":4294967040,"warnings":[],"error":null},{"value":true,"warnings":[],"error":null}]}
+
+    When the worker is ready for requests it writes a frame with ready set to true and how long dot-sourcing the script took (dot_source_ms). 
+    Every reply has how long the request took to execute inside the worker (execute_ms), so the rest of the round trip is IPC. A single 
+    cmdlet request with "trace": true also gets the timed Write-Debug messages back (see Invoke-WorkerExpression). Closing stdin stops the 
+    worker.
+
+    .INPUTS
+    Requests are read from stdin.
+#>
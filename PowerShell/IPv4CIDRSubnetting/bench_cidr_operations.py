@@ -0,0 +1,445 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark suite for the cmdlets (Convert-IPStrToIPUInt, Convert-IPNumToIpStr, Get-SubnetMaskUInt,
+Compare-Subnets, Test-IPInSubnet and Get-IPv4CIDRTranslation) on every backend that can run them:
+
+    pwsh-process  one pwsh process per cmdlet (how the tests used to run)
+    pwsh-batch    batches of cmdlets on a warm IPv4CIDRSubnettingWorker.ps1 (ps_worker.py)
+    fake-batch    the same batches on the fake worker, the Python twin behind the worker protocol
+    ipaddress     IPv4Address & IPv4Network, like the unit tests compare against
+    twin          the Python twin, ip_v4_cidr_subnetting.py
+    numpy         ip_v4_cidr_numpy.py on the whole workload at once
+
+The workloads come from a fixed seed and the size, so every run (and every machine) gets the same
+addresses. Inputs are Python lists of strings and ints, like a caller would have them, so parsing
+is part of the time for every backend. Small workloads are run in a loop until they take long
+enough to time and the best round is kept. The slow backends only run a sample of the bigger
+workloads (see SAMPLE_LIMITS, --full runs everything) and the time is extrapolated from it.
+
+    python bench_cidr_operations.py run --sizes 1 1000 100000 1000000 --output before.json
+    python bench_cidr_operations.py run --output after.json
+    python bench_cidr_operations.py compare before.json after.json --threshold 0.1
+
+compare prints the change in time per operation for everything in both files and exits with 1
+when something got slower by more than the threshold.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from ipaddress import IPv4Address, IPv4Network
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+import ip_v4_cidr_subnetting as cidr
+import ps_worker
+
+OPERATIONS = ("Convert-IPStrToIPUInt", "Convert-IPNumToIpStr", "Get-SubnetMaskUInt", "Compare-Subnets", "Test-IPInSubnet",
+              "Get-IPv4CIDRTranslation")
+BACKENDS = ("pwsh-process", "pwsh-batch", "fake-batch", "ipaddress", "twin", "numpy")
+SIZES = (1, 1000, 100_000, 1_000_000)
+# Most operations each backend runs for one measurement, bigger workloads are extrapolated
+SAMPLE_LIMITS = {"pwsh-process": 10, "pwsh-batch": 20_000, "fake-batch": 20_000, "ipaddress": 200_000, "twin": 200_000, "numpy": None}
+# A round is repeated in a loop until it takes at least this long
+MIN_ROUND_SECONDS = 0.05
+# No more rounds are started after this long, so the big workloads are only run once or twice
+MAX_MEASURE_SECONDS = 2.0
+DEFAULT_THRESHOLD = 0.10
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "IPv4CIDRSubnetting.ps1")
+
+
+class Workload(NamedTuple):
+    """Inputs for every operation, the same list positions line up (e.g. ip_strs[i] is ip_uints[i])."""
+    ip_strs: list
+    ip_uints: list
+    suffixes: list
+    cidrs_a: list
+    cidrs_b: list
+
+    def __len__(self) -> int:
+        return len(self.ip_strs)
+
+    def head(self, count: int) -> "Workload":
+        return Workload(*(values[:count] for values in self))
+
+
+class Measurement(NamedTuple):
+    """Timing of one operation on one backend for one workload size."""
+    operation: str
+    backend: str
+    size: int
+    measured_ops: int
+    loops: int
+    rounds: int
+    best_seconds: float
+    ns_per_op: float
+    ops_per_second: float
+    estimated_seconds: float
+
+    @property
+    def extrapolated(self) -> bool:
+        return self.measured_ops < self.size
+
+    @property
+    def key(self) -> tuple[str, str, int]:
+        return self.operation, self.backend, self.size
+
+
+def generate_workload(seed: int, size: int) -> Workload:
+    """Random addresses anywhere and suffixes from /1 to /32 (/0 for the masks), the same for the same seed and size."""
+    rng = np.random.default_rng([seed, size])
+    ip_uints = rng.integers(0, 1 << 32, size, dtype=np.uint64).astype(np.uint32)
+    other_uints = rng.integers(0, 1 << 32, size, dtype=np.uint64).astype(np.uint32)
+    ip_strs = cidr_np.convert_ip_num_to_ip_str(ip_uints).tolist()
+    other_strs = cidr_np.convert_ip_num_to_ip_str(other_uints).tolist()
+    suffixes_a = rng.integers(1, 33, size).tolist()
+    # Half of the B networks are on the same address as A with a shorter suffix, so they overlap,
+    # the other half are on unrelated random addresses and mostly don't
+    suffixes_b = rng.integers(1, 17, size).tolist()
+
+    return Workload(
+        ip_strs=ip_strs,
+        ip_uints=ip_uints.tolist(),
+        suffixes=rng.integers(0, 33, size).tolist(),
+        cidrs_a=[f"{ip}/{suffix}" for ip, suffix in zip(ip_strs, suffixes_a)],
+        cidrs_b=[f"{ip if i % 2 else other}/{suffix}" for i, (ip, other, suffix) in enumerate(zip(ip_strs, other_strs, suffixes_b))],
+    )
+
+
+def cmdlet_commands(operation: str, workload: Workload) -> list[str]:
+    """The cmdlet strings for an operation, as PSCommand sends them."""
+    if operation == "Convert-IPStrToIPUInt":
+        return [f'Convert-IPStrToIPUInt -IPStr "{ip}"' for ip in workload.ip_strs]
+    if operation == "Convert-IPNumToIpStr":
+        return [f"Convert-IPNumToIpStr -IpPrefixUInt {ip}" for ip in workload.ip_uints]
+    if operation == "Get-SubnetMaskUInt":
+        return [f"Get-SubnetMaskUInt -SubnetSuffixNum {suffix}" for suffix in workload.suffixes]
+    if operation == "Compare-Subnets":
+        return [f'Compare-Subnets -CIDRAddressA "{a}" -CIDRAddressB "{b}"' for a, b in zip(workload.cidrs_a, workload.cidrs_b)]
+    if operation == "Test-IPInSubnet":
+        return [f'Test-IPInSubnet -IPStr "{ip}" -CIDRAddress "{b}"' for ip, b in zip(workload.ip_strs, workload.cidrs_b)]
+    return [f'Get-IPv4CIDRTranslation -CIDRAddress "{a}"' for a in workload.cidrs_a]
+
+
+def _ipaddress_translation(cidr_address: str) -> tuple:
+    network = IPv4Network(cidr_address, strict=False)
+    return (int(network.network_address), int(network.broadcast_address), int(network.netmask), int(network.hostmask),
+            int(network.network_address) + 1, int(network.broadcast_address) - 1, network.num_addresses)
+
+
+IPADDRESS_OPERATIONS = {
+    "Convert-IPStrToIPUInt": lambda w: [int(IPv4Address(ip)) for ip in w.ip_strs],
+    "Convert-IPNumToIpStr": lambda w: [str(IPv4Address(ip)) for ip in w.ip_uints],
+    "Get-SubnetMaskUInt": lambda w: [int(IPv4Network((0, suffix)).netmask) for suffix in w.suffixes],
+    "Compare-Subnets": lambda w: [IPv4Network(a, strict=False).overlaps(IPv4Network(b, strict=False)) for a, b in zip(w.cidrs_a, w.cidrs_b)],
+    "Test-IPInSubnet": lambda w: [IPv4Address(ip) in IPv4Network(b, strict=False) for ip, b in zip(w.ip_strs, w.cidrs_b)],
+    "Get-IPv4CIDRTranslation": lambda w: [_ipaddress_translation(a) for a in w.cidrs_a],
+}
+
+TWIN_OPERATIONS = {
+    "Convert-IPStrToIPUInt": lambda w: [cidr.convert_ip_str_to_ip_uint(ip) for ip in w.ip_strs],
+    "Convert-IPNumToIpStr": lambda w: [cidr.convert_ip_num_to_ip_str(ip) for ip in w.ip_uints],
+    "Get-SubnetMaskUInt": lambda w: [cidr.get_subnet_mask_uint(suffix) for suffix in w.suffixes],
+    "Compare-Subnets": lambda w: [cidr.compare_subnets(a, b) for a, b in zip(w.cidrs_a, w.cidrs_b)],
+    "Test-IPInSubnet": lambda w: [cidr.is_ip_in_subnet(ip, b) for ip, b in zip(w.ip_strs, w.cidrs_b)],
+    "Get-IPv4CIDRTranslation": lambda w: [cidr.get_ipv4_cidr_translation(a) for a in w.cidrs_a],
+}
+
+
+def _numpy_compare(w: Workload) -> np.ndarray:
+    ip_prefix_uint_a, suffixes_a = cidr_np.split_cidr(w.cidrs_a)
+    ip_prefix_uint_b, suffixes_b = cidr_np.split_cidr(w.cidrs_b)
+    return cidr_np.compare_subnets(ip_prefix_uint_a, suffixes_a, ip_prefix_uint_b, suffixes_b)
+
+
+def _numpy_contains(w: Workload) -> np.ndarray:
+    ip_prefix_uint, suffixes = cidr_np.split_cidr(w.cidrs_b)
+    return cidr_np.is_ip_in_subnet(cidr_np.convert_ip_str_to_ip_uint(w.ip_strs), ip_prefix_uint, suffixes)
+
+
+NUMPY_OPERATIONS = {
+    "Convert-IPStrToIPUInt": lambda w: cidr_np.convert_ip_str_to_ip_uint(w.ip_strs),
+    "Convert-IPNumToIpStr": lambda w: cidr_np.convert_ip_num_to_ip_str(w.ip_uints),
+    "Get-SubnetMaskUInt": lambda w: cidr_np.get_subnet_mask_uint(w.suffixes),
+    "Compare-Subnets": _numpy_compare,
+    "Test-IPInSubnet": _numpy_contains,
+    "Get-IPv4CIDRTranslation": lambda w: cidr_np.get_ipv4_cidr_translation(*cidr_np.split_cidr(w.cidrs_a)),
+}
+
+
+def run_pwsh_process(commands: list[str]) -> list[str]:
+    """One pwsh process per cmdlet, dot-sourcing the script every time."""
+    return [subprocess.run(["pwsh", "-NoProfile", "-NonInteractive", "-Command", f". '{SCRIPT}'; {command}"],
+                           capture_output=True, text=True, check=False).stdout for command in commands]
+
+
+def available_backends() -> list[str]:
+    """Backends that can run here, the pwsh ones need pwsh on the PATH."""
+    has_pwsh = shutil.which("pwsh") is not None
+    return [backend for backend in BACKENDS if has_pwsh or not backend.startswith("pwsh")]
+
+
+def measure(func: Callable[[], object]) -> tuple[float, int, int]:
+    """
+    Best time for one call of func, its loop count and the number of rounds. Calls that are too
+    quick to time on their own are run in a loop that takes at least MIN_ROUND_SECONDS.
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_ROUND_SECONDS or loops >= 1 << 20:
+            break
+        loops *= max(2, min(10, int(MIN_ROUND_SECONDS / max(elapsed, 1e-9)) + 1))
+
+    best = elapsed / loops
+    rounds = 1
+    measuring_started = time.perf_counter()
+    while rounds < 5 and time.perf_counter() - measuring_started + elapsed < MAX_MEASURE_SECONDS:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed / loops)
+        rounds += 1
+
+    return best, loops, rounds
+
+
+class BenchmarkRunner:
+    """Runs the operations on the backends, the worker pools are started once and reused for every measurement."""
+    def __init__(self, seed: int = 20250101, full: bool = False):
+        self.seed = seed
+        self.full = full
+        self.__pools = {}
+
+    def close(self) -> None:
+        for pool in self.__pools.values():
+            pool.close()
+        self.__pools = {}
+
+    def __enter__(self) -> "BenchmarkRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __pool(self, mode: str) -> ps_worker.PSWorkerPool:
+        if mode not in self.__pools:
+            self.__pools[mode] = ps_worker.PSWorkerPool(mode=mode)
+            # Started before timing, a warm worker is the point of batching
+            self.__pools[mode].run("Get-SubnetMaskUInt -SubnetSuffixNum 24")
+        return self.__pools[mode]
+
+    def task(self, operation: str, backend: str, workload: Workload) -> Callable[[], object]:
+        """The function that runs the operation on the backend for the whole workload."""
+        if backend in ("pwsh-process", "pwsh-batch", "fake-batch"):
+            commands = cmdlet_commands(operation, workload)
+            if backend == "pwsh-process":
+                return lambda: run_pwsh_process(commands)
+            pool = self.__pool("pwsh" if backend == "pwsh-batch" else "fake")
+            return lambda: pool.run_batch(commands)
+
+        operations = {"ipaddress": IPADDRESS_OPERATIONS, "twin": TWIN_OPERATIONS, "numpy": NUMPY_OPERATIONS}[backend]
+        return lambda: operations[operation](workload)
+
+    def run(self, operation: str, backend: str, size: int, workload: Workload = None) -> Measurement:
+        """Measures one operation on one backend, on a sample of the workload when the backend is too slow for all of it."""
+        workload = workload or generate_workload(self.seed, size)
+        limit = None if self.full else SAMPLE_LIMITS[backend]
+        measured = workload.head(limit) if limit is not None and limit < size else workload
+
+        best_seconds, loops, rounds = measure(self.task(operation, backend, measured))
+        ns_per_op = best_seconds / len(measured) * 1e9
+        return Measurement(operation, backend, size, len(measured), loops, rounds, best_seconds, ns_per_op,
+                           1e9 / ns_per_op if ns_per_op else 0.0, ns_per_op * size / 1e9)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(seed: int, backends: list[str]) -> dict:
+    """What the results were measured on, compare warns when two files don't match."""
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "backends": backends,
+    }
+
+
+def run_suite(sizes: list[int], operations: list[str], backends: list[str], seed: int, full: bool = False,
+              progress: Callable[[Measurement], None] = None) -> dict:
+    """Measures every operation on every backend at every size, returns the JSON friendly results."""
+    measurements = []
+    with BenchmarkRunner(seed, full) as runner:
+        for size in sizes:
+            workload = generate_workload(seed, size)
+            for operation in operations:
+                for backend in backends:
+                    measurement = runner.run(operation, backend, size, workload)
+                    measurements.append(measurement)
+                    if progress is not None:
+                        progress(measurement)
+
+    return {
+        "environment": environment(seed, backends),
+        "results": [{**measurement._asdict(), "extrapolated": measurement.extrapolated} for measurement in measurements],
+    }
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as results_file:
+        return json.load(results_file)
+
+
+class Change(NamedTuple):
+    """Change in time per operation between two result files, ratio is new / old."""
+    operation: str
+    backend: str
+    size: int
+    old_ns_per_op: float
+    new_ns_per_op: float
+    ratio: float
+    status: str
+
+
+def compare_results(old: dict, new: dict, threshold: float = DEFAULT_THRESHOLD) -> list[Change]:
+    """
+    Changes for every (operation, backend, size) in both files. Slower by more than the threshold
+    is a regression, faster by more than it is an improvement, anything in between is unchanged.
+    The ones in the old file that are not in the new one come last as missing, with NaN for the new time.
+    """
+    old_results = {(result["operation"], result["backend"], result["size"]): result for result in old["results"]}
+    new_keys = set()
+    changes = []
+    for result in new["results"]:
+        key = (result["operation"], result["backend"], result["size"])
+        new_keys.add(key)
+        if key not in old_results:
+            continue
+        old_ns, new_ns = old_results[key]["ns_per_op"], result["ns_per_op"]
+        ratio = new_ns / old_ns if old_ns else float("inf")
+        status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 / (1 + threshold) else "unchanged"
+        changes.append(Change(*key, old_ns, new_ns, ratio, status))
+
+    changes.extend(Change(*key, result["ns_per_op"], float("nan"), float("nan"), "missing")
+                   for key, result in old_results.items() if key not in new_keys)
+    return changes
+
+
+def environment_differences(old: dict, new: dict) -> list[str]:
+    """The environment settings that are different, timings from different machines don't compare well."""
+    return [f"{key}: {old['environment'].get(key)} -> {new['environment'].get(key)}"
+            for key in ("python", "numpy", "platform", "machine", "cpu_count", "seed")
+            if old["environment"].get(key) != new["environment"].get(key)]
+
+
+def _format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def print_measurement(measurement: Measurement) -> None:
+    extrapolated = "*" if measurement.extrapolated else " "
+    print(f"{measurement.operation:<24} | {measurement.backend:<12} | {measurement.size:>9} | {_format_ns(measurement.ns_per_op):>10}/op | "
+          f"{measurement.ops_per_second:>12,.0f}/s | {measurement.estimated_seconds:>9.3f} s{extrapolated}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Runs the benchmarks and writes the results to a JSON file")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Number of operations per workload")
+    run_parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    run_parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=None, help="Every backend that can run here by default")
+    run_parser.add_argument("--seed", type=int, default=20250101)
+    run_parser.add_argument("--full", action="store_true", help="Run every backend on the whole workload instead of a sample")
+    run_parser.add_argument("--output", default="bench_cidr_operations.json")
+
+    compare_parser = commands.add_parser("compare", help="Compares two result files and exits with 1 when something got slower")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slow down, 0.1 is 10%%")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        backends = args.backends or available_backends()
+        missing = sorted(set(backends) - set(available_backends()))
+        if missing:
+            parser.error(f"These backends can't run here (pwsh isn't on the PATH): {', '.join(missing)}")
+
+        print(f"{'Operation':<24} | {'Backend':<12} | {'Size':>9} | {'Time':>13} | {'Throughput':>14} | {'Total':>11}")
+        results = run_suite(args.sizes, args.operations, backends, args.seed, args.full, print_measurement)
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"* extrapolated from a sample, results written to {args.output}")
+        return
+
+    old, new = load_results(args.old), load_results(args.new)
+    for difference in environment_differences(old, new):
+        print(f"Warning, measured on a different setup, {difference}")
+
+    changes = compare_results(old, new, args.threshold)
+    print(f"{'Operation':<24} | {'Backend':<12} | {'Size':>9} | {'Old':>10} | {'New':>10} | {'Change':>8} |")
+    for change in changes:
+        if change.status == "missing":
+            print(f"{change.operation:<24} | {change.backend:<12} | {change.size:>9} | {_format_ns(change.old_ns_per_op):>10} | "
+                  f"{'-':>10} | {'-':>8} | {change.status}")
+            continue
+        print(f"{change.operation:<24} | {change.backend:<12} | {change.size:>9} | {_format_ns(change.old_ns_per_op):>10} | "
+              f"{_format_ns(change.new_ns_per_op):>10} | {(change.ratio - 1) * 100:>+7.1f}% | {change.status}")
+
+    regressions = [change for change in changes if change.status == "regression"]
+    missing = sum(change.status == "missing" for change in changes)
+    print(f"{len(changes) - missing} compared, {len(regressions)} regressions, "
+          f"{sum(change.status == 'improvement' for change in changes)} improvements, {missing} missing (threshold {args.threshold:.0%})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Time and memory per million translations for the three ways of translating CIDR addresses:
+the full Get-IPv4CIDRTranslation dictionary, the lean IPv4CIDRRecord and the columnar
+IPv4CIDRRecords. Memory is what the results take up afterwards (tracemalloc), the timing runs
+separately without tracemalloc since it slows everything down. The octets column reads the
+broadcast IP octets of every result, which is where the lazy records do their formatting.
+
+    python bench_cidr_translation.py --count 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+import ip_v4_cidr_subnetting as cidr
+
+
+def translate_dicts(cidrs: list[str]) -> list:
+    return [cidr.get_ipv4_cidr_translation(cidr_address) for cidr_address in cidrs]
+
+
+def translate_records(cidrs: list[str]) -> list:
+    return [cidr.convert_to_ipv4_cidr_record(cidr_address) for cidr_address in cidrs]
+
+
+def translate_columns(cidrs: list[str]):
+    return cidr_np.IPv4CIDRRecords.from_cidrs(cidrs)
+
+
+def read_octets(results) -> None:
+    if isinstance(results, cidr_np.IPv4CIDRRecords):
+        results.octets("BroadcastIP")
+    else:
+        for result in results:
+            result["BroadcastIP"]["Octets"]
+
+
+def measure(translate, cidrs: list[str]) -> tuple[float, float, int]:
+    """Seconds to translate, seconds to read the octets and bytes held by the results."""
+    gc.collect()
+    start = time.perf_counter()
+    results = translate(cidrs)
+    translate_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    read_octets(results)
+    octets_seconds = time.perf_counter() - start
+    del results
+
+    gc.collect()
+    tracemalloc.start()
+    results = translate(cidrs)
+    held_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return translate_seconds, octets_seconds, held_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of CIDR addresses to translate")
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    addresses = cidr_np.convert_ip_num_to_ip_str(rng.integers(0, 1 << 32, args.count, dtype=np.uint64).astype(np.uint32))
+    cidrs = [f"{address}/{suffix}" for address, suffix in zip(addresses.tolist(), rng.integers(1, 33, args.count).tolist())]
+    per_million = 1_000_000 / args.count
+
+    print(f"|{'Result':<22}|{'Translate':<11}|{'Octets':<9}|{'Memory':<10}|")
+    print(f"|{'-' * 22}|{'-' * 11}|{'-' * 9}|{'-' * 10}|")
+    for name, translate in [("Translation dict", translate_dicts), ("IPv4CIDRRecord", translate_records), ("IPv4CIDRRecords", translate_columns)]:
+        translate_seconds, octets_seconds, held_bytes = measure(translate, cidrs)
+        print(f"|{name:<22}|{translate_seconds * per_million:<9.2f} s|{octets_seconds * per_million:<7.2f} s|{held_bytes * per_million / 2 ** 20:<7.1f} MB|")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark of the SubnetIndex (subnet_index.py) batch lookup against the naive approach, a loop
+over every network with 'ip in IPv4Network(...)' for every address.
+
+The naive loop is far too slow to run over a million addresses with thousands of networks, so
+it only runs over a sample of the addresses and the time is extrapolated (marked with a *).
+
+    python bench_subnet_index.py --cidrs 2000 --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+from ipaddress import IPv4Address, IPv4Network
+
+import numpy as np
+
+from subnet_index import NO_MATCH, SubnetIndex
+
+
+def generate_plan(rng: np.random.Generator, count: int) -> list[str]:
+    """Hub and spoke like plan, /16 address spaces split into /20 to /28 subnets."""
+    spaces = max(1, count // 50)
+    space_networks = (rng.integers(0, 1 << 16, spaces, dtype=np.uint64) << 16).astype(np.uint32)
+    cidrs = [f"{IPv4Address(int(network))}/16" for network in space_networks]
+
+    while len(cidrs) < count:
+        suffix = int(rng.integers(20, 29))
+        network = int(rng.choice(space_networks)) | (int(rng.integers(0, 1 << 16)) & ~((1 << (32 - suffix)) - 1) & 0xFFFF)
+        cidrs.append(f"{IPv4Address(network)}/{suffix}")
+
+    return cidrs
+
+
+def generate_addresses(rng: np.random.Generator, index: SubnetIndex, size: int) -> np.ndarray:
+    """Half of the addresses inside the plan, half anywhere."""
+    inside = index.network_ip_uint[rng.integers(0, len(index), size // 2)].astype(np.uint64) + rng.integers(0, 256, size // 2, dtype=np.uint64)
+    anywhere = rng.integers(0, 1 << 32, size - size // 2, dtype=np.uint64)
+    return (np.concatenate([inside, anywhere]) & 0xFFFFFFFF).astype(np.uint32)
+
+
+def naive_lookup(networks: list[IPv4Network], ips: np.ndarray) -> list[int]:
+    """Most specific network for each address with a loop of IPv4Network checks."""
+    results = []
+    for ip in ips.tolist():
+        address = IPv4Address(ip)
+        best = NO_MATCH
+        for i, network in enumerate(networks):
+            if address in network and (best == NO_MATCH or network.prefixlen >= networks[best].prefixlen):
+                best = i
+        results.append(best)
+    return results
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cidrs", type=int, default=2000, help="Number of CIDRs in the plan")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Number of addresses to look up")
+    parser.add_argument("--naive-sample", type=int, default=200, help="Addresses the naive loop runs over before extrapolating")
+    parser.add_argument("--seed", type=int, default=20250101)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    cidrs = generate_plan(rng, args.cidrs)
+
+    start = time.perf_counter()
+    index = SubnetIndex(cidrs)
+    build_seconds = time.perf_counter() - start
+    networks = [IPv4Network(cidr, strict=False) for cidr in cidrs]
+
+    print(f"{len(cidrs)} CIDRs, index built in {build_seconds * 1000:.1f} ms ({len(index.interval_starts)} intervals, depth {index.depth})")
+    print(f"{'Addresses':>10} | {'SubnetIndex':>12} | {'Naive loop':>13} | {'Speed up':>9}")
+
+    for size in args.sizes:
+        ips = generate_addresses(rng, index, size)
+
+        start = time.perf_counter()
+        matches = index.lookup(ips)
+        index_seconds = time.perf_counter() - start
+
+        sample = ips[:min(size, args.naive_sample)]
+        start = time.perf_counter()
+        naive_matches = naive_lookup(networks, sample)
+        naive_seconds = (time.perf_counter() - start) * size / len(sample)
+
+        # Ties between duplicate CIDRs go to the last one in both, so the answers have to be the same
+        assert matches[:len(sample)].tolist() == naive_matches, "SubnetIndex and the naive loop disagree"
+
+        extrapolated = "*" if len(sample) < size else " "
+        print(f"{size:>10} | {index_seconds:>10.3f} s | {naive_seconds:>10.3f} s{extrapolated} | {naive_seconds / index_seconds:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Collapses big lists of CIDRs and host IPs into the smallest list of CIDR blocks covering the same
+addresses (like ipaddress.collapse_addresses), and does union, intersection and difference on
+address ranges, e.g. an address space minus the subnets that are already allocated.
+
+Everything works on sorted integer intervals [start, end) held in int64 NumPy arrays rather than
+one IPv4Network object per address. The network IP is the start and the broadcast IP + 1 is the
+end (int64 so that the end of 255.255.255.255 fits). Merging is a sort plus a running maximum of
+the ends, and the set operations count how many ranges cover each segment between the sorted
+start and end points.
+
+Going back to CIDRs, the biggest block that fits at an address is limited by how many trailing
+zero bits the address has (the block has to be aligned) and by how much of the interval is left.
+One block is taken from the front of every interval at the same time, and an interval never needs
+more than 62 blocks (sizes going up to the biggest aligned block and back down), so it takes at
+most 62 rounds whatever the number of intervals.
+"""
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+
+ADDRESS_SPACE_END = 1 << 32
+
+
+def _normalise(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorts the intervals and merges the ones that overlap or touch."""
+    keep = ends > starts
+    starts = starts[keep]
+    ends = ends[keep]
+    if len(starts) == 0:
+        return starts, ends
+
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    ends = np.maximum.accumulate(ends[order])
+    new_range = np.empty(len(starts), dtype=bool)
+    new_range[0] = True
+    new_range[1:] = starts[1:] > ends[:-1]
+    group_starts = np.flatnonzero(new_range)
+    group_ends = np.append(group_starts[1:], len(starts)) - 1
+    return starts[group_starts], ends[group_ends]
+
+
+def _largest_power_of_two(values: np.ndarray) -> np.ndarray:
+    """Largest power of two that is <= each value (values are > 0)."""
+    powers = np.left_shift(1, np.floor(np.log2(values)).astype(np.int64))
+    # log2 of a value just below a power of two can round up
+    return np.where(powers > values, powers >> 1, powers)
+
+
+def intervals_to_cidrs(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits sorted, non overlapping [start, end) intervals into the fewest CIDR blocks. Returns the
+    network IPs (uint32) and subnet suffixes (uint8) sorted by network IP.
+    """
+    current = np.asarray(starts, dtype=np.int64).copy()
+    ends = np.asarray(ends, dtype=np.int64)
+    networks = []
+    suffixes = []
+
+    while len(current):
+        # An address with no trailing zero bits can only start a /32, 0.0.0.0 can start a /0
+        alignment = np.where(current == 0, ADDRESS_SPACE_END, current & -current)
+        block_sizes = np.minimum(alignment, _largest_power_of_two(ends - current))
+
+        networks.append(current)
+        suffixes.append(32 - np.log2(block_sizes).astype(np.int64))
+
+        current = current + block_sizes
+        left = current < ends
+        current = current[left]
+        ends = ends[left]
+
+    if not networks:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+
+    networks = np.concatenate(networks)
+    suffixes = np.concatenate(suffixes)
+    order = np.argsort(networks, kind="stable")
+    return networks[order].astype(np.uint32), suffixes[order].astype(np.uint8)
+
+
+class AddressRanges:
+    """
+    A set of IPv4 addresses stored as sorted, non overlapping [start, end) intervals. The set
+    operators work like they do for Python sets:
+
+        space = AddressRanges.from_cidrs(["10.28.0.0/16"])
+        free = space - AddressRanges.from_cidrs(["10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27"])
+        free.to_cidrs() # ['10.28.1.32/27', '10.28.1.64/26', '10.28.1.128/25', '10.28.2.0/23', ...]
+    """
+    def __init__(self, starts=(), ends=()):
+        self.starts, self.ends = _normalise(np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64))
+
+    @classmethod
+    def from_cidrs(cls, cidrs: list[str]) -> "AddressRanges":
+        """Set of the addresses in a list of CIDRs and host IPs (a host IP is a /32), host bits are ignored."""
+        cidrs = [cidr if "/" in cidr else f"{cidr}/32" for cidr in cidrs]
+        if not cidrs:
+            return cls()
+
+        ip_prefix_uint, suffixes = cidr_np.split_cidr(cidrs)
+        network_ip_uint, broadcast_ip_uint = cidr_np.get_network_and_broadcast(ip_prefix_uint, suffixes)
+        return cls(network_ip_uint, broadcast_ip_uint.astype(np.int64) + 1)
+
+    @classmethod
+    def from_ranges(cls, first_ips, last_ips) -> "AddressRanges":
+        """Set of the addresses from each first IP to each last IP (both included), as strings or uint32."""
+        first_ips = np.asarray(first_ips)
+        last_ips = np.asarray(last_ips)
+        if first_ips.dtype.kind in "US":
+            first_ips = cidr_np.convert_ip_str_to_ip_uint(first_ips)
+        if last_ips.dtype.kind in "US":
+            last_ips = cidr_np.convert_ip_str_to_ip_uint(last_ips)
+        return cls(first_ips.astype(np.int64), last_ips.astype(np.int64) + 1)
+
+    def __combine(self, other: "AddressRanges", keep) -> "AddressRanges":
+        """
+        Segments between the sorted start and end points of both sets, kept where keep(in self,
+        in other) is True. Each set is already merged, so each one covers a segment at most once.
+        """
+        points = np.concatenate((self.starts, self.ends, other.starts, other.ends))
+        self_delta = np.concatenate((np.ones(len(self.starts), np.int64), -np.ones(len(self.ends), np.int64),
+                                     np.zeros(len(other.starts) + len(other.ends), np.int64)))
+        other_delta = np.concatenate((np.zeros(len(self.starts) + len(self.ends), np.int64),
+                                      np.ones(len(other.starts), np.int64), -np.ones(len(other.ends), np.int64)))
+
+        positions, groups = np.unique(points, return_inverse=True)
+        in_self = np.cumsum(np.bincount(groups, self_delta, len(positions))) > 0
+        in_other = np.cumsum(np.bincount(groups, other_delta, len(positions))) > 0
+        kept = np.flatnonzero(keep(in_self, in_other)[:-1]) if len(positions) else np.zeros(0, dtype=np.int64)
+        return AddressRanges(positions[kept], positions[kept + 1])
+
+    def __or__(self, other: "AddressRanges") -> "AddressRanges":
+        return AddressRanges(np.concatenate((self.starts, other.starts)), np.concatenate((self.ends, other.ends)))
+
+    def __and__(self, other: "AddressRanges") -> "AddressRanges":
+        return self.__combine(other, lambda in_self, in_other: in_self & in_other)
+
+    def __sub__(self, other: "AddressRanges") -> "AddressRanges":
+        return self.__combine(other, lambda in_self, in_other: in_self & ~in_other)
+
+    def __invert__(self) -> "AddressRanges":
+        return AddressRanges([0], [ADDRESS_SPACE_END]) - self
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+    complement = __invert__
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AddressRanges):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(self.ends, other.ends)
+
+    def __contains__(self, ip_str: str) -> bool:
+        ip_prefix_uint = cidr_np.convert_ip_str_to_ip_uint([ip_str])[0]
+        slot = np.searchsorted(self.starts, ip_prefix_uint, side="right") - 1
+        return bool(slot >= 0 and ip_prefix_uint < self.ends[slot])
+
+    @property
+    def total_addresses(self) -> int:
+        """Number of addresses in the set."""
+        return int((self.ends - self.starts).sum())
+
+    def __len__(self) -> int:
+        """Number of separate ranges."""
+        return len(self.starts)
+
+    def to_cidr_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Fewest CIDR blocks covering the set, as network IPs (uint32) and subnet suffixes (uint8)."""
+        return intervals_to_cidrs(self.starts, self.ends)
+
+    def to_cidrs(self) -> list[str]:
+        """Fewest CIDR blocks covering the set, as CIDR strings sorted by network IP."""
+        networks, suffixes = self.to_cidr_arrays()
+        return [f"{ip}/{suffix}" for ip, suffix in zip(cidr_np.convert_ip_num_to_ip_str(networks).tolist(), suffixes.tolist())]
+
+    def __repr__(self) -> str:
+        return f"AddressRanges({len(self)} ranges, {self.total_addresses} addresses)"
+
+
+def collapse_cidrs(cidrs: list[str]) -> list[str]:
+    """Collapses CIDRs and host IPs into the fewest CIDR blocks covering the same addresses."""
+    return AddressRanges.from_cidrs(cidrs).to_cidrs()
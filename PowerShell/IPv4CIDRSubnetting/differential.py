@@ -0,0 +1,313 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Differential test of the cmdlets against IPv4Network with generated cases instead of a handful of
+hand picked networks. Case i of a seed is always the same case, so any case can be replayed from
+the seed and its number. The cases cycle through every cmdlet and every subnet suffix from /0 to
+/32, with random addresses mixed with edge cases (0.0.0.0, 255.255.255.255, addresses with host
+bits set so Get-IPv4CIDRTranslation writes its warning, ...).
+
+The cases are split into shares over a process pool. Each process has its own PSWorkerPool and
+runs its share with run_batch, so a million cases is a few thousand round trips rather than a
+million pwsh launches. Failing cases are shrunk (clearing address bits while it still fails) and
+written to a JSON file with the seed so they can be replayed:
+
+    python differential.py --count 1000000 --workers 4
+    python differential.py --replay differential_failures.json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ipaddress import IPv4Address, IPv4Network
+from typing import NamedTuple
+
+import ps_worker
+
+UINT_MAX_VALUE = 4294967295
+HOST_BITS_WARNING = "Host bit(s) is not valid when comparing to subnet mask, host bit(s) will be zero!"
+EDGE_ADDRESSES = (0, UINT_MAX_VALUE, 1, UINT_MAX_VALUE - 1, 0x7FFFFFFF, 0x80000000, 169607168, 169607296, 3232235776, 3232236031)
+KINDS = ("Get-IPv4CIDRTranslation", "ConvertTo-IPv4CIDRRecord", "Compare-Subnets", "Test-IPInSubnet",
+         "Get-NetworkIpAddressUInt", "Get-BroadcastIpAddressUInt", "Get-SubnetMaskUInt", "Get-HostMaskUInt",
+         "Get-TotalCountOfIPAddress", "Convert-IPStrToIPUInt", "Convert-IPNumToIpStr")
+SHARE_SIZE = 20000
+FAILURES_FILE = "differential_failures.json"
+
+_pool = None
+
+
+class Case(NamedTuple):
+    """One generated cmdlet call, addresses and suffixes are the inputs it was made from."""
+    index: int
+    kind: str
+    addresses: tuple
+    suffixes: tuple
+
+
+def _address(rng: random.Random) -> int:
+    """A random address, an edge case one time in five."""
+    return rng.choice(EDGE_ADDRESSES) if rng.random() < 0.2 else rng.getrandbits(32)
+
+
+def make_case(seed: int, index: int) -> Case:
+    """Case number index for the seed. Every kind gets every suffix in turn."""
+    rng = random.Random(f"{seed}:{index}")
+    kind = KINDS[index % len(KINDS)]
+    suffix = (index // len(KINDS)) % 33
+    address = _address(rng)
+
+    # Half of the CIDRs have the host bits cleared so there is no warning
+    if rng.random() < 0.5:
+        address = int(IPv4Network((address, suffix), strict=False).network_address)
+
+    if kind == "Compare-Subnets":
+        return Case(index, kind, (address, _address(rng)), (suffix, rng.randint(0, 32)))
+    if kind == "Test-IPInSubnet":
+        # Mostly addresses close to the subnet so both answers come up
+        other = (address ^ rng.getrandbits(max(0, 34 - suffix))) & UINT_MAX_VALUE if rng.random() < 0.8 else _address(rng)
+        return Case(index, kind, (other, address), (suffix,))
+    return Case(index, kind, (address,), (suffix,))
+
+
+def case_from_json(value: dict) -> Case:
+    """Case from the JSON failures file, where the tuples came back as lists."""
+    return Case(value["index"], value["kind"], tuple(value["addresses"]), tuple(value["suffixes"]))
+
+
+def _cidr(address: int, suffix: int) -> str:
+    return f"{IPv4Address(address)}/{suffix}"
+
+
+def command_for(case: Case) -> str:
+    """The cmdlet string for a case."""
+    address, suffix = case.addresses[0], case.suffixes[0]
+    network = IPv4Network((address, suffix), strict=False)
+    commands = {
+        "Get-IPv4CIDRTranslation": lambda: f'Get-IPv4CIDRTranslation -CIDRAddress "{_cidr(address, suffix)}"',
+        "ConvertTo-IPv4CIDRRecord": lambda: f'ConvertTo-IPv4CIDRRecord -CIDRAddress "{_cidr(address, suffix)}"',
+        "Compare-Subnets": lambda: f'Compare-Subnets -CIDRAddressA "{_cidr(address, suffix)}" -CIDRAddressB "{_cidr(case.addresses[1], case.suffixes[1])}"',
+        "Test-IPInSubnet": lambda: f'Test-IPInSubnet -IPStr "{IPv4Address(address)}" -CIDRAddress "{_cidr(case.addresses[1], suffix)}"',
+        "Get-NetworkIpAddressUInt": lambda: f"Get-NetworkIpAddressUInt -IpPrefixUInt {address} -subnetMaskUInt {int(network.netmask)}",
+        "Get-BroadcastIpAddressUInt": lambda: f"Get-BroadcastIpAddressUInt -networkIpUInt {int(network.network_address)} -hostMaskUInt {int(network.hostmask)}",
+        "Get-SubnetMaskUInt": lambda: f"Get-SubnetMaskUInt -SubnetSuffixNum {suffix}",
+        "Get-HostMaskUInt": lambda: f"Get-HostMaskUInt -HostBitsByte {32 - suffix}",
+        "Get-TotalCountOfIPAddress": lambda: f"Get-TotalCountOfIPAddress -subnetSuffixNum {suffix}",
+        "Convert-IPStrToIPUInt": lambda: f'Convert-IPStrToIPUInt -IPStr "{IPv4Address(address)}"',
+        "Convert-IPNumToIpStr": lambda: f"Convert-IPNumToIpStr -IpPrefixUInt {address}",
+    }
+    return commands[case.kind]()
+
+
+def check(case: Case, result: ps_worker.CmdletResult) -> str | None:
+    """Compares the cmdlet result with IPv4Network, returns what is wrong or None when it matches."""
+    address, suffix = case.addresses[0], case.suffixes[0]
+    network = IPv4Network((address, suffix), strict=False)
+    host_bits_set = address != int(network.network_address)
+
+    # 2^32 does not fit in a [uint], so the /0 total count (and the translation that includes it) throws
+    expect_error = suffix == 0 and case.kind in ("Get-IPv4CIDRTranslation", "Get-TotalCountOfIPAddress")
+    if expect_error:
+        return None if not result.ok else f"expected an error, got {result.value!r}"
+    if case.kind == "Get-IPv4CIDRTranslation" and (int(network.network_address) == UINT_MAX_VALUE or int(network.broadcast_address) == 0):
+        # First host of 255.255.255.255/32 (or last host of 0.0.0.0/32) is outside a [uint], which
+        # Convert-IPNumToIpStr can't take. IPv4Network has no answer for it either, so either is fine.
+        return None
+    if not result.ok:
+        return f"unexpected error: {result.error}"
+
+    if case.kind == "Get-IPv4CIDRTranslation":
+        expected = {
+            "NetworkIP": (int(network.network_address), str(network.network_address)),
+            "BroadcastIP": (int(network.broadcast_address), str(network.broadcast_address)),
+            "SubnetMask": (int(network.netmask), str(network.netmask)),
+            "HostMask": (int(network.hostmask), str(network.hostmask)),
+            "FirstHost": (int(network.network_address) + 1, str(IPv4Address(int(network.network_address) + 1))),
+            "LastHost": (int(network.broadcast_address) - 1, str(IPv4Address(int(network.broadcast_address) - 1))),
+        }
+        actual = {key: (result.value[key]["Numerical"], result.value[key]["Octets"]) for key in expected}
+        binary = {key: result.value[key]["Binary"] for key in expected}
+        if actual != expected:
+            return f"expected {expected}, got {actual}"
+        if any(binary[key] != format(expected[key][0], "032b") for key in expected):
+            return f"binary strings do not match the numbers: {binary}"
+        if result.value["TotalAddresses"] != network.num_addresses:
+            return f"expected {network.num_addresses} addresses, got {result.value['TotalAddresses']}"
+        if result.warnings != ([HOST_BITS_WARNING] if host_bits_set else []):
+            return f"unexpected warnings: {result.warnings}"
+        return None
+
+    if case.kind == "ConvertTo-IPv4CIDRRecord":
+        expected = {"NetworkIP": int(network.network_address), "SubnetSuffix": suffix}
+        if result.warnings != ([HOST_BITS_WARNING] if host_bits_set else []):
+            return f"unexpected warnings: {result.warnings}"
+    elif case.kind == "Compare-Subnets":
+        expected = network.overlaps(IPv4Network((case.addresses[1], case.suffixes[1]), strict=False))
+    elif case.kind == "Test-IPInSubnet":
+        expected = IPv4Address(address) in IPv4Network((case.addresses[1], suffix), strict=False)
+    else:
+        expected = {
+            "Get-NetworkIpAddressUInt": lambda: int(network.network_address),
+            "Get-BroadcastIpAddressUInt": lambda: int(network.broadcast_address),
+            "Get-SubnetMaskUInt": lambda: int(network.netmask),
+            "Get-HostMaskUInt": lambda: int(network.hostmask),
+            "Get-TotalCountOfIPAddress": lambda: network.num_addresses,
+            "Convert-IPStrToIPUInt": lambda: address,
+            "Convert-IPNumToIpStr": lambda: str(IPv4Address(address)),
+        }[case.kind]()
+
+    return None if result.value == expected else f"expected {expected!r}, got {result.value!r}"
+
+
+def run_cases(pool: ps_worker.PSWorkerPool, cases: list[Case]) -> list[dict]:
+    """Runs the cases in one batch and returns the failures."""
+    failures = []
+    results = pool.run_batch([command_for(case) for case in cases])
+    for case, result in zip(cases, results):
+        problem = check(case, result)
+        if problem is not None:
+            failures.append({"case": case._asdict(), "command": result.command, "problem": problem})
+    return failures
+
+
+def _init_worker(mode: str | None) -> None:
+    """One PSWorkerPool per process, so the script is only dot-sourced once per process."""
+    global _pool
+    _pool = ps_worker.PSWorkerPool(size=1, mode=mode, timeout=120)
+
+
+def _run_share(seed: int, start: int, stop: int) -> tuple[int, list[dict]]:
+    """Generates and runs cases start to stop of the seed in this worker process."""
+    return stop - start, run_cases(_pool, [make_case(seed, index) for index in range(start, stop)])
+
+
+def shrink(pool: ps_worker.PSWorkerPool, case: Case) -> Case:
+    """
+    Makes a failing case smaller by clearing address bits (highest first) for as long as it
+    still fails, so the replay file has the simplest version of the problem as well.
+    """
+    changed = True
+    while changed:
+        changed = False
+        for position, address in enumerate(case.addresses):
+            candidates = []
+            for bit in range(31, -1, -1):
+                if address & (1 << bit):
+                    addresses = list(case.addresses)
+                    addresses[position] = address & ~(1 << bit)
+                    candidates.append(case._replace(addresses=tuple(addresses)))
+            if not candidates:
+                continue
+            failing = [candidate for candidate, failures in zip(candidates, [run_cases(pool, [c]) for c in candidates]) if failures]
+            if failing:
+                case = failing[0]
+                changed = True
+                break
+    return case
+
+
+def run_differential(count: int, seed: int, workers: int | None = None, mode: str = None,
+                     share_size: int = SHARE_SIZE, failures_file: str | None = FAILURES_FILE) -> dict:
+    """
+    Runs count generated cases on a pool of worker processes. Returns a summary with the
+    failures (and their shrunk versions), which is also written to failures_file when there are any.
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    failures = []
+    checked = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(mode,)) as executor:
+        futures = [executor.submit(_run_share, seed, start, min(start + share_size, count)) for start in range(0, count, share_size)]
+        for future in futures:
+            share_count, share_failures = future.result()
+            checked += share_count
+            failures.extend(share_failures)
+
+    if failures:
+        with ps_worker.PSWorkerPool(size=1, mode=mode) as pool:
+            for failure in failures[:20]:
+                minimal = shrink(pool, case_from_json(failure["case"]))
+                failure["minimal"] = {"case": minimal._asdict(), "command": command_for(minimal)}
+
+    summary = {"seed": seed, "count": checked, "mode": ps_worker.resolve_mode(mode), "seconds": round(time.perf_counter() - start_time, 2), "failures": failures}
+    if failures and failures_file:
+        with open(failures_file, "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+    return summary
+
+
+def replay(path: str, mode: str = None) -> list[dict]:
+    """Runs the failing (and shrunk) cases from a failures file again, returns the ones that still fail."""
+    with open(path, encoding="utf-8") as replay_file:
+        summary = json.load(replay_file)
+
+    cases = []
+    for failure in summary["failures"]:
+        case = case_from_json(failure["case"])
+        # Recreating the case from the seed makes sure the file was written by the same generator
+        if make_case(summary["seed"], case.index) != case:
+            raise ValueError(f"Case {case.index} does not match seed {summary['seed']}, the case generator has changed")
+        cases.append(case)
+        if "minimal" in failure:
+            cases.append(case_from_json(failure["minimal"]["case"]))
+
+    with ps_worker.PSWorkerPool(size=1, mode=mode) as pool:
+        return run_cases(pool, cases)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Number of generated cases")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the cases (random by default)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to the CPU count)")
+    parser.add_argument("--mode", choices=ps_worker.POOL_MODES, default=None, help="Worker backend, like PSCOMMAND_MODE")
+    parser.add_argument("--output", default=FAILURES_FILE, help="Where failing cases are written")
+    parser.add_argument("--replay", help="Replay the failing cases in a failures file")
+    args = parser.parse_args()
+    if ps_worker.resolve_mode(args.mode) not in ps_worker.POOL_MODES:
+        parser.error(f"The cases run on a worker pool, PSCOMMAND_MODE needs to be one of {', '.join(ps_worker.POOL_MODES)}")
+
+    if args.replay:
+        failures = replay(args.replay, args.mode)
+        print(f"{len(failures)} cases still fail")
+        for failure in failures:
+            print(f"  {failure['command']}: {failure['problem']}")
+        raise SystemExit(1 if failures else 0)
+
+    seed = args.seed if args.seed is not None else random.randrange(1 << 32)
+    summary = run_differential(args.count, seed, args.workers, args.mode, failures_file=args.output)
+    print(f"Seed {seed}: {summary['count']} cases in {summary['seconds']} s ({summary['mode']}), {len(summary['failures'])} failures")
+    for failure in summary["failures"][:20]:
+        print(f"  {failure['command']}: {failure['problem']}")
+        if "minimal" in failure:
+            print(f"    minimal: {failure['minimal']['command']}")
+    if summary["failures"]:
+        print(f"Failing cases written to {args.output}, replay with --replay {args.output}")
+    raise SystemExit(1 if summary["failures"] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Vectorised version of the IPv4CIDRSubnetting.ps1 pipeline with NumPy. Same 8 steps as the
+README (host bits -> host mask -> subnet mask -> IP as uint -> network -> broadcast -> first
+and last host), but every step works on whole uint32 arrays of addresses and subnet suffixes
+in one go instead of one address at a time. Converting dotted quad strings to uint32 (and
+back) is vectorised as well, so there is no Python loop per address anywhere.
+
+Needs numpy (pip install numpy).
+"""
+
+import numpy as np
+
+from ip_v4_cidr_subnetting import IPv4CIDRRecord
+
+# Host mask and subnet mask for every subnet suffix from /0 to /32, so masks are a table
+# lookup instead of being worked out again for every address.
+HOST_MASK_TABLE = np.array([(1 << (32 - suffix)) - 1 for suffix in range(33)], dtype=np.uint32)
+SUBNET_MASK_TABLE = ~HOST_MASK_TABLE
+TOTAL_COUNT_TABLE = np.array([1 << (32 - suffix) for suffix in range(33)], dtype=np.uint64)
+
+# Digits (left aligned, zero padded) and number of digits for every octet value, used to format addresses
+_OCTET_CHARS = np.zeros((256, 3), dtype=np.uint8)
+_OCTET_LENGTHS = np.zeros(256, dtype=np.intp)
+for _octet in range(256):
+    _digits = str(_octet).encode("ascii")
+    _OCTET_CHARS[_octet, :len(_digits)] = np.frombuffer(_digits, dtype=np.uint8)
+    _OCTET_LENGTHS[_octet] = len(_digits)
+
+_POWERS_OF_TEN = np.array([1, 10, 100], dtype=np.int32)
+_OCTET_SHIFTS = np.array([24, 16, 8, 0], dtype=np.uint32)
+
+# Parsing needs a few (n, 16) temporary arrays, so big inputs are parsed in chunks of rows
+PARSE_CHUNK_ROWS = 1 << 18
+_IP_STR_WIDTH = 16
+
+
+def _as_suffix_array(subnet_suffix_num, parameter: str = "SubnetSuffixNum") -> np.ndarray:
+    """Subnet suffix (or host bits) as a uint8 array, with the same 0 to 32 range check as ValidateRange."""
+    values = np.asarray(subnet_suffix_num)
+    if values.size and (values.min() < 0 or values.max() > 32):
+        raise ValueError(f"Cannot validate argument on parameter '{parameter}'. Values need to be between 0 and 32.")
+    return values.astype(np.uint8)
+
+
+def get_host_bits_byte(subnet_suffix_num) -> np.ndarray:
+    """Get-HostBitsByte, 32 - suffix."""
+    return np.uint8(32) - _as_suffix_array(subnet_suffix_num)
+
+
+def get_host_mask_uint(host_bits_byte) -> np.ndarray:
+    """Get-HostMaskUInt, 2^hostBits - 1 (looked up from HOST_MASK_TABLE)."""
+    return HOST_MASK_TABLE[32 - _as_suffix_array(host_bits_byte, "HostBitsByte").astype(np.intp)]
+
+
+def get_subnet_mask_uint(subnet_suffix_num) -> np.ndarray:
+    """Get-SubnetMaskUInt, NOT host mask (looked up from SUBNET_MASK_TABLE)."""
+    return SUBNET_MASK_TABLE[_as_suffix_array(subnet_suffix_num)]
+
+
+def get_network_ip_address_uint(ip_prefix_uint, subnet_mask_uint) -> np.ndarray:
+    """Get-NetworkIpAddressUInt, IP AND subnet mask."""
+    return np.bitwise_and(np.asarray(ip_prefix_uint, dtype=np.uint32), np.asarray(subnet_mask_uint, dtype=np.uint32))
+
+
+def get_broadcast_ip_address_uint(network_ip_uint, host_mask_uint) -> np.ndarray:
+    """Get-BroadcastIpAddressUInt, network IP OR host mask."""
+    return np.bitwise_or(np.asarray(network_ip_uint, dtype=np.uint32), np.asarray(host_mask_uint, dtype=np.uint32))
+
+
+def get_total_count_of_ip_address(subnet_suffix_num) -> np.ndarray:
+    """Get-TotalCountOfIPAddress, 2^(32 - suffix). Stored as uint64 so /0 does not overflow like the [uint] does."""
+    return TOTAL_COUNT_TABLE[_as_suffix_array(subnet_suffix_num, "subnetSuffixNum")]
+
+
+def _parse_ip_chunk(chars: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parses an (n, 16) uint8 array of ASCII characters, returns the uint32 addresses and a mask of
+    the rows that are valid. Valid means the same as the ValidatePattern regex in the script:
+    4 octets from 0 to 255 separated by dots, no leading zeros and nothing else.
+    """
+    is_digit = (chars >= 48) & (chars <= 57)
+    is_dot = chars == 46
+    is_pad = chars == 0
+
+    valid = np.all(is_digit | is_dot | is_pad, axis=1)
+    valid &= ~np.any(np.maximum.accumulate(is_pad, axis=1) & ~is_pad, axis=1)
+    dot_count = np.cumsum(is_dot, axis=1, dtype=np.int8)
+    valid &= dot_count[:, -1] == 3
+
+    # Each octet sits between two dots (or the start/end of the string), so the octet values can be
+    # gathered from at most 3 columns per octet instead of looking at all 16 columns again.
+    length = np.count_nonzero(~is_pad, axis=1)
+    dots = [np.argmax(dot_count >= k, axis=1) for k in (1, 2, 3)]
+    starts = [np.zeros_like(length)] + [dot + 1 for dot in dots]
+    ends = dots + [length]
+    ip_prefix_uint = np.zeros(len(chars), dtype=np.uint32)
+
+    for octet in range(4):
+        digit_count = ends[octet] - starts[octet]
+        value = np.zeros(len(chars), dtype=np.int32)
+
+        for place in range(3):
+            column = np.clip(ends[octet] - 1 - place, 0, chars.shape[1] - 1)
+            digit = np.take_along_axis(chars, column[:, None], axis=1)[:, 0].astype(np.int32) - 48
+            value += np.where(place < digit_count, digit * _POWERS_OF_TEN[place], 0)
+
+        first_digit = np.take_along_axis(chars, np.clip(starts[octet], 0, chars.shape[1] - 1)[:, None], axis=1)[:, 0]
+        valid &= (digit_count >= 1) & (digit_count <= 3) & (value <= 255) & ~((digit_count > 1) & (first_digit == 48))
+        ip_prefix_uint |= value.astype(np.uint32) << _OCTET_SHIFTS[octet]
+
+    return ip_prefix_uint, valid
+
+
+def _to_ascii_rows(ip_strs, width: int) -> np.ndarray:
+    """Strings as an (n, width) uint8 array, rows that are too long get a non zero last byte."""
+    try:
+        values = np.asarray(ip_strs, dtype=f"S{width}")
+    except UnicodeEncodeError as error:
+        raise ValueError(f"IP addresses need to be ASCII: {error}") from error
+    return np.ascontiguousarray(values).view(np.uint8).reshape(-1, width)
+
+
+def convert_ip_str_to_ip_uint(ip_strs, errors: str = "raise") -> np.ndarray:
+    """
+    Convert-IPStrToIPUInt for a whole array of dotted quad strings. With errors="raise" an invalid
+    address raises a ValueError (like ValidatePattern), with errors="mask" a tuple of the addresses
+    and a boolean mask of the valid ones is returned instead (invalid rows are 0).
+    """
+    chars = _to_ascii_rows(ip_strs, _IP_STR_WIDTH)
+    ip_prefix_uint = np.zeros(len(chars), dtype=np.uint32)
+    valid = np.zeros(len(chars), dtype=bool)
+
+    for start in range(0, len(chars), PARSE_CHUNK_ROWS):
+        chunk = slice(start, start + PARSE_CHUNK_ROWS)
+        ip_prefix_uint[chunk], valid[chunk] = _parse_ip_chunk(chars[chunk])
+
+    ip_prefix_uint[~valid] = 0
+
+    if errors == "mask":
+        return ip_prefix_uint, valid
+
+    if not valid.all():
+        index = int(np.argmin(valid))
+        raise ValueError(f"Cannot validate argument on parameter 'IPStr'. The argument \"{np.asarray(ip_strs).ravel()[index]}\" at index {index} is not a valid IPv4 address.")
+
+    return ip_prefix_uint
+
+
+def convert_ip_num_to_ip_str(ip_prefix_uint) -> np.ndarray:
+    """Convert-IPNumToIpStr for a whole array of uint32 addresses, returns an array of strings."""
+    ip_prefix_uint = np.asarray(ip_prefix_uint, dtype=np.uint32).ravel()
+    octets = ((ip_prefix_uint[:, None] >> _OCTET_SHIFTS) & 0xFF).astype(np.intp)
+    buffer = np.zeros((len(ip_prefix_uint), 15), dtype=np.uint8)
+    rows = np.arange(len(ip_prefix_uint))
+    cursor = np.zeros(len(ip_prefix_uint), dtype=np.intp)
+
+    for octet in range(4):
+        lengths = _OCTET_LENGTHS[octets[:, octet]]
+        chars = _OCTET_CHARS[octets[:, octet]]
+        for digit in range(3):
+            has_digit = digit < lengths
+            buffer[rows[has_digit], cursor[has_digit] + digit] = chars[has_digit, digit]
+        cursor += lengths
+        if octet != 3:
+            buffer[rows, cursor] = 46
+            cursor += 1
+
+    return buffer.view("S15").ravel().astype("U15")
+
+
+def split_cidr(cidr_strs, errors: str = "raise"):
+    """
+    Splits an array of CIDR strings into uint32 addresses and uint8 subnet suffixes, validated
+    like the CIDRAddress ValidatePattern. With errors="mask" a third value, the mask of valid
+    rows, is returned instead of raising.
+    """
+    chars = _to_ascii_rows(cidr_strs, _IP_STR_WIDTH + 3)
+    is_slash = chars == 47
+    slash_count = is_slash.sum(axis=1)
+    slash_at = np.argmax(is_slash, axis=1)
+    columns = np.arange(chars.shape[1])
+
+    # Address part is everything before the slash, suffix part is the (up to 2) digits after it
+    ip_chars = np.where(columns[None, :_IP_STR_WIDTH] < slash_at[:, None], chars[:, :_IP_STR_WIDTH], 0).astype(np.uint8)
+    ip_prefix_uint, valid = convert_ip_str_to_ip_uint(ip_chars.view(f"S{_IP_STR_WIDTH}").ravel(), errors="mask")
+
+    after = np.where(columns[None, :] > slash_at[:, None], chars, 0)
+    suffix_chars = np.take_along_axis(after, np.clip(slash_at[:, None] + np.arange(1, 4), 0, chars.shape[1] - 1), axis=1)
+    suffix_is_digit = (suffix_chars >= 48) & (suffix_chars <= 57)
+    suffix_count = np.argmin(np.concatenate([suffix_is_digit, np.zeros((len(chars), 1), dtype=bool)], axis=1), axis=1)
+    first = suffix_chars[:, 0].astype(np.int32) - 48
+    second = suffix_chars[:, 1].astype(np.int32) - 48
+    suffix = np.where(suffix_count == 2, first * 10 + second, first)
+
+    valid &= slash_count == 1
+    valid &= (suffix_count >= 1) & (suffix_count <= 2) & (suffix <= 32)
+    valid &= ~((suffix_count == 2) & (first == 0))
+    valid &= (after != 0).sum(axis=1) == suffix_count
+    suffix = np.where(valid, suffix, 0).astype(np.uint8)
+
+    if errors == "mask":
+        return ip_prefix_uint, suffix, valid
+
+    if not valid.all():
+        index = int(np.argmin(valid))
+        raise ValueError(f"Cannot validate argument on parameter 'CIDRAddress'. The argument \"{np.asarray(cidr_strs).ravel()[index]}\" at index {index} is not a valid IPv4 CIDR address.")
+
+    return ip_prefix_uint, suffix
+
+
+def get_ipv4_cidr_translation(ip_prefix_uint, subnet_suffix_num) -> dict:
+    """
+    Get-IPv4CIDRTranslation for whole arrays of addresses and subnet suffixes (they are broadcast
+    against each other). Returns the same keys as the cmdlet's hashtable, each one an array of the
+    numerical values, plus HostBitsSet for the rows where the cmdlet would write the host bits warning.
+    First and last host are int64 since the cmdlet does not wrap them around either (i.e. /32 edges).
+    """
+    ip_prefix_uint = np.asarray(ip_prefix_uint, dtype=np.uint32)
+    suffixes = _as_suffix_array(subnet_suffix_num)
+    host_mask_uint = HOST_MASK_TABLE[suffixes]
+    subnet_mask_uint = SUBNET_MASK_TABLE[suffixes]
+    network_ip_uint = get_network_ip_address_uint(ip_prefix_uint, subnet_mask_uint)
+    broadcast_uint = get_broadcast_ip_address_uint(network_ip_uint, host_mask_uint)
+
+    return {
+        "NetworkIP": network_ip_uint,
+        "BroadcastIP": broadcast_uint,
+        "SubnetMask": subnet_mask_uint,
+        "HostMask": host_mask_uint,
+        "FirstHost": network_ip_uint.astype(np.int64) + 1,
+        "LastHost": broadcast_uint.astype(np.int64) - 1,
+        "TotalAddresses": TOTAL_COUNT_TABLE[suffixes],
+        "HostBitsSet": (ip_prefix_uint & host_mask_uint) != 0,
+    }
+
+
+def get_network_and_broadcast(ip_prefix_uint, subnet_suffix_num) -> tuple[np.ndarray, np.ndarray]:
+    """Network and broadcast IP arrays, the ranges every comparison is based on."""
+    suffixes = _as_suffix_array(subnet_suffix_num)
+    network_ip_uint = np.asarray(ip_prefix_uint, dtype=np.uint32) & SUBNET_MASK_TABLE[suffixes]
+    return network_ip_uint, network_ip_uint | HOST_MASK_TABLE[suffixes]
+
+
+def is_ip_in_subnet(ip_uint, ip_prefix_uint, subnet_suffix_num) -> np.ndarray:
+    """Test-IPInSubnet, network IP <= IP <= broadcast IP, element wise (arrays are broadcast)."""
+    network_ip_uint, broadcast_ip_uint = get_network_and_broadcast(ip_prefix_uint, subnet_suffix_num)
+    ip_uint = np.asarray(ip_uint, dtype=np.uint32)
+    return (ip_uint >= network_ip_uint) & (ip_uint <= broadcast_ip_uint)
+
+
+def compare_subnets(ip_prefix_uint_a, subnet_suffix_num_a, ip_prefix_uint_b, subnet_suffix_num_b) -> np.ndarray:
+    """Compare-Subnets, Network A <= Broadcast B && Broadcast A >= Network B, element wise."""
+    network_ip_uint_a, broadcast_ip_uint_a = get_network_and_broadcast(ip_prefix_uint_a, subnet_suffix_num_a)
+    network_ip_uint_b, broadcast_ip_uint_b = get_network_and_broadcast(ip_prefix_uint_b, subnet_suffix_num_b)
+    return (network_ip_uint_a <= broadcast_ip_uint_b) & (broadcast_ip_uint_a >= network_ip_uint_b)
+
+
+class IPv4CIDRRecords:
+    """
+    Columnar version of IPv4CIDRRecord for translating lots of CIDRs at once. Like the record,
+    only the network IPs and subnet suffixes are stored (5 bytes per CIDR), everything else is
+    looked up from the mask tables when it's used. Octets and binary strings are only formatted
+    for the column that's asked for.
+    """
+    __slots__ = ("NetworkIP", "SubnetSuffix")
+
+    def __init__(self, network_ip_uint, subnet_suffix_num):
+        self.SubnetSuffix = _as_suffix_array(subnet_suffix_num)
+        self.NetworkIP = np.asarray(network_ip_uint, dtype=np.uint32) & SUBNET_MASK_TABLE[self.SubnetSuffix]
+
+    @classmethod
+    def from_cidrs(cls, cidr_strs) -> "IPv4CIDRRecords":
+        """Records for an array of CIDR strings, host bits are zeroed like ConvertTo-IPv4CIDRRecord."""
+        return cls(*split_cidr(cidr_strs))
+
+    @property
+    def BroadcastIP(self) -> np.ndarray:
+        return self.NetworkIP | HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def SubnetMask(self) -> np.ndarray:
+        return SUBNET_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def HostMask(self) -> np.ndarray:
+        return HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def FirstHost(self) -> np.ndarray:
+        return self.NetworkIP.astype(np.int64) + 1
+
+    @property
+    def LastHost(self) -> np.ndarray:
+        return self.BroadcastIP.astype(np.int64) - 1
+
+    @property
+    def TotalAddresses(self) -> np.ndarray:
+        return TOTAL_COUNT_TABLE[self.SubnetSuffix]
+
+    def octets(self, key: str) -> np.ndarray:
+        """Dotted quad strings for one of the NetworkIP/BroadcastIP/... columns."""
+        return convert_ip_num_to_ip_str(getattr(self, key) & 0xFFFFFFFF)
+
+    def binary(self, key: str) -> np.ndarray:
+        """32 character binary strings for one of the NetworkIP/BroadcastIP/... columns."""
+        bits = (np.asarray(getattr(self, key) & 0xFFFFFFFF, dtype=np.uint32)[:, None] >> np.arange(31, -1, -1, dtype=np.uint32)) & 1
+        return (bits.astype(np.uint8) + ord("0")).view("S32").ravel().astype("U32")
+
+    def __len__(self) -> int:
+        return len(self.NetworkIP)
+
+    def __getitem__(self, position: int):
+        """One row as an IPv4CIDRRecord."""
+        return IPv4CIDRRecord(int(self.NetworkIP[position]), int(self.SubnetSuffix[position]))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored columns."""
+        return self.NetworkIP.nbytes + self.SubnetSuffix.nbytes
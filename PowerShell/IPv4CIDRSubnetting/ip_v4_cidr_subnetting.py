@@ -0,0 +1,307 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Python twin of the IPv4CIDRSubnetting.ps1 cmdlets. Every function here follows the same
+bitwise steps as its PowerShell counterpart (see the README for the 8 step process), so
+the unit tests can run against it when pwsh is not installed and so the bulk tools in
+this folder have one place to get their mask/network/broadcast math from.
+"""
+
+import re
+
+UINT_MAX_VALUE = 4294967295
+BYTE_MAX_VALUE = 255
+
+# Same validation patterns as the ValidatePattern attributes in IPv4CIDRSubnetting.ps1
+# pylint: disable=line-too-long
+IP_PATTERN = re.compile(r"^(?:(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])$")
+CIDR_PATTERN = re.compile(r"^(?:(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\/(?:3[0-2]|[1-2]?[0-9])$")
+
+
+def _validate_range(parameter: str, value: int, minimum: int, maximum: int) -> None:
+    """Same check (and wording) as the PowerShell ValidateRange attribute."""
+    if value < minimum:
+        raise ValueError(f"Cannot validate argument on parameter '{parameter}'. The {value} argument is less than the minimum allowed range of {minimum}. Supply an argument that is greater than or equal to {minimum} and then try the command again.")
+    if value > maximum:
+        raise ValueError(f"Cannot validate argument on parameter '{parameter}'. The {value} argument is greater than the maximum allowed range of {maximum}. Supply an argument that is less than or equal to {maximum} and then try the command again.")
+
+
+def _validate_pattern(parameter: str, value: str, pattern: re.Pattern) -> None:
+    """Same check (and wording) as the PowerShell ValidatePattern attribute."""
+    if pattern.match(value) is None:
+        raise ValueError(f"Cannot validate argument on parameter '{parameter}'. The argument \"{value}\" does not match the \"{pattern.pattern}\" pattern. Supply an argument that matches \"{pattern.pattern}\" and try the command again.")
+
+
+def _to_uint(parameter: str, value: int) -> int:
+    """Casting to [uint] throws when the value does not fit in 32 bits."""
+    if value < 0 or value > UINT_MAX_VALUE:
+        raise ValueError(f"Cannot convert value \"{value}\" to type \"System.UInt32\" for parameter '{parameter}'. Value was either too large or too small for a UInt32.")
+    return value
+
+
+def split_cidr(cidr_address: str) -> tuple[str, int]:
+    """Splits a CIDR address into the IP address string and the subnet suffix number."""
+    ip_str, suffix = cidr_address.split("/")
+    return ip_str, int(suffix)
+
+
+def convert_ip_num_to_ip_str(ip_prefix_uint: int) -> str:
+    """Convert-IPNumToIpStr, (IP >> 8 * (3 - i)) & 0xFF for each octet."""
+    _to_uint("IpPrefixUInt", ip_prefix_uint)
+    return ".".join(str((ip_prefix_uint >> (8 * (3 - i))) & 0xFF) for i in range(4))
+
+
+def convert_ip_str_to_ip_uint(ip_str: str) -> int:
+    """Convert-IPStrToIPUInt, octet << 8 * (3 - i) for each octet added together."""
+    _validate_pattern("IPStr", ip_str, IP_PATTERN)
+    ip_prefix_uint = 0
+    for i, octet in enumerate(ip_str.split(".")):
+        ip_prefix_uint += int(octet) << (8 * (3 - i))
+    return ip_prefix_uint
+
+
+def get_host_bits_byte(subnet_suffix_num: int) -> int:
+    """Get-HostBitsByte, 32 - suffix."""
+    _validate_range("SubnetSuffixNum", subnet_suffix_num, 0, 32)
+    return 32 - subnet_suffix_num
+
+
+def get_host_mask_uint(host_bits_byte: int) -> int:
+    """Get-HostMaskUInt, 2^hostBits - 1."""
+    _validate_range("HostBitsByte", host_bits_byte, 0, 32)
+    return (1 << host_bits_byte) - 1
+
+
+def get_subnet_mask_uint(subnet_suffix_num: int) -> int:
+    """Get-SubnetMaskUInt, NOT host mask (kept to 32 bits)."""
+    host_mask_uint = get_host_mask_uint(get_host_bits_byte(subnet_suffix_num))
+    return ~host_mask_uint & UINT_MAX_VALUE
+
+
+def get_network_ip_address_uint(ip_prefix_uint: int, subnet_mask_uint: int) -> int:
+    """Get-NetworkIpAddressUInt, IP AND subnet mask."""
+    return _to_uint("IpPrefixUInt", ip_prefix_uint) & _to_uint("subnetMaskUInt", subnet_mask_uint)
+
+
+def get_broadcast_ip_address_uint(network_ip_uint: int, host_mask_uint: int) -> int:
+    """Get-BroadcastIpAddressUInt, network IP OR host mask."""
+    return _to_uint("networkIpUInt", network_ip_uint) | _to_uint("hostMaskUInt", host_mask_uint)
+
+
+def get_total_count_of_ip_address(subnet_suffix_num: int) -> int:
+    """Get-TotalCountOfIPAddress, 2^(32 - suffix). /0 overflows [uint] just like the cmdlet."""
+    _validate_range("subnetSuffixNum", subnet_suffix_num, 0, 32)
+    total_addresses = 1 << (32 - subnet_suffix_num)
+    if total_addresses > UINT_MAX_VALUE:
+        raise ValueError(f"Cannot convert value \"{total_addresses}\" to type \"System.UInt32\". Error: \"Value was either too large or too small for a UInt32.\"")
+    return total_addresses
+
+
+def _address_entry(value: int) -> dict:
+    """One of the Numerical/Octets/Binary hashtables from Get-IPv4CIDRTranslation."""
+    return {
+        "Numerical": value,
+        "Octets": convert_ip_num_to_ip_str(value),
+        "Binary": format(value, "b").zfill(32),
+    }
+
+
+def get_ipv4_cidr_translation(cidr_address: str, warnings: list = None) -> dict:
+    """
+    Get-IPv4CIDRTranslation, returns the same nested dictionary as the cmdlet's hashtable. If host
+    bits are set the warning is appended to the warnings list (if one is passed in) like Write-Warning.
+    """
+    _validate_pattern("CIDRAddress", cidr_address, CIDR_PATTERN)
+    ip_str, subnet_suffix_num = split_cidr(cidr_address)
+    ip_prefix_uint = convert_ip_str_to_ip_uint(ip_str)
+    host_mask_uint = get_host_mask_uint(get_host_bits_byte(subnet_suffix_num))
+    subnet_mask_uint = get_subnet_mask_uint(subnet_suffix_num)
+    network_ip_uint = get_network_ip_address_uint(ip_prefix_uint, subnet_mask_uint)
+    broadcast_uint = get_broadcast_ip_address_uint(network_ip_uint, host_mask_uint)
+
+    if (ip_prefix_uint & host_mask_uint) != 0 and warnings is not None:
+        warnings.append("Host bit(s) is not valid when comparing to subnet mask, host bit(s) will be zero!")
+
+    # First and last host are not wrapped around to a [uint] in the cmdlet, so the first host of
+    # 255.255.255.255/32 and the last host of 0.0.0.0/32 fail the Convert-IPNumToIpStr binding
+    return {
+        "NetworkIP": _address_entry(network_ip_uint),
+        "BroadcastIP": _address_entry(broadcast_uint),
+        "SubnetMask": _address_entry(subnet_mask_uint),
+        "HostMask": _address_entry(host_mask_uint),
+        "FirstHost": _address_entry(network_ip_uint + 1),
+        "LastHost": _address_entry(broadcast_uint - 1),
+        "TotalAddresses": get_total_count_of_ip_address(subnet_suffix_num),
+    }
+
+
+# Host mask and subnet mask for every subnet suffix from /0 to /32, same as the tables the
+# IPv4CIDRRecord class in the script fills in when it's loaded
+HOST_MASK_TABLE = tuple(get_host_mask_uint(get_host_bits_byte(suffix)) for suffix in range(33))
+SUBNET_MASK_TABLE = tuple(get_subnet_mask_uint(suffix) for suffix in range(33))
+TRANSLATION_KEYS = ("NetworkIP", "BroadcastIP", "SubnetMask", "HostMask", "FirstHost", "LastHost")
+
+
+class AddressView:
+    """
+    One of the NetworkIP/BroadcastIP/... entries of a record, the octets and binary strings are
+    only formatted when they are used. view["Octets"] works as well, like the hashtable.
+    """
+    __slots__ = ("Numerical",)
+
+    def __init__(self, numerical: int):
+        self.Numerical = numerical
+
+    @property
+    def Octets(self) -> str:
+        return convert_ip_num_to_ip_str(self.Numerical & UINT_MAX_VALUE)
+
+    @property
+    def Binary(self) -> str:
+        return format(self.Numerical & UINT_MAX_VALUE, "032b")
+
+    def __getitem__(self, key: str):
+        if key not in ("Numerical", "Octets", "Binary"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return f"AddressView({self.Octets})"
+
+
+class IPv4CIDRRecord:
+    """
+    Lean version of the Get-IPv4CIDRTranslation result, the same as the IPv4CIDRRecord objects
+    from ConvertTo-IPv4CIDRRecord. Only the network IP and subnet suffix are stored, the rest comes
+    from the mask tables when it's asked for. record["BroadcastIP"]["Octets"] reads the same as the
+    hashtable and to_dict() builds the full hashtable.
+    """
+    __slots__ = ("NetworkIP", "SubnetSuffix")
+
+    def __init__(self, network_ip_uint: int, subnet_suffix: int):
+        self.NetworkIP = network_ip_uint
+        self.SubnetSuffix = subnet_suffix
+
+    @property
+    def BroadcastIP(self) -> int:
+        return self.NetworkIP | HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def SubnetMask(self) -> int:
+        return SUBNET_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def HostMask(self) -> int:
+        return HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def FirstHost(self) -> int:
+        return self.NetworkIP + 1
+
+    @property
+    def LastHost(self) -> int:
+        return self.BroadcastIP - 1
+
+    @property
+    def TotalAddresses(self) -> int:
+        """2^(32 - suffix), as a long so /0 doesn't overflow like Get-TotalCountOfIPAddress does."""
+        return HOST_MASK_TABLE[self.SubnetSuffix] + 1
+
+    def __getitem__(self, key: str):
+        if key == "TotalAddresses":
+            return self.TotalAddresses
+        if key not in TRANSLATION_KEYS:
+            raise KeyError(key)
+        return AddressView(getattr(self, key))
+
+    def to_dict(self) -> dict:
+        """
+        The full Get-IPv4CIDRTranslation hashtable for the record. Like ToTranslation in the script, the
+        octets and binary of a first or last host outside a [uint] are wrapped instead of throwing.
+        """
+        translation = {key: {"Numerical": view.Numerical, "Octets": view.Octets, "Binary": view.Binary}
+                       for key, view in ((key, self[key]) for key in TRANSLATION_KEYS)}
+        translation["TotalAddresses"] = get_total_count_of_ip_address(self.SubnetSuffix)
+        return translation
+
+    @classmethod
+    def from_json(cls, value: dict) -> "IPv4CIDRRecord":
+        """Record from the ConvertTo-Json output of the script's record (e.g. a run_batch value)."""
+        return cls(value["NetworkIP"], value["SubnetSuffix"])
+
+    def to_json(self) -> dict:
+        """What ConvertTo-Json gives for the script's record, only the properties that are stored."""
+        return {"NetworkIP": self.NetworkIP, "SubnetSuffix": self.SubnetSuffix}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IPv4CIDRRecord):
+            return NotImplemented
+        return self.NetworkIP == other.NetworkIP and self.SubnetSuffix == other.SubnetSuffix
+
+    def __hash__(self) -> int:
+        return hash((self.NetworkIP, self.SubnetSuffix))
+
+    def __str__(self) -> str:
+        return f"{convert_ip_num_to_ip_str(self.NetworkIP)}/{self.SubnetSuffix}"
+
+    def __repr__(self) -> str:
+        return f"IPv4CIDRRecord({self})"
+
+
+def convert_to_ipv4_cidr_record(cidr_address: str, warnings: list = None) -> IPv4CIDRRecord:
+    """ConvertTo-IPv4CIDRRecord, same validation and host bits warning as get_ipv4_cidr_translation."""
+    _validate_pattern("CIDRAddress", cidr_address, CIDR_PATTERN)
+    ip_str, subnet_suffix_num = split_cidr(cidr_address)
+    ip_prefix_uint = convert_ip_str_to_ip_uint(ip_str)
+
+    if (ip_prefix_uint & HOST_MASK_TABLE[subnet_suffix_num]) != 0 and warnings is not None:
+        warnings.append("Host bit(s) is not valid when comparing to subnet mask, host bit(s) will be zero!")
+
+    return IPv4CIDRRecord(ip_prefix_uint & SUBNET_MASK_TABLE[subnet_suffix_num], subnet_suffix_num)
+
+
+def get_network_and_broadcast(cidr_address: str) -> tuple[int, int]:
+    """Network and broadcast IP for a CIDR address, the range every comparison is based on."""
+    _validate_pattern("CIDRAddress", cidr_address, CIDR_PATTERN)
+    ip_str, subnet_suffix_num = split_cidr(cidr_address)
+    network_ip_uint = convert_ip_str_to_ip_uint(ip_str) & get_subnet_mask_uint(subnet_suffix_num)
+    return network_ip_uint, network_ip_uint | get_host_mask_uint(get_host_bits_byte(subnet_suffix_num))
+
+
+def compare_subnets(cidr_address_a: str, cidr_address_b: str) -> bool:
+    """Compare-Subnets, Network A <= Broadcast B && Broadcast A >= Network B."""
+    _validate_pattern("CIDRAddressA", cidr_address_a, CIDR_PATTERN)
+    _validate_pattern("CIDRAddressB", cidr_address_b, CIDR_PATTERN)
+    network_ip_uint_a, broadcast_ip_uint_a = get_network_and_broadcast(cidr_address_a)
+    network_ip_uint_b, broadcast_ip_uint_b = get_network_and_broadcast(cidr_address_b)
+
+    return network_ip_uint_a <= broadcast_ip_uint_b and broadcast_ip_uint_a >= network_ip_uint_b
+
+
+def is_ip_in_subnet(ip_str: str, cidr_address: str) -> bool:
+    """Test-IPInSubnet, network IP <= IP <= broadcast IP."""
+    _validate_pattern("IPStr", ip_str, IP_PATTERN)
+    _validate_pattern("CIDRAddress", cidr_address, CIDR_PATTERN)
+    ip_num = convert_ip_str_to_ip_uint(ip_str)
+    network_ip_uint, broadcast_ip_uint = get_network_and_broadcast(cidr_address)
+    return network_ip_uint <= ip_num <= broadcast_ip_uint
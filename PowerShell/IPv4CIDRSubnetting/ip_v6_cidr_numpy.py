@@ -0,0 +1,342 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+IPv6 version of the vectorised CIDR pipeline in ip_v4_cidr_numpy.py, for dual stack VNets. A
+128 bit address doesn't fit in any NumPy integer, so addresses are stored as (n, 2) uint64 arrays,
+the high 64 bits in column 0 and the low 64 bits in column 1 (16 bytes per address, no Python ints
+or IPv6Address objects). The steps are the same as for IPv4: the host and subnet masks are looked
+up from 129 entry tables (/0 to /128), network is IP AND subnet mask, broadcast (the last address,
+IPv6 has no broadcast but IPv6Network calls it that too) is network OR host mask, and the
+comparisons compare the high column first and the low column when the high ones are equal.
+
+Parsing is the one step that runs per address, with socket.inet_pton (in C) since the :: and
+embedded IPv4 forms don't split into fixed columns like dotted quads do. Formatting back to
+strings is vectorised and gives the same compressed form as str(IPv6Address).
+
+Needs numpy (pip install numpy).
+"""
+
+import socket
+from ipaddress import IPv6Network
+
+import numpy as np
+
+ADDRESS_BITS = 128
+_HIGH_SHIFTS = np.array([48, 32, 16, 0], dtype=np.uint64)
+_MAX_STR_WIDTH = 39
+
+
+def _mask_columns(bits: int) -> tuple[int, int]:
+    """High and low 64 bit columns of a mask with the top bits set."""
+    mask = ((1 << bits) - 1) << (ADDRESS_BITS - bits)
+    return mask >> 64, mask & 0xFFFFFFFFFFFFFFFF
+
+
+# Subnet mask and host mask for every subnet suffix from /0 to /128, as (129, 2) uint64 tables
+SUBNET_MASK_TABLE = np.array([_mask_columns(suffix) for suffix in range(ADDRESS_BITS + 1)], dtype=np.uint64)
+HOST_MASK_TABLE = ~SUBNET_MASK_TABLE
+# 2^(128 - suffix) is a power of two, so float64 holds it exactly even for /0
+TOTAL_COUNT_TABLE = np.array([2.0 ** (ADDRESS_BITS - suffix) for suffix in range(ADDRESS_BITS + 1)], dtype=np.float64)
+
+# Lower case hex digits (left aligned) and number of digits for every 16 bit group, used to format addresses
+# The extra last entry (_NO_HEXTET) is empty, for groups that are left out because they're in the ::
+_NO_HEXTET = 1 << 16
+_HEXTET_VALUES = np.arange(_NO_HEXTET + 1, dtype=np.uint32)
+_HEXTET_LENGTHS = np.where(_HEXTET_VALUES == _NO_HEXTET, 0, 1 + (_HEXTET_VALUES > 0xF) + (_HEXTET_VALUES > 0xFF) + (_HEXTET_VALUES > 0xFFF)).astype(np.intp)
+_HEXTET_CHARS = np.zeros((_NO_HEXTET + 1, 4), dtype=np.uint8)
+for _digit in range(4):
+    _shift = (4 * (_HEXTET_LENGTHS - 1 - _digit)).clip(0).astype(np.uint32)
+    _nibble = (_HEXTET_VALUES >> _shift) & 0xF
+    _HEXTET_CHARS[:, _digit] = np.where(_digit < _HEXTET_LENGTHS, np.where(_nibble < 10, _nibble + 48, _nibble + 87), 0)
+
+
+def _as_suffix_array(subnet_suffix_num, parameter: str = "SubnetSuffixNum") -> np.ndarray:
+    """Subnet suffix as a uint8 array, with a 0 to 128 range check like ValidateRange."""
+    values = np.asarray(subnet_suffix_num)
+    if values.size and (values.min() < 0 or values.max() > ADDRESS_BITS):
+        raise ValueError(f"Cannot validate argument on parameter '{parameter}'. Values need to be between 0 and {ADDRESS_BITS}.")
+    return values.astype(np.uint8)
+
+
+def _as_address_array(ip_uint) -> np.ndarray:
+    """Addresses as an (n, 2) uint64 array, strings are parsed with convert_ip_str_to_ip_uint."""
+    values = np.asarray(ip_uint)
+    if values.dtype.kind in "USO":
+        return convert_ip_str_to_ip_uint(values.ravel().tolist())
+    return values.astype(np.uint64).reshape(-1, 2)
+
+
+def to_uint64_pairs(ip_ints) -> np.ndarray:
+    """Python int addresses (0 to 2^128 - 1) as an (n, 2) uint64 array."""
+    return np.array([(ip >> 64, ip & 0xFFFFFFFFFFFFFFFF) for ip in ip_ints], dtype=np.uint64).reshape(-1, 2)
+
+
+def from_uint64_pairs(ip_uint) -> list[int]:
+    """(n, 2) uint64 addresses back to Python ints, e.g. for ipaddress.IPv6Address."""
+    return [(high << 64) | low for high, low in np.asarray(ip_uint, dtype=np.uint64).reshape(-1, 2).tolist()]
+
+
+def is_ipv6_str(ip_strs) -> np.ndarray:
+    """True for the strings that are IPv6 (they have a colon), to split dual stack lists between the two engines."""
+    return np.char.find(np.asarray(ip_strs, dtype=str), ":") >= 0
+
+
+def convert_ip_str_to_ip_uint(ip_strs, errors: str = "raise") -> np.ndarray:
+    """
+    IPv6 addresses (any form inet_pton takes, e.g. 2001:db8::1 or ::ffff:10.28.0.1) as an (n, 2)
+    uint64 array. With errors="raise" an invalid address raises a ValueError, with errors="mask" a
+    tuple of the addresses and a boolean mask of the valid ones is returned instead (invalid rows are 0).
+    """
+    ip_strs = list(ip_strs)
+    pton = socket.inet_pton
+    try:
+        packed = b"".join([pton(socket.AF_INET6, ip_str) for ip_str in ip_strs])
+        valid = np.ones(len(ip_strs), dtype=bool)
+    except (OSError, TypeError, ValueError):
+        # Only when there's a bad one, the addresses are parsed again one at a time to find it
+        parts = []
+        valid = np.ones(len(ip_strs), dtype=bool)
+        for i, ip_str in enumerate(ip_strs):
+            try:
+                parts.append(pton(socket.AF_INET6, ip_str))
+            except (OSError, TypeError, ValueError):
+                parts.append(bytes(16))
+                valid[i] = False
+        packed = b"".join(parts)
+
+        if errors != "mask":
+            index = int(np.argmin(valid))
+            raise ValueError(f"Cannot validate argument on parameter 'IPStr'. The argument \"{ip_strs[index]}\" at index {index} is not a valid IPv6 address.") from None
+
+    ip_uint = np.frombuffer(packed, dtype=">u8").astype(np.uint64).reshape(-1, 2)
+    return (ip_uint, valid) if errors == "mask" else ip_uint
+
+
+def convert_ip_num_to_ip_str(ip_uint) -> np.ndarray:
+    """
+    (n, 2) uint64 addresses as compressed strings like str(IPv6Address): lower case hex without
+    leading zeros, and the longest run of two or more zero groups (the first one on a tie) as ::.
+    """
+    ip_uint = np.asarray(ip_uint, dtype=np.uint64).reshape(-1, 2)
+    count = len(ip_uint)
+    hextets = np.concatenate([(ip_uint[:, column, None] >> _HIGH_SHIFTS) & np.uint64(0xFFFF) for column in (0, 1)], axis=1).astype(np.int32)
+
+    # Length of the run of zero groups starting at each group
+    zero_runs = np.zeros((count, 9), dtype=np.int8)
+    for group in range(7, -1, -1):
+        zero_runs[:, group] = (zero_runs[:, group + 1] + 1) * (hextets[:, group] == 0)
+    run_start = np.argmax(zero_runs[:, :8], axis=1).astype(np.int8)
+    run_length = np.max(zero_runs[:, :8], axis=1)
+    compressed = run_length >= 2
+    run_end = np.where(compressed, run_start + run_length, -1)
+
+    # Every group gets a 5 byte slot, a : in front (or :: where the run of zero groups starts, its
+    # own digits are left out) and then its digits padded with 0 bytes. Squeezing the 0 bytes out
+    # of each row then gives the string, without working out where each group ends up (which
+    # takes a fancy indexed write per character position).
+    groups = np.arange(8, dtype=np.int8)
+    in_run = compressed[:, None] & (run_start[:, None] <= groups) & (groups < run_end[:, None])
+    starts_run = compressed[:, None] & (run_start[:, None] == groups)
+    separator = ~in_run & (groups > 0) & (run_end[:, None] != groups)
+    chars = _HEXTET_CHARS[np.where(in_run, _NO_HEXTET, hextets)]
+
+    slots = np.zeros((count, 41), dtype=np.uint8)
+    group_slots = slots[:, :40].reshape(count, 8, 5)
+    group_slots[:, :, 0] = 58 * (separator | starts_run)
+    group_slots[:, :, 1] = np.where(starts_run, 58, chars[:, :, 0])
+    group_slots[:, :, 2:] = chars[:, :, 1:]
+    # Rows end with a new line, so deleting every 0 byte in one go (in C) still leaves them separate
+    slots[:, 40] = 10
+
+    rows = slots.tobytes().translate(None, b"\0").split(b"\n")[:count]
+    return np.array(rows, dtype=f"S{_MAX_STR_WIDTH}").astype(f"U{_MAX_STR_WIDTH}")
+
+
+def split_cidr(cidr_strs, errors: str = "raise"):
+    """
+    Splits IPv6 CIDR strings into (n, 2) uint64 addresses and uint8 subnet suffixes. The suffix has
+    to be 0 to 128 without leading zeros (like the IPv4 CIDRAddress pattern). With errors="mask" a
+    third value, the mask of valid rows, is returned instead of raising.
+    """
+    cidr_strs = list(cidr_strs)
+    ip_strs = []
+    suffixes = np.zeros(len(cidr_strs), dtype=np.uint8)
+    suffix_valid = np.ones(len(cidr_strs), dtype=bool)
+
+    for i, cidr_str in enumerate(cidr_strs):
+        ip_str, slash, suffix = str(cidr_str).partition("/")
+        ip_strs.append(ip_str)
+        if slash and suffix.isascii() and suffix.isdigit() and len(suffix) <= 3 and (suffix == "0" or suffix[0] != "0") and int(suffix) <= ADDRESS_BITS:
+            suffixes[i] = int(suffix)
+        else:
+            suffix_valid[i] = False
+
+    ip_uint, valid = convert_ip_str_to_ip_uint(ip_strs, errors="mask")
+    valid &= suffix_valid
+    ip_uint[~valid] = 0
+    suffixes[~valid] = 0
+
+    if errors == "mask":
+        return ip_uint, suffixes, valid
+
+    if not valid.all():
+        index = int(np.argmin(valid))
+        raise ValueError(f"Cannot validate argument on parameter 'CIDRAddress'. The argument \"{cidr_strs[index]}\" at index {index} is not a valid IPv6 CIDR address.")
+
+    return ip_uint, suffixes
+
+
+def get_host_mask_uint(subnet_suffix_num) -> np.ndarray:
+    """Host mask for each suffix, (n, 2) uint64 looked up from HOST_MASK_TABLE."""
+    return HOST_MASK_TABLE[_as_suffix_array(subnet_suffix_num)]
+
+
+def get_subnet_mask_uint(subnet_suffix_num) -> np.ndarray:
+    """Subnet mask for each suffix, (n, 2) uint64 looked up from SUBNET_MASK_TABLE."""
+    return SUBNET_MASK_TABLE[_as_suffix_array(subnet_suffix_num)]
+
+
+def get_total_count_of_ip_address(subnet_suffix_num) -> np.ndarray:
+    """2^(128 - suffix) as float64, exact since it's always a power of two."""
+    return TOTAL_COUNT_TABLE[_as_suffix_array(subnet_suffix_num, "subnetSuffixNum")]
+
+
+def get_network_and_broadcast(ip_prefix_uint, subnet_suffix_num) -> tuple[np.ndarray, np.ndarray]:
+    """Network and broadcast (last) address arrays, the ranges every comparison is based on."""
+    suffixes = _as_suffix_array(subnet_suffix_num).ravel()
+    network_ip_uint = _as_address_array(ip_prefix_uint) & SUBNET_MASK_TABLE[suffixes]
+    return network_ip_uint, network_ip_uint | HOST_MASK_TABLE[suffixes]
+
+
+def _less_equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a <= b for (n, 2) uint64 addresses (broadcast against each other)."""
+    return (a[:, 0] < b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] <= b[:, 1]))
+
+
+def _add(ip_uint: np.ndarray, value: int) -> np.ndarray:
+    """Adds 1 or -1 to (n, 2) uint64 addresses, carrying between the low and high column."""
+    low = ip_uint[:, 1] + np.uint64(1) if value > 0 else ip_uint[:, 1] - np.uint64(1)
+    carry = (low == 0) if value > 0 else (low == np.uint64(0xFFFFFFFFFFFFFFFF))
+    high = np.where(carry, ip_uint[:, 0] + np.uint64(1) if value > 0 else ip_uint[:, 0] - np.uint64(1), ip_uint[:, 0])
+    return np.stack([high, low], axis=1)
+
+
+def get_ipv6_cidr_translation(ip_prefix_uint, subnet_suffix_num) -> dict:
+    """
+    Same keys as Get-IPv4CIDRTranslation for IPv6, each one an (n, 2) uint64 array except for
+    TotalAddresses (float64) and HostBitsSet. First and last host are what IPv6Network.hosts()
+    gives: everything after the network address (the Subnet-Router anycast address), and every
+    address of a /127 or /128.
+    """
+    ip_prefix_uint = _as_address_array(ip_prefix_uint)
+    suffixes = _as_suffix_array(subnet_suffix_num).ravel()
+    host_mask_uint = HOST_MASK_TABLE[suffixes]
+    subnet_mask_uint = SUBNET_MASK_TABLE[suffixes]
+    network_ip_uint = ip_prefix_uint & subnet_mask_uint
+    broadcast_uint = network_ip_uint | host_mask_uint
+    small = (suffixes >= ADDRESS_BITS - 1)[:, None]
+
+    return {
+        "NetworkIP": network_ip_uint,
+        "BroadcastIP": broadcast_uint,
+        "SubnetMask": subnet_mask_uint,
+        "HostMask": host_mask_uint,
+        "FirstHost": np.where(small, network_ip_uint, _add(network_ip_uint, 1)),
+        "LastHost": broadcast_uint,
+        "TotalAddresses": TOTAL_COUNT_TABLE[suffixes],
+        "HostBitsSet": np.any((ip_prefix_uint & host_mask_uint) != 0, axis=1),
+    }
+
+
+def is_ip_in_subnet(ip_uint, ip_prefix_uint, subnet_suffix_num) -> np.ndarray:
+    """Test-IPInSubnet for IPv6, network <= IP <= broadcast, element wise (arrays are broadcast)."""
+    network_ip_uint, broadcast_ip_uint = get_network_and_broadcast(ip_prefix_uint, subnet_suffix_num)
+    ip_uint = _as_address_array(ip_uint)
+    return _less_equal(network_ip_uint, ip_uint) & _less_equal(ip_uint, broadcast_ip_uint)
+
+
+def compare_subnets(ip_prefix_uint_a, subnet_suffix_num_a, ip_prefix_uint_b, subnet_suffix_num_b) -> np.ndarray:
+    """Compare-Subnets for IPv6, Network A <= Broadcast B && Broadcast A >= Network B, element wise."""
+    network_ip_uint_a, broadcast_ip_uint_a = get_network_and_broadcast(ip_prefix_uint_a, subnet_suffix_num_a)
+    network_ip_uint_b, broadcast_ip_uint_b = get_network_and_broadcast(ip_prefix_uint_b, subnet_suffix_num_b)
+    return _less_equal(network_ip_uint_a, broadcast_ip_uint_b) & _less_equal(network_ip_uint_b, broadcast_ip_uint_a)
+
+
+class IPv6CIDRRecords:
+    """
+    Columnar records for lots of IPv6 CIDRs, like IPv4CIDRRecords. Only the network addresses and
+    subnet suffixes are stored (17 bytes per CIDR), the other columns come from the mask tables
+    when they're used and strings are only formatted for the column that's asked for.
+    """
+    __slots__ = ("NetworkIP", "SubnetSuffix")
+
+    def __init__(self, network_ip_uint, subnet_suffix_num):
+        self.SubnetSuffix = _as_suffix_array(subnet_suffix_num).ravel()
+        self.NetworkIP = _as_address_array(network_ip_uint) & SUBNET_MASK_TABLE[self.SubnetSuffix]
+
+    @classmethod
+    def from_cidrs(cls, cidr_strs) -> "IPv6CIDRRecords":
+        """Records for a list of IPv6 CIDR strings, host bits are zeroed like ConvertTo-IPv4CIDRRecord."""
+        return cls(*split_cidr(cidr_strs))
+
+    @property
+    def BroadcastIP(self) -> np.ndarray:
+        return self.NetworkIP | HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def SubnetMask(self) -> np.ndarray:
+        return SUBNET_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def HostMask(self) -> np.ndarray:
+        return HOST_MASK_TABLE[self.SubnetSuffix]
+
+    @property
+    def TotalAddresses(self) -> np.ndarray:
+        return TOTAL_COUNT_TABLE[self.SubnetSuffix]
+
+    def addresses(self, key: str) -> np.ndarray:
+        """Compressed address strings for one of the NetworkIP/BroadcastIP/... columns."""
+        return convert_ip_num_to_ip_str(getattr(self, key))
+
+    def contains(self, ip_uint) -> np.ndarray:
+        """(addresses, records) array of whether each address is in each CIDR."""
+        ip_uint = _as_address_array(ip_uint)
+        broadcast_ip_uint = self.BroadcastIP
+        high, low = ip_uint[:, None, 0], ip_uint[:, None, 1]
+        after_network = (self.NetworkIP[None, :, 0] < high) | ((self.NetworkIP[None, :, 0] == high) & (self.NetworkIP[None, :, 1] <= low))
+        before_broadcast = (high < broadcast_ip_uint[None, :, 0]) | ((high == broadcast_ip_uint[None, :, 0]) & (low <= broadcast_ip_uint[None, :, 1]))
+        return after_network & before_broadcast
+
+    def __len__(self) -> int:
+        return len(self.SubnetSuffix)
+
+    def __getitem__(self, position: int) -> IPv6Network:
+        """One row as an IPv6Network."""
+        high, low = self.NetworkIP[position].tolist()
+        return IPv6Network(((high << 64) | low, int(self.SubnetSuffix[position])))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored columns."""
+        return self.NetworkIP.nbytes + self.SubnetSuffix.nbytes
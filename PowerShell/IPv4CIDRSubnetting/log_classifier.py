@@ -0,0 +1,209 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tags the IPv4 addresses in big text/CSV access or flow logs with the subnet they are in, instead
+of looping Test-IPInSubnet per line. The file is read in chunks of about --chunk-size bytes that
+always end on a new line (plain reads or memory mapped with --mmap), so memory use depends on the
+chunk size and the number of chunks in flight, not the file size. Each chunk is classified with a
+SubnetIndex on a process pool (the index is built once per worker process) and the results are
+merged back in file order.
+
+    python log_classifier.py flow.log --cidrs plan.txt --output flow_enriched.log
+    python log_classifier.py flow.log --cidrs plan.txt --counts
+
+Where plan.txt has one CIDR per line. Enriched rows get an extra column with the subnet of every
+address in the row (separated by ;), or - when no subnet contains the address.
+"""
+
+import argparse
+import mmap
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Iterator
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+from subnet_index import NO_MATCH, SubnetIndex
+
+CHUNK_SIZE = 4 << 20
+NO_SUBNET = "-"
+# Anything that looks like a dotted quad, the octets are validated when the addresses are parsed
+IP_BYTES_PATTERN = re.compile(rb"(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?!\.?\d)")
+
+_index = None
+
+
+def _init_worker(cidrs: list[str]) -> None:
+    """Builds the SubnetIndex once per worker process."""
+    global _index
+    _index = SubnetIndex(cidrs)
+
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE, start: int = 0, use_mmap: bool = False) -> Iterator[bytes]:
+    """Chunks of about chunk_size bytes from start to the end of the file, each one ending on a new line."""
+    with open(path, "rb") as log_file:
+        if use_mmap:
+            if os.fstat(log_file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                while start < len(mapped):
+                    end = mapped.find(b"\n", min(start + chunk_size, len(mapped)) - 1)
+                    end = len(mapped) if end == -1 else end + 1
+                    yield mapped[start:end]
+                    start = end
+        else:
+            log_file.seek(start)
+            while chunk := log_file.read(chunk_size):
+                if not chunk.endswith(b"\n"):
+                    chunk += log_file.readline()
+                yield chunk
+
+
+def _lookup_addresses(addresses: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """Subnet of each address (position in the CIDR list, or NO_MATCH) and which ones are valid addresses."""
+    if not addresses:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    ip_prefix_uint, valid = cidr_np.convert_ip_str_to_ip_uint(np.array(addresses), errors="mask")
+    return _index.lookup(ip_prefix_uint), valid
+
+
+def count_chunk(data: bytes) -> np.ndarray:
+    """Number of addresses per subnet in the chunk, the last entry counts addresses without a subnet."""
+    subnets, valid = _lookup_addresses(IP_BYTES_PATTERN.findall(data))
+    subnets = subnets[valid]
+    return np.bincount(np.where(subnets == NO_MATCH, len(_index), subnets), minlength=len(_index) + 1)
+
+
+def enrich_chunk(data: bytes, delimiter: bytes = b",") -> bytes:
+    """The lines in the chunk with an extra column holding the subnet of every address in the line."""
+    lines = data.split(b"\n")
+    if data.endswith(b"\n"):
+        lines.pop()
+
+    matches = list(IP_BYTES_PATTERN.finditer(data))
+    subnets, valid = _lookup_addresses([match.group() for match in matches])
+    starts = np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches))
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+    line_numbers = np.searchsorted(newlines, starts[valid]).tolist()
+    columns = [[] for _ in lines]
+    for line_number, subnet in zip(line_numbers, subnets[valid].tolist()):
+        columns[line_number].append(_index.cidrs[subnet] if subnet != NO_MATCH else NO_SUBNET)
+
+    enriched = []
+    for line, column in zip(lines, columns):
+        carriage_return = line.endswith(b"\r")
+        enriched.append(line.rstrip(b"\r") + delimiter + ";".join(column).encode("ascii") + (b"\r\n" if carriage_return else b"\n"))
+    return b"".join(enriched)
+
+
+def map_chunks(path: str, cidrs: list[str], func: Callable, *args, chunk_size: int = CHUNK_SIZE, start: int = 0,
+               workers: int | None = None, use_mmap: bool = False) -> Iterator:
+    """
+    Runs func(chunk, *args) over the chunks of the file and yields the results in file order.
+    Only a couple of chunks per worker are in flight at once, so a slow consumer doesn't end up
+    with the whole file in memory. workers=0 runs everything in this process.
+    """
+    if workers == 0:
+        _init_worker(cidrs)
+        for chunk in iter_chunks(path, chunk_size, start, use_mmap):
+            yield func(chunk, *args)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cidrs,)) as executor:
+        max_in_flight = 2 * workers
+        in_flight = deque()
+        for chunk in iter_chunks(path, chunk_size, start, use_mmap):
+            in_flight.append(executor.submit(func, chunk, *args))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def count_subnets(path: str, cidrs: list[str], **options) -> dict[str, int]:
+    """Number of addresses in the log per subnet, None counts the addresses that are not in any subnet."""
+    totals = np.zeros(len(cidrs) + 1, dtype=np.int64)
+    for counts in map_chunks(path, cidrs, count_chunk, **options):
+        totals += counts
+
+    labels = list(cidrs) + [None]
+    return {labels[i]: int(totals[i]) for i in np.flatnonzero(totals)}
+
+
+def enrich_file(path: str, cidrs: list[str], output: BinaryIO, delimiter: str = ",", header: bool = False, **options) -> int:
+    """Writes the lines of the log to output with the subnet column added, returns the number of bytes read."""
+    delimiter = delimiter.encode("ascii")
+    start = 0
+    if header:
+        with open(path, "rb") as log_file:
+            first_line = log_file.readline()
+        start = len(first_line)
+        output.write(first_line.rstrip(b"\r\n") + delimiter + b"subnet" + first_line[len(first_line.rstrip(b"\r\n")):])
+
+    for enriched in map_chunks(path, cidrs, enrich_chunk, delimiter, start=start, **options):
+        output.write(enriched)
+    return os.path.getsize(path)
+
+
+def read_cidrs(path: str) -> list[str]:
+    """CIDRs from a plan file, one per line, blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as plan_file:
+        return [line.split("#")[0].strip() for line in plan_file if line.split("#")[0].strip()]
+
+
+def main() -> None:
+    """Classifies the log and writes the enriched rows or the per subnet counts."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="Text or CSV log file")
+    parser.add_argument("--cidrs", required=True, help="File with one CIDR per line")
+    parser.add_argument("--output", help="Enriched log file (defaults to stdout)")
+    parser.add_argument("--counts", action="store_true", help="Print the number of addresses per subnet instead")
+    parser.add_argument("--delimiter", default=",", help="Delimiter for the subnet column")
+    parser.add_argument("--header", action="store_true", help="First line is a CSV header")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Bytes per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 runs in this process)")
+    parser.add_argument("--mmap", action="store_true", help="Memory map the log instead of reading it")
+    args = parser.parse_args()
+
+    cidrs = read_cidrs(args.cidrs)
+    options = {"chunk_size": args.chunk_size, "workers": args.workers, "use_mmap": args.mmap}
+
+    if args.counts:
+        counts = count_subnets(args.log, cidrs, **options)
+        for subnet, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"{subnet or NO_SUBNET},{count}")
+    elif args.output:
+        with open(args.output, "wb") as output:
+            enrich_file(args.log, cidrs, output, args.delimiter, args.header, **options)
+    else:
+        enrich_file(args.log, cidrs, sys.stdout.buffer, args.delimiter, args.header, **options)
+
+
+if __name__ == '__main__':
+    main()
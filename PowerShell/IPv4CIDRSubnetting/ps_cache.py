@@ -0,0 +1,333 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+On disk cache for cmdlet results, so reruns of the unit tests only go to PowerShell for the
+cmdlets whose inputs or implementation changed. Results are stored in SQLite, keyed on the
+SHA-256 of the implementation hash, the backend mode and the cmdlet string:
+
+    pwsh & process - IPv4CIDRSubnetting.ps1 (and IPv4CIDRSubnettingWorker.ps1 for pwsh)
+    fake           - ip_v4_cidr_subnetting.py and ps_worker.py
+
+Editing any of those files changes the key, so old results are never used again, and the rows
+for the old implementation are deleted the next time the cache is opened. The cache is capped
+at PSCOMMAND_CACHE_MAX_BYTES of stored results (64 MB by default), the least recently used rows
+are evicted first.
+
+The PSCOMMAND_CACHE environment variable switches it:
+    on      - use the cache (default)
+    refresh - always run the cmdlets live, but store the results for next time
+    off     - don't use the cache at all
+
+The cache file is PSCOMMAND_CACHE_PATH, or IPv4CIDRSubnetting/ps_cache.sqlite in the user's cache
+directory (XDG_CACHE_HOME or ~/.cache), which is the directory to keep between CI runs.
+
+python ps_cache.py --stats prints what's in the cache and python ps_cache.py --clear empties it.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+import ps_worker
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPLEMENTATION_FILES = {
+    "pwsh": ("IPv4CIDRSubnetting.ps1", "IPv4CIDRSubnettingWorker.ps1"),
+    "process": ("IPv4CIDRSubnetting.ps1",),
+    "fake": ("ip_v4_cidr_subnetting.py", "ps_worker.py"),
+}
+CACHE_MODES = ("on", "refresh", "off")
+DEFAULT_MAX_BYTES = 64 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    implementation TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def default_cache_path() -> str:
+    """PSCOMMAND_CACHE_PATH, or ps_cache.sqlite in the user's cache directory."""
+    if os.environ.get("PSCOMMAND_CACHE_PATH"):
+        return os.environ["PSCOMMAND_CACHE_PATH"]
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "IPv4CIDRSubnetting", "ps_cache.sqlite")
+
+
+def resolve_cache_mode(cache_mode: str = None) -> str:
+    """Resolves the cache mode from the argument or the PSCOMMAND_CACHE environment variable."""
+    cache_mode = (cache_mode or os.environ.get("PSCOMMAND_CACHE") or "on").lower()
+
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"Unknown PSCommand cache mode '{cache_mode}', expected one of {', '.join(CACHE_MODES)}")
+
+    return cache_mode
+
+
+def implementation_hash(mode: str) -> str:
+    """SHA-256 of the files that implement the cmdlets for the backend mode."""
+    digest = hashlib.sha256()
+
+    for file_name in IMPLEMENTATION_FILES[mode]:
+        digest.update(file_name.encode())
+        with open(os.path.join(SCRIPT_DIR, file_name), "rb") as implementation_file:
+            digest.update(hashlib.sha256(implementation_file.read()).digest())
+
+    return digest.hexdigest()
+
+
+class PSResultCache:
+    """
+    SQLite cache of cmdlet results. There are two kinds of result for the same cmdlet string,
+    the text reply from PSCommand.run_ps_command and the JSON typed CmdletResult from a batch,
+    so the kind is part of the key too.
+    """
+    def __init__(self, path: str = None, max_bytes: int = None, cache_mode: str = None):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.environ.get("PSCOMMAND_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.cache_mode = resolve_cache_mode(cache_mode)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__implementations = {}
+        self.__lock = threading.Lock()
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.__connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        # A cache can lose the last few writes on a power cut, it's not worth an fsync per cmdlet
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+        self.__stored_bytes = self.__sum_sizes()
+
+    def implementation(self, mode: str) -> str:
+        """
+        Implementation hash for the mode, worked out once per cache. The rows for any other
+        implementation of the mode are stale, so they are deleted.
+        """
+        with self.__lock:
+            if mode not in self.__implementations:
+                self.__implementations[mode] = implementation_hash(mode)
+                with self.__connection:
+                    self.__connection.execute("DELETE FROM results WHERE mode = ? AND implementation != ?",
+                                              (mode, self.__implementations[mode]))
+            return self.__implementations[mode]
+
+    def key(self, mode: str, kind: str, command: str) -> str:
+        """Cache key of a cmdlet string for the backend mode and kind of result."""
+        return hashlib.sha256("\0".join((self.implementation(mode), mode, kind, command)).encode()).hexdigest()
+
+    def get_many(self, mode: str, kind: str, commands: list[str]) -> dict[str, object]:
+        """Cached results for the commands that are in the cache, and marks them as just used."""
+        if self.cache_mode != "on" or not commands:
+            return {}
+
+        keys = {self.key(mode, kind, command): command for command in commands}
+        key_list = list(keys)
+        rows = []
+        with self.__lock:
+            # SQLite only takes so many parameters in one statement
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                rows += self.__connection.execute(
+                    f"SELECT key, result FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+
+            with self.__connection:
+                now = time.time()
+                self.__connection.executemany("UPDATE results SET last_used = ? WHERE key = ?", [(now, key) for key, _ in rows])
+
+        return {keys[key]: json.loads(result) for key, result in rows}
+
+    def put_many(self, mode: str, kind: str, results: dict[str, object]) -> None:
+        """Stores results for cmdlet strings and evicts the least recently used rows when it's over max_bytes."""
+        if self.cache_mode == "off" or not results:
+            return
+
+        implementation = self.implementation(mode)
+        now = time.time()
+        rows = []
+        for command, result in results.items():
+            result_json = json.dumps(result)
+            rows.append((self.key(mode, kind, command), mode, implementation, result_json, len(result_json) + len(command), now))
+
+        with self.__lock, self.__connection:
+            self.__connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.__stored_bytes += sum(row[4] for row in rows)
+            if self.__stored_bytes > self.max_bytes:
+                self.__evict()
+
+    def __sum_sizes(self) -> int:
+        return self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def __evict(self) -> None:
+        """
+        Deletes the least recently used rows until the stored results fit in max_bytes. The running
+        total only goes up (replaced rows and other processes aren't taken into account), so the
+        real total is summed up before evicting anything.
+        """
+        total_bytes = self.__stored_bytes = self.__sum_sizes()
+        if total_bytes <= self.max_bytes:
+            return
+
+        # Evicting down to 90% so it doesn't have to evict again on the next insert
+        excess = total_bytes - self.max_bytes * 0.9
+        evicted = []
+        for key, size in self.__connection.execute("SELECT key, size FROM results ORDER BY last_used, key"):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+
+        self.__connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+        self.__stored_bytes = self.__sum_sizes()
+
+    def run(self, mode: str, command: str, run_live: Callable[[], dict]) -> dict:
+        """Reply to one cmdlet from the cache, or from run_live() when it isn't cached."""
+        found = self.get_many(mode, "command", [command])
+        if command in found:
+            self.hits += 1
+            return found[command]
+
+        self.misses += 1
+        reply = run_live()
+        self.put_many(mode, "command", {command: reply})
+        return reply
+
+    def run_batch(self, mode: str, commands: list[str],
+                  run_live: Callable[[list[str]], list[ps_worker.CmdletResult]]) -> list[ps_worker.CmdletResult]:
+        """Results for a batch of cmdlets, only the cmdlets that aren't cached go to run_live() (as one batch)."""
+        commands = list(commands)
+        found = self.get_many(mode, "batch", commands)
+        missing_count = sum(command not in found for command in commands)
+        missing = list(dict.fromkeys(command for command in commands if command not in found))
+        self.hits += len(commands) - missing_count
+        self.misses += missing_count
+
+        if missing:
+            live_results = {result.command: [result.value, result.warnings, result.error] for result in run_live(missing)}
+            self.put_many(mode, "batch", live_results)
+            found.update(live_results)
+
+        return [ps_worker.CmdletResult(command, *found[command]) for command in commands]
+
+    def stats(self) -> dict:
+        """Hits and misses for this run, and what's stored in the cache file."""
+        with self.__lock:
+            entries, stored_bytes = self.__connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            by_mode = dict(self.__connection.execute("SELECT mode, COUNT(*) FROM results GROUP BY mode").fetchall())
+
+        lookups = self.hits + self.misses
+        return {
+            "Path": self.path,
+            "CacheMode": self.cache_mode,
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "HitRate": self.hits / lookups if lookups else 0.0,
+            "Evictions": self.evictions,
+            "Entries": entries,
+            "EntriesByMode": by_mode,
+            "StoredBytes": stored_bytes,
+            "MaxBytes": self.max_bytes,
+        }
+
+    def summary(self) -> str:
+        """One line with the hits and misses, for the end of a test run."""
+        stats = self.stats()
+        return (f"PSCommand cache ({stats['CacheMode']}): {stats['Hits']} hits, {stats['Misses']} misses, "
+                f"{stats['Evictions']} evicted, {stats['Entries']} entries ({stats['StoredBytes'] / 1e6:.1f} MB) in {stats['Path']}")
+
+    def clear(self) -> None:
+        """Deletes every result in the cache."""
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM results")
+            self.__stored_bytes = 0
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        with self.__lock:
+            self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> PSResultCache | None:
+    """Cache shared by all the tests in a run, None when PSCOMMAND_CACHE is off."""
+    global _shared_cache  # pylint: disable=global-statement
+
+    if resolve_cache_mode() == "off":
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PSResultCache()
+        return _shared_cache
+
+
+def close_shared_cache() -> None:
+    """Closes the shared cache, a new one is opened if it is used again."""
+    global _shared_cache  # pylint: disable=global-statement
+
+    with _shared_cache_lock:
+        if _shared_cache is not None:
+            _shared_cache.close()
+            _shared_cache = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shows or clears the on disk cache of cmdlet results.")
+    parser.add_argument("--path", default=None, help="Cache file (defaults to PSCOMMAND_CACHE_PATH or the user's cache directory)")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached result")
+    parser.add_argument("--stats", action="store_true", help="Print what's in the cache as JSON")
+    args = parser.parse_args()
+
+    with PSResultCache(args.path) as cache:
+        if args.clear:
+            cache.clear()
+        if args.stats or not args.clear:
+            print(json.dumps(cache.stats(), indent=4))
+
+
+if __name__ == "__main__":
+    main()
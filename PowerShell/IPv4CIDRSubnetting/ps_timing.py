@@ -0,0 +1,318 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Timings for every cmdlet invocation PSCommand makes, to see where the wall time of the unit
+tests goes. Each invocation is recorded as a CallTiming with the time spent in each phase:
+
+    spawn      - starting pwsh (or the fake worker) until it was ready, minus dot-sourcing
+    dot_source - dot-sourcing IPv4CIDRSubnetting.ps1, as timed inside the worker
+    execute    - running the cmdlet(s) inside the worker
+    ipc        - the rest of the round trip, writing the request and reading the reply JSON
+    cache      - answered from the result cache (ps_cache.py)
+    process    - the whole pwsh process in PSCOMMAND_MODE=process, which can't be split up
+    harness    - everything else in PSCommand, e.g. the cache lookup and picking a worker
+
+spawn and dot_source are only on the invocation that had to start a worker. The time a test
+spends outside of PSCommand (the Python side comparisons) is its wall time minus its calls.
+
+Anything can subscribe to the timings with add_hook(hook), the hook is called with every
+CallTiming. Setting PSCOMMAND_TIMING to a path prefix (e.g. PSCOMMAND_TIMING=ps_timing) adds a
+TimingRecorder that writes ps_timing.json and ps_timing.txt at the end of the test run with the
+slowest calls, latency percentiles per cmdlet and totals per test class.
+
+With PSCOMMAND_TIMING_TRACE=1 as well, the pwsh worker also turns on the debug stream for single
+cmdlets and times each Write-Debug message in the script, the gaps between the messages are
+reported as the script's hot spots. Tracing slows the cmdlets down, and cached cmdlets aren't
+traced, so it's best run with PSCOMMAND_CACHE=refresh.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from typing import Callable, NamedTuple
+
+PHASES = ("spawn", "dot_source", "execute", "ipc", "cache", "process", "harness")
+SLOWEST_CALLS = 20
+
+
+class CallTiming(NamedTuple):
+    """
+    Timing of one PSCommand invocation, a single cmdlet or a batch. For a batch the cmdlet is
+    "batch", count is the number of cmdlets and return_code is the number that failed.
+    """
+    test: str | None
+    cmdlet: str
+    arguments: str
+    mode: str
+    count: int
+    cached: int
+    return_code: int
+    total_ms: float
+    phases: dict[str, float]
+    trace: tuple[dict, ...] = ()
+
+
+_hooks = []
+_recorder = None
+_current_test = None
+_test_started = 0.0
+test_durations = {}
+
+
+def add_hook(hook: Callable[[CallTiming], None]) -> None:
+    """Calls hook with the CallTiming of every invocation from now on."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[CallTiming], None]) -> None:
+    """Stops calling hook."""
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    """True when anything is listening, PSCommand doesn't time anything otherwise."""
+    return bool(_hooks) or get_recorder() is not None
+
+
+def trace_enabled() -> bool:
+    """True when the Write-Debug messages in the script should be timed too."""
+    return os.environ.get("PSCOMMAND_TIMING_TRACE", "").lower() in ("1", "true", "yes") and enabled()
+
+
+def record(timing: CallTiming) -> None:
+    """Hands a timing to every hook."""
+    for hook in list(_hooks):
+        hook(timing)
+
+
+def start_test(test_id: str) -> None:
+    """Marks the start of a test, the timings recorded until stop_test are for this test."""
+    global _current_test, _test_started  # pylint: disable=global-statement
+    _current_test = test_id
+    _test_started = time.perf_counter()
+
+
+def stop_test() -> None:
+    """Marks the end of the current test and keeps its wall time."""
+    global _current_test  # pylint: disable=global-statement
+    if _current_test is not None:
+        test_durations[_current_test] = (time.perf_counter() - _test_started) * 1000
+    _current_test = None
+
+
+def current_test() -> str | None:
+    """Id of the test that is running, if a test called start_test."""
+    return _current_test
+
+
+def split_command(command: str) -> tuple[str, str]:
+    """Cmdlet name and the argument string of a cmdlet string."""
+    name, _, arguments = command.strip().partition(" ")
+    return name, arguments.strip()
+
+
+def worker_phases(timings: list[dict]) -> dict[str, float]:
+    """
+    Adds up the phases from the timing of each worker reply (see PSWorker.request), which has
+    round_trip_ms and execute_ms, plus spawn_ms and dot_source_ms when the worker was started.
+    """
+    phases = {"spawn": 0.0, "dot_source": 0.0, "execute": 0.0, "ipc": 0.0}
+    for timing in timings:
+        phases["spawn"] += timing.get("spawn_ms", 0.0)
+        phases["dot_source"] += timing.get("dot_source_ms", 0.0)
+        phases["execute"] += timing.get("execute_ms", 0.0)
+        phases["ipc"] += max(timing.get("round_trip_ms", 0.0) - timing.get("execute_ms", 0.0), 0.0)
+    return phases
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest rank percentile of values that are already sorted."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _debug_template(message: str) -> str:
+    """Write-Debug message with the values taken out, so the same line in the script adds up."""
+    return re.sub(r"\d+", "#", message)
+
+
+class TimingRecorder:
+    """Hook that keeps every CallTiming and builds the report at the end of the run."""
+    def __init__(self):
+        self.calls = []
+        self.started = time.perf_counter()
+
+    def __call__(self, timing: CallTiming) -> None:
+        self.calls.append(timing)
+
+    def report(self) -> dict:
+        """Slowest calls, per cmdlet percentiles, totals per phase and per test class, and the script hot spots."""
+        phase_totals = {phase: 0.0 for phase in PHASES}
+        by_cmdlet = {}
+        by_class = {}
+        hot_spots = {}
+
+        for call in self.calls:
+            for phase, milliseconds in call.phases.items():
+                phase_totals[phase] = phase_totals.get(phase, 0.0) + milliseconds
+            by_cmdlet.setdefault(call.cmdlet, []).append(call.total_ms)
+
+            test_class = call.test.rsplit(".", 1)[0] if call.test else "(no test)"
+            class_totals = by_class.setdefault(test_class, {"calls": 0, "cmdlets": 0, "ps_ms": 0.0})
+            class_totals["calls"] += 1
+            class_totals["cmdlets"] += call.count
+            class_totals["ps_ms"] += call.total_ms
+
+            previous_ms = 0.0
+            previous_message = "Start"
+            for entry in call.trace:
+                label = f"{_debug_template(previous_message)} -> {_debug_template(entry['message'])}"
+                spot = hot_spots.setdefault(label, {"count": 0, "total_ms": 0.0})
+                spot["count"] += 1
+                spot["total_ms"] += entry["ms"] - previous_ms
+                previous_ms, previous_message = entry["ms"], entry["message"]
+
+        for test_id, wall_ms in test_durations.items():
+            class_totals = by_class.setdefault(test_id.rsplit(".", 1)[0], {"calls": 0, "cmdlets": 0, "ps_ms": 0.0})
+            class_totals["tests"] = class_totals.get("tests", 0) + 1
+            class_totals["wall_ms"] = class_totals.get("wall_ms", 0.0) + wall_ms
+
+        for class_totals in by_class.values():
+            class_totals.setdefault("tests", 0)
+            if "wall_ms" in class_totals:
+                class_totals["python_ms"] = max(class_totals["wall_ms"] - class_totals["ps_ms"], 0.0)
+
+        cmdlets = {}
+        for cmdlet, durations in by_cmdlet.items():
+            durations.sort()
+            cmdlets[cmdlet] = {
+                "calls": len(durations),
+                "total_ms": sum(durations),
+                "p50_ms": percentile(durations, 50),
+                "p90_ms": percentile(durations, 90),
+                "p99_ms": percentile(durations, 99),
+                "max_ms": durations[-1],
+            }
+
+        slowest = sorted(self.calls, key=lambda call: call.total_ms, reverse=True)[:SLOWEST_CALLS]
+        return {
+            "mode": self.calls[0].mode if self.calls else None,
+            "wall_ms": (time.perf_counter() - self.started) * 1000,
+            "calls": len(self.calls),
+            "cmdlets": sum(call.count for call in self.calls),
+            "phases_ms": {phase: total for phase, total in phase_totals.items() if total},
+            "slowest_calls": [{key: value for key, value in call._asdict().items() if key != "trace"} for call in slowest],
+            "cmdlet_latency": dict(sorted(cmdlets.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+            "test_classes": by_class,
+            "script_hot_spots": dict(sorted(hot_spots.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:SLOWEST_CALLS]),
+        }
+
+    @staticmethod
+    def text_report(report: dict) -> str:
+        """The report as plain text tables."""
+        lines = [f"{report['calls']} PSCommand calls ({report['cmdlets']} cmdlets) in {report['wall_ms'] / 1000:.2f} s, mode {report['mode']}", ""]
+
+        lines.append(f"{'Phase':<12}{'Total ms':>12}")
+        lines += [f"{phase:<12}{total:>12.1f}" for phase, total in report["phases_ms"].items()]
+
+        width = max([len(test_class) for test_class in report["test_classes"]] + [10]) + 2
+        lines += ["", f"{'Test class':<{width}}{'Tests':>6}{'Calls':>7}{'Wall ms':>11}{'PS ms':>11}{'Python ms':>11}"]
+        for test_class, totals in report["test_classes"].items():
+            lines.append(f"{test_class:<{width}}{totals['tests']:>6}{totals['calls']:>7}{totals.get('wall_ms', 0.0):>11.1f}"
+                         f"{totals['ps_ms']:>11.1f}{totals.get('python_ms', 0.0):>11.1f}")
+
+        lines += ["", f"{'Cmdlet':<32}{'Calls':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'Max ms':>9}"]
+        for cmdlet, stats in report["cmdlet_latency"].items():
+            lines.append(f"{cmdlet:<32}{stats['calls']:>7}{stats['p50_ms']:>9.2f}{stats['p90_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}")
+
+        lines += ["", f"{'Slowest calls':<80}{'Total ms':>10}"]
+        for call in report["slowest_calls"]:
+            command = f"{call['cmdlet']} {call['arguments']}"
+            command = command if len(command) <= 78 else command[:75] + "..."
+            lines.append(f"{command:<80}{call['total_ms']:>10.2f}")
+
+        if report["script_hot_spots"]:
+            lines += ["", f"{'Script hot spots (between Write-Debug messages)':<100}{'Count':>7}{'Total ms':>10}"]
+            for label, spot in report["script_hot_spots"].items():
+                label = label if len(label) <= 98 else label[:95] + "..."
+                lines.append(f"{label:<100}{spot['count']:>7}{spot['total_ms']:>10.2f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path_prefix: str) -> tuple[str, str]:
+        """Writes the report to path_prefix.json and path_prefix.txt, returns both paths."""
+        report = self.report()
+        json_path, text_path = f"{path_prefix}.json", f"{path_prefix}.txt"
+
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, indent=4)
+        with open(text_path, "w", encoding="utf-8") as text_file:
+            text_file.write(self.text_report(report))
+
+        return json_path, text_path
+
+
+def get_recorder() -> TimingRecorder | None:
+    """Recorder for the run when PSCOMMAND_TIMING is set, it is added as a hook the first time."""
+    global _recorder  # pylint: disable=global-statement
+
+    if _recorder is None and os.environ.get("PSCOMMAND_TIMING"):
+        _recorder = TimingRecorder()
+        add_hook(_recorder)
+    return _recorder
+
+
+def write_report() -> tuple[str, str] | None:
+    """Writes the recorder's report to the PSCOMMAND_TIMING prefix, None when timing isn't on."""
+    recorder = get_recorder()
+    if recorder is None:
+        return None
+    return recorder.write(os.environ["PSCOMMAND_TIMING"])
+
+
+def call_timing(commands: list[str], mode: str, started: float, batch: bool = False, cached: int = 0, return_code: int = 0,
+                live_timings: list[dict] = (), process_ms: float = 0.0, trace: list[dict] = ()) -> CallTiming:
+    """
+    CallTiming for an invocation that started at started (time.perf_counter()). live_timings are
+    the timings of the worker replies, whatever isn't in a phase is harness time.
+    """
+    total_ms = (time.perf_counter() - started) * 1000
+
+    if batch:
+        cmdlet, arguments = "batch", ", ".join(dict.fromkeys(split_command(command)[0] for command in commands))
+    else:
+        cmdlet, arguments = split_command(commands[0])
+
+    if commands and cached == len(commands):
+        phases = {"cache": total_ms}
+    else:
+        phases = worker_phases(live_timings)
+        if process_ms:
+            phases["process"] = process_ms
+    phases["harness"] = max(total_ms - sum(phases.values()), 0.0)
+
+    return CallTiming(current_test(), cmdlet, arguments, mode, len(commands), cached, return_code, total_ms, phases, tuple(trace))
@@ -0,0 +1,551 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Long running PowerShell workers for the unit tests. Instead of starting pwsh and dot-sourcing
+IPv4CIDRSubnetting.ps1 for every assertion, IPv4CIDRSubnettingWorker.ps1 is started once and
+cmdlets are sent to it over stdin, one JSON request per line, and the replies come back on
+stdout as framed JSON lines. A request can also carry a whole batch of cmdlets, the reply
+then has one typed JSON value (plus warnings and error) per cmdlet.
+
+When pwsh is not installed, this file can also be started as the worker itself
+(python ps_worker.py --fake). It speaks the same line protocol, but the cmdlets are run
+with the Python twin in ip_v4_cidr_subnetting.py.
+
+The PSCOMMAND_MODE environment variable picks the backend:
+    auto    - pwsh worker if pwsh is on the PATH, otherwise the fake worker (default)
+    pwsh    - pwsh worker
+    fake    - Python fake worker
+    process - one pwsh process per cmdlet (how the tests used to run, see PSCommand)
+"""
+
+import atexit
+import collections
+import concurrent.futures
+import io
+import json
+import os
+import queue
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, NamedTuple
+
+import ip_v4_cidr_subnetting as cidr
+
+FRAME_PREFIX = "@@PSWORKER@@"
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "IPv4CIDRSubnettingWorker.ps1")
+MODES = ("auto", "pwsh", "fake", "process")
+# The process mode starts pwsh per cmdlet, PSWorkerPool only runs the other ones
+POOL_MODES = ("auto", "pwsh", "fake")
+BATCH_CHUNK_SIZE = 1000
+
+
+class PSWorkerError(Exception):
+    """Base exception for anything that goes wrong talking to a worker."""
+
+
+class PSWorkerCrashed(PSWorkerError):
+    """The worker process exited or closed its pipes."""
+
+
+class PSWorkerTimeout(PSWorkerError):
+    """The worker did not reply in time, it gets killed when this is raised."""
+
+
+class CmdletResult(NamedTuple):
+    """
+    Result of one cmdlet in a batch. The value keeps its JSON type, so uint values are int,
+    True/False are bool and the Get-IPv4CIDRTranslation hashtable is a dict.
+    """
+    command: str
+    value: Any
+    warnings: list[str]
+    error: str | None
+
+    @property
+    def ok(self) -> bool:
+        """True when the cmdlet did not throw."""
+        return self.error is None
+
+
+def resolve_mode(mode: str = None) -> str:
+    """Resolves the backend mode from the argument or the PSCOMMAND_MODE environment variable."""
+    mode = (mode or os.environ.get("PSCOMMAND_MODE") or "auto").lower()
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown PSCommand mode '{mode}', expected one of {', '.join(MODES)}")
+
+    if mode == "auto":
+        mode = "pwsh" if shutil.which("pwsh") is not None else "fake"
+
+    return mode
+
+
+def worker_argv(mode: str) -> list[str]:
+    """Command line that starts a worker for the mode."""
+    if mode == "pwsh":
+        return ["pwsh", "-NoLogo", "-NoProfile", "-NonInteractive", "-File", WORKER_SCRIPT]
+    if mode == "fake":
+        return [sys.executable, os.path.abspath(__file__), "--fake"]
+    raise ValueError(f"There is no worker for mode '{mode}'")
+
+
+class PSWorker:
+    """
+    One worker process. The stdout and stderr pipes are drained by background threads so a
+    chatty worker can never block on a full pipe, replies are handed over with a queue so
+    request can time out.
+    """
+    def __init__(self, argv: list[str], timeout: float = 30.0):
+        self.argv = argv
+        self.timeout = timeout
+        self.process = None
+        self.ready_frame = None
+        self.spawn_ms = 0.0
+        self.__startup_timing = None
+        self.__replies = queue.Queue()
+        self.__stderr_tail = collections.deque(maxlen=20)
+        self.__next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        """True while the worker process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """Starts the worker process and waits for the ready frame."""
+        started = time.perf_counter()
+        self.__replies = queue.Queue()
+        self.process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        threading.Thread(target=self.__read_stdout, args=(self.process.stdout, self.__replies), daemon=True).start()
+        threading.Thread(target=self.__read_stderr, args=(self.process.stderr,), daemon=True).start()
+
+        self.ready_frame = self.__wait_for_frame(self.timeout)
+        if not self.ready_frame.get("ready"):
+            self.kill()
+            raise PSWorkerCrashed(f"Expected a ready frame from {self.argv[0]}, got {self.ready_frame}")
+
+        # Reported with the first reply, the worker reports how much of the startup was dot-sourcing the script
+        self.spawn_ms = (time.perf_counter() - started) * 1000
+        dot_source_ms = self.ready_frame.get("dot_source_ms") or 0.0
+        self.__startup_timing = {"spawn_ms": self.spawn_ms - dot_source_ms, "dot_source_ms": dot_source_ms}
+
+    def request(self, payload: dict, timeout: float = None) -> dict:
+        """
+        Sends one request and waits for the reply with the matching id. The reply gets a timing
+        key with the round trip in milliseconds, and the first reply of a worker also has the
+        time it took to start and dot-source the script.
+        """
+        if not self.alive:
+            raise PSWorkerCrashed(f"Worker is not running. {self.stderr_tail}")
+
+        self.__next_id += 1
+        request_id = self.__next_id
+        started = time.perf_counter()
+
+        try:
+            self.process.stdin.write(json.dumps({**payload, "id": request_id}) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as error:
+            raise PSWorkerCrashed(f"Could not write to worker: {error}. {self.stderr_tail}") from error
+
+        frame = self.__wait_for_frame(timeout or self.timeout)
+        # A worker that times out is killed, so there is only ever one request in flight
+        if frame.get("id") != request_id:
+            self.kill()
+            raise PSWorkerCrashed(f"Expected the reply to request {request_id}, got one for {frame.get('id')}. {self.stderr_tail}")
+
+        frame["timing"] = {"round_trip_ms": (time.perf_counter() - started) * 1000, **(self.__startup_timing or {})}
+        self.__startup_timing = None
+        return frame
+
+    def close(self) -> None:
+        """Closes stdin so the worker exits by itself, kills it if it does not."""
+        if self.process is None:
+            return
+
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        """Kills the worker process."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    @property
+    def stderr_tail(self) -> str:
+        """Last few lines the worker wrote to stderr, handy for crash messages."""
+        return "".join(self.__stderr_tail).strip()
+
+    def __wait_for_frame(self, timeout: float) -> dict:
+        try:
+            frame = self.__replies.get(timeout=timeout)
+        except queue.Empty as error:
+            self.kill()
+            raise PSWorkerTimeout(f"Worker did not reply within {timeout} seconds") from error
+
+        if frame is None:
+            self.kill()
+            raise PSWorkerCrashed(f"Worker exited with return code {self.process.returncode}. {self.stderr_tail}")
+
+        return frame
+
+    @staticmethod
+    def __read_stdout(stdout: io.TextIOBase, replies: queue.Queue) -> None:
+        for line in stdout:
+            if line.startswith(FRAME_PREFIX):
+                replies.put(json.loads(line[len(FRAME_PREFIX):]))
+        replies.put(None)
+
+    def __read_stderr(self, stderr: io.TextIOBase) -> None:
+        for line in stderr:
+            self.__stderr_tail.append(line)
+
+
+class PSWorkerPool:
+    """
+    Small pool of workers. Workers are started when they are first needed and a worker that
+    crashed (or timed out) is replaced with a new one and the request is sent again once.
+    """
+    def __init__(self, size: int = 1, mode: str = None, timeout: float = 30.0):
+        self.mode = resolve_mode(mode)
+        if self.mode == "process":
+            raise ValueError("The process mode does not use workers, it starts pwsh for every cmdlet")
+
+        self.size = size
+        self.timeout = timeout
+        self.respawn_count = 0
+        self.__argv = worker_argv(self.mode)
+        self.__idle = queue.LifoQueue()
+        self.__workers = []
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+        for _ in range(size):
+            self.__idle.put(None)
+
+    @property
+    def workers(self) -> list[PSWorker]:
+        """Workers that have been started so far."""
+        with self.__lock:
+            return list(self.__workers)
+
+    def request(self, payload: dict, timeout: float = None) -> dict:
+        """Sends a request to an idle worker, waits for one if they are all busy."""
+        worker = self.__acquire()
+
+        try:
+            try:
+                return worker.request(payload, timeout)
+            except PSWorkerError:
+                worker = self.__respawn(worker)
+                return worker.request(payload, timeout)
+        finally:
+            self.__idle.put(worker)
+
+    def run(self, command: str) -> dict:
+        """Runs one cmdlet string, returns the reply with output, warnings and error."""
+        return self.request({"command": command})
+
+    def run_batch(self, commands: list[str], chunk_size: int = BATCH_CHUNK_SIZE, timings: list[dict] = None) -> list[CmdletResult]:
+        """
+        Runs a batch of cmdlet strings. The batch is sent in chunks of chunk_size cmdlets per
+        request, the chunks are spread over the workers in the pool and the results come back
+        in the same order as the commands. When a timings list is passed in, the timing of each
+        chunk's reply (see PSWorker.request) is appended to it.
+        """
+        commands = list(commands)
+        chunks = [commands[i:i + chunk_size] for i in range(0, len(commands), chunk_size)]
+
+        def run_chunk(chunk: list[str]) -> list[CmdletResult]:
+            # Roughly a millisecond per cmdlet in pwsh, so the timeout grows with the chunk
+            reply = self.request({"batch": chunk}, timeout=self.timeout + len(chunk) / 100)
+            if timings is not None:
+                timings.append({**reply["timing"], "execute_ms": reply.get("execute_ms") or 0.0})
+            return [CmdletResult(command, result.get("value"), result.get("warnings") or [], result.get("error"))
+                    for command, result in zip(chunk, reply["results"])]
+
+        if len(chunks) <= 1 or self.size == 1:
+            return [result for chunk in chunks for result in run_chunk(chunk)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.size) as executor:
+            return [result for chunk_results in executor.map(run_chunk, chunks) for result in chunk_results]
+
+    def close(self) -> None:
+        """Stops every worker in the pool."""
+        with self.__lock:
+            self.__closed = True
+            workers, self.__workers = self.__workers, []
+
+        for worker in workers:
+            worker.close()
+
+    def __acquire(self) -> PSWorker:
+        if self.__closed:
+            raise PSWorkerError("Pool is closed")
+
+        worker = self.__idle.get()
+        if worker is None or not worker.alive:
+            try:
+                worker = self.__spawn(worker) if worker is None else self.__respawn(worker)
+            except Exception:
+                self.__idle.put(None)
+                raise
+        return worker
+
+    def __spawn(self, old_worker: PSWorker = None) -> PSWorker:
+        worker = PSWorker(self.__argv, self.timeout)
+        worker.start()
+
+        with self.__lock:
+            if old_worker in self.__workers:
+                self.__workers.remove(old_worker)
+            self.__workers.append(worker)
+        return worker
+
+    def __respawn(self, worker: PSWorker) -> PSWorker:
+        worker.kill()
+        self.respawn_count += 1
+        return self.__spawn(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> PSWorkerPool:
+    """Pool shared by all the tests in a run, the size comes from PSCOMMAND_POOL_SIZE."""
+    global _shared_pool  # pylint: disable=global-statement
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = PSWorkerPool(size=int(os.environ.get("PSCOMMAND_POOL_SIZE", "1")))
+        return _shared_pool
+
+
+def close_shared_pool() -> None:
+    """Stops the shared pool, a new one is started if it is used again."""
+    global _shared_pool  # pylint: disable=global-statement
+
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
+
+
+atexit.register(close_shared_pool)
+
+
+# Fake worker, runs the cmdlets with the Python twin instead of pwsh.
+
+# Parameters for each cmdlet as (name, type) in the same order as the param blocks in the script
+CMDLET_PARAMETERS = {
+    "Convert-IPNumToIpStr": (cidr.convert_ip_num_to_ip_str, [("IpPrefixUInt", "uint")]),
+    "Convert-IPStrToIPUInt": (cidr.convert_ip_str_to_ip_uint, [("IPStr", "string")]),
+    "Get-HostBitsByte": (cidr.get_host_bits_byte, [("SubnetSuffixNum", "byte")]),
+    "Get-HostMaskUInt": (cidr.get_host_mask_uint, [("HostBitsByte", "byte")]),
+    "Get-SubnetMaskUInt": (cidr.get_subnet_mask_uint, [("SubnetSuffixNum", "byte")]),
+    "Get-NetworkIpAddressUInt": (cidr.get_network_ip_address_uint, [("IpPrefixUInt", "uint"), ("subnetMaskUInt", "uint")]),
+    "Get-BroadcastIpAddressUInt": (cidr.get_broadcast_ip_address_uint, [("networkIpUInt", "uint"), ("hostMaskUInt", "uint")]),
+    "Get-TotalCountOfIPAddress": (cidr.get_total_count_of_ip_address, [("subnetSuffixNum", "byte")]),
+    "Get-IPv4CIDRTranslation": (cidr.get_ipv4_cidr_translation, [("CIDRAddress", "string")]),
+    "ConvertTo-IPv4CIDRRecord": (cidr.convert_to_ipv4_cidr_record, [("CIDRAddress", "string")]),
+    "Compare-Subnets": (cidr.compare_subnets, [("CIDRAddressA", "string"), ("CIDRAddressB", "string")]),
+    "Test-IPInSubnet": (cidr.is_ip_in_subnet, [("IPStr", "string"), ("CIDRAddress", "string")]),
+}
+
+
+def _convert_argument(parameter: str, value: str, type_name: str):
+    """Parameter binding, casts the argument to [uint], [byte] or [string]."""
+    if type_name == "string":
+        return value
+
+    maximum = cidr.UINT_MAX_VALUE if type_name == "uint" else cidr.BYTE_MAX_VALUE
+    system_type = "System.UInt32" if type_name == "uint" else "System.Byte"
+    try:
+        number = int(value)
+    except ValueError as error:
+        raise ValueError(f"Cannot process argument transformation on parameter '{parameter}'. Cannot convert value \"{value}\" to type \"{system_type}\". Error: \"The input string '{value}' was not in a correct format.\"") from error
+
+    if number < 0 or number > maximum:
+        raise ValueError(f"Cannot process argument transformation on parameter '{parameter}'. Cannot convert value \"{value}\" to type \"{system_type}\". Error: \"Value was either too large or too small for a {system_type.split('.')[1]}.\"")
+    return number
+
+
+def _match_parameter(cmdlet: str, name: str, parameters: list[tuple[str, str]]) -> tuple[str, str]:
+    """PowerShell parameter names are case insensitive and can be shortened (e.g. -HostBits)."""
+    matches = [parameter for parameter in parameters if parameter[0].lower().startswith(name.lower())]
+    exact = [parameter for parameter in matches if parameter[0].lower() == name.lower()]
+
+    if exact:
+        return exact[0]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise ValueError(f"A parameter cannot be found that matches parameter name '{name}'.")
+    raise ValueError(f"Parameter cannot be processed because the parameter name '{name}' is ambiguous for {cmdlet}.")
+
+
+def invoke_fake_cmdlet(command: str):
+    """
+    Parses a cmdlet string like 'Test-IPInSubnet -IPStr "10.28.0.23" -CIDRAddress "10.28.0.0/16"'
+    and runs it with the Python twin. Returns the value and the list of warnings, raises
+    ValueError with a PowerShell like message when the cmdlet would have thrown.
+    """
+    tokens = shlex.split(command.strip().rstrip(";"))
+    if not tokens:
+        raise ValueError("No cmdlet to run")
+
+    name = next((cmdlet for cmdlet in CMDLET_PARAMETERS if cmdlet.lower() == tokens[0].lower()), None)
+    if name is None:
+        raise ValueError(f"The term '{tokens[0]}' is not recognized as a name of a cmdlet, function, script file, or executable program.")
+
+    function, parameters = CMDLET_PARAMETERS[name]
+    arguments = {}
+    positional = list(parameters)
+    index = 1
+
+    while index < len(tokens):
+        token = tokens[index]
+        if token.startswith("-") and not token[1:].lstrip("-").isdigit():
+            parameter, type_name = _match_parameter(name, token[1:], parameters)
+            if index + 1 >= len(tokens):
+                raise ValueError(f"Missing an argument for parameter '{parameter}'. Specify a parameter of type '{type_name}' and try again.")
+            arguments[parameter] = _convert_argument(parameter, tokens[index + 1], type_name)
+            positional = [p for p in positional if p[0] != parameter]
+            index += 2
+        else:
+            if not positional:
+                raise ValueError(f"A positional parameter cannot be found that accepts argument '{token}'.")
+            parameter, type_name = positional.pop(0)
+            arguments[parameter] = _convert_argument(parameter, token, type_name)
+            index += 1
+
+    missing = [parameter for parameter, _ in parameters if parameter not in arguments]
+    if missing:
+        raise ValueError(f"Cannot process command because of one or more missing mandatory parameters: {' '.join(missing)}.")
+
+    warnings = []
+    values = [arguments[parameter] for parameter, _ in parameters]
+    if function in (cidr.get_ipv4_cidr_translation, cidr.convert_to_ipv4_cidr_record):
+        return function(*values, warnings=warnings), warnings
+    return function(*values), warnings
+
+
+def format_ps_output(value) -> str:
+    """Roughly what Out-String prints for the values the cmdlets return."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f"{value}\n"
+    if isinstance(value, cidr.IPv4CIDRRecord):
+        return f"\n{'NetworkIP':>10} SubnetSuffix\n{'---------':>10} ------------\n{value.NetworkIP:>10} {value.SubnetSuffix:>12}\n\n"
+    if isinstance(value, dict):
+        lines = ["", f"{'Name':<30} Value", f"{'----':<30} -----"]
+        for key, item in value.items():
+            if isinstance(item, dict):
+                item = "{" + ", ".join(f"[{k}, {v}]" for k, v in item.items()) + "}"
+            lines.append(f"{key:<30} {item}")
+        return "\n".join(lines) + "\n\n"
+    return f"{value}\n"
+
+
+def run_fake_command(command: str) -> dict:
+    """Fake version of Invoke-WorkerCommand in IPv4CIDRSubnettingWorker.ps1."""
+    try:
+        value, warnings = invoke_fake_cmdlet(command)
+        return {"output": format_ps_output(value), "warnings": warnings, "error": None}
+    except ValueError as error:
+        return {"output": "", "warnings": [], "error": str(error)}
+
+
+def run_fake_batch(commands: list[str]) -> dict:
+    """Fake version of Invoke-WorkerBatch in IPv4CIDRSubnettingWorker.ps1."""
+    results = []
+    for command in commands:
+        try:
+            value, warnings = invoke_fake_cmdlet(command)
+            results.append({"value": value, "warnings": warnings, "error": None})
+        except ValueError as error:
+            results.append({"value": None, "warnings": [], "error": str(error)})
+    return {"results": results}
+
+
+def _to_json(value):
+    """ConvertTo-Json for the objects the cmdlets return that json can't serialise on its own."""
+    if isinstance(value, cidr.IPv4CIDRRecord):
+        return value.to_json()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_frame(stdout: io.TextIOBase, frame: dict) -> None:
+    """Same framing as Write-WorkerFrame."""
+    stdout.write(FRAME_PREFIX + json.dumps(frame, separators=(",", ":"), default=_to_json) + "\n")
+    stdout.flush()
+
+
+def serve_fake(stdin: io.TextIOBase = sys.stdin, stdout: io.TextIOBase = sys.stdout) -> None:
+    """Main loop of the fake worker, same protocol as IPv4CIDRSubnettingWorker.ps1."""
+    write_frame(stdout, {"ready": True, "pid": os.getpid()})
+
+    for line in stdin:
+        if not line.strip():
+            continue
+
+        request = json.loads(line)
+        started = time.perf_counter()
+        if "batch" in request:
+            reply = run_fake_batch(request["batch"])
+        else:
+            reply = run_fake_command(request["command"])
+        reply["id"] = request.get("id")
+        reply["execute_ms"] = (time.perf_counter() - started) * 1000
+        write_frame(stdout, reply)
+
+
+if __name__ == "__main__":
+    if "--fake" in sys.argv[1:]:
+        serve_fake()
+    else:
+        print(__doc__)
@@ -0,0 +1,152 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Longest prefix match index for bulk Test-IPInSubnet lookups. Test-IPInSubnet works out the
+masks for one IP and one CIDR every time it is called, so classifying addresses against
+thousands of VNets, subnets and private links means calling it thousands of times per address.
+
+Two CIDRs are either nested or they do not overlap at all, so a list of CIDRs can be flattened
+into sorted, non overlapping intervals where each interval belongs to the most specific CIDR
+covering it. Looking up an address is then a binary search (O(log n)) on the interval starts,
+and the containing CIDRs of a CIDR are found by following its parent.
+"""
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+from ip_v4_cidr_subnetting import UINT_MAX_VALUE
+
+NO_MATCH = -1
+
+
+class SubnetIndex:
+    """
+    Index over a list of CIDR addresses. Lookups return positions in the list passed in (so
+    index.cidrs[position] is the subnet), or NO_MATCH (-1) when no CIDR contains the address.
+    """
+    def __init__(self, cidrs: list[str]):
+        self.cidrs = list(cidrs)
+        ip_prefix_uint, suffixes = cidr_np.split_cidr(self.cidrs) if self.cidrs else (np.zeros(0, np.uint32), np.zeros(0, np.uint8))
+        network_ip_uint, broadcast_ip_uint = cidr_np.get_network_and_broadcast(ip_prefix_uint, suffixes)
+
+        self.network_ip_uint = network_ip_uint
+        self.broadcast_ip_uint = broadcast_ip_uint
+        self.suffixes = suffixes
+        self.parents = np.full(len(self.cidrs), NO_MATCH, dtype=np.int64)
+        self.depth = 0
+        self.__build()
+
+    def __build(self) -> None:
+        """
+        Sweeps over the CIDRs sorted by network IP (bigger subnets first when they start at the same
+        address) with a stack of the CIDRs that contain the current one. Every push or pop of the
+        stack starts a new interval owned by whichever CIDR is on top of the stack.
+        """
+        order = np.lexsort((np.arange(len(self.cidrs)), self.suffixes, self.network_ip_uint))
+        networks = self.network_ip_uint.astype(np.int64)[order].tolist()
+        broadcasts = self.broadcast_ip_uint.astype(np.int64)[order].tolist()
+        positions = order.tolist()
+
+        starts = []
+        owners = []
+        stack = []
+
+        def pop_until(address: int) -> None:
+            while stack and broadcasts[stack[-1]] < address:
+                end = broadcasts[stack.pop()] + 1
+                starts.append(end)
+                owners.append(positions[stack[-1]] if stack else NO_MATCH)
+
+        for i, network in enumerate(networks):
+            pop_until(network)
+            self.parents[positions[i]] = positions[stack[-1]] if stack else NO_MATCH
+            stack.append(i)
+            self.depth = max(self.depth, len(stack))
+            starts.append(network)
+            owners.append(positions[i])
+
+        pop_until(1 << 33)
+
+        starts = np.array(starts, dtype=np.int64)
+        owners = np.array(owners, dtype=np.int64)
+        # When a few intervals start at the same address, the last one pushed is the most specific
+        last = np.append(starts[1:] != starts[:-1], True) if len(starts) else np.zeros(0, dtype=bool)
+        self.interval_starts = starts[last]
+        self.interval_owners = owners[last]
+
+    @staticmethod
+    def _as_ip_array(ips) -> np.ndarray:
+        """
+        Addresses as uint32, dotted quad strings are parsed with Convert-IPStrToIPUInt. Numbers have
+        to fit in a [uint], casting would wrap them around to some other address.
+        """
+        ips = np.asarray(ips)
+        if ips.dtype.kind in "US":
+            return cidr_np.convert_ip_str_to_ip_uint(ips)
+
+        flat = ips.ravel()
+        if ips.dtype.kind == "O":
+            # Python ints too big for int64 end up as objects
+            valid = np.array([isinstance(ip, (int, np.integer)) and 0 <= ip <= UINT_MAX_VALUE for ip in flat], dtype=bool)
+        elif ips.dtype.kind in "iu":
+            valid = (flat >= 0) & (flat <= UINT_MAX_VALUE)
+        else:
+            valid = np.zeros(flat.shape, dtype=bool)
+        if not valid.all():
+            index = int(np.argmin(valid))
+            raise ValueError(f"Cannot convert value \"{flat[index]}\" at index {index} to type \"System.UInt32\". Value was either too large or too small for a UInt32.")
+        return ips.astype(np.uint32)
+
+    def lookup(self, ips) -> np.ndarray:
+        """Most specific CIDR containing each address, as positions in cidrs (or NO_MATCH)."""
+        ips = self._as_ip_array(ips)
+        slot = np.searchsorted(self.interval_starts, ips.astype(np.int64), side="right") - 1
+        owners = np.where(slot >= 0, self.interval_owners[np.clip(slot, 0, None)], NO_MATCH) if len(self.interval_starts) else np.full(ips.shape, NO_MATCH)
+        return owners.astype(np.int64)
+
+    def lookup_all(self, ips) -> np.ndarray:
+        """
+        Every CIDR containing each address, most specific first. Returns an (n, depth) array of
+        positions in cidrs, padded with NO_MATCH.
+        """
+        current = self.lookup(ips)
+        matches = np.full((len(current), max(self.depth, 1)), NO_MATCH, dtype=np.int64)
+
+        for level in range(self.depth):
+            matches[:, level] = current
+            current = np.where(current >= 0, self.parents[np.clip(current, 0, None)], NO_MATCH)
+            if not np.any(current >= 0):
+                break
+
+        return matches
+
+    def contains(self, ips) -> np.ndarray:
+        """True for each address that is in at least one of the CIDRs."""
+        return self.lookup(ips) != NO_MATCH
+
+    def lookup_cidrs(self, ips) -> list:
+        """Most specific CIDR string for each address, None when there is no match."""
+        return [self.cidrs[position] if position != NO_MATCH else None for position in self.lookup(ips).tolist()]
+
+    def __len__(self) -> int:
+        return len(self.cidrs)
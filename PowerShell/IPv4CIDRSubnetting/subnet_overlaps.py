@@ -0,0 +1,197 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Bulk version of Compare-Subnets for auditing a whole address plan. Comparing every pair of N
+subnets with Compare-Subnets is O(N^2) calls. Instead, the subnets are sorted by network IP
+(bigger subnets first when they start at the same address) and swept once with a stack of the
+subnets that are still open (their broadcast IP is not behind us yet). Two CIDRs either nest or
+do not overlap at all, so every subnet on the stack contains the current one. That makes the
+audit O(N log N) for the sort plus one step per overlapping pair found.
+
+    python subnet_overlaps.py plan.json
+
+Where plan.json looks like:
+    {
+        "address_spaces": ["10.28.0.0/16"],
+        "subnets": [
+            {"cidr": "10.28.0.0/25", "parent": "10.28.0.0/16"},
+            "10.28.0.128/25"
+        ]
+    }
+"""
+
+import argparse
+import json
+from typing import NamedTuple
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+from subnet_index import NO_MATCH, SubnetIndex
+
+
+class Overlap(NamedTuple):
+    """Two overlapping subnets, outer contains inner (or they are the same CIDR, a duplicate)."""
+    outer: int
+    inner: int
+    kind: str
+
+
+class Outside(NamedTuple):
+    """A subnet that is not inside its declared parent, or not inside any address space."""
+    subnet: int
+    parent: str | None
+
+
+class OverlapReport(NamedTuple):
+    """Result of audit_plan, positions refer to the subnets list."""
+    subnets: list[str]
+    address_spaces: list[str]
+    overlaps: list[Overlap]
+    outside: list[Outside]
+
+    @property
+    def ok(self) -> bool:
+        """True when nothing overlaps and everything is inside its address space."""
+        return not self.overlaps and not self.outside
+
+    def to_dict(self) -> dict:
+        """Compact JSON friendly form of the report."""
+        return {
+            "subnets": len(self.subnets),
+            "address_spaces": len(self.address_spaces),
+            "overlaps": [[self.subnets[o.outer], self.subnets[o.inner], o.kind] for o in self.overlaps],
+            "outside": [[self.subnets[o.subnet], o.parent] for o in self.outside],
+        }
+
+    def summary(self) -> str:
+        """Text version of the report."""
+        lines = [f"{len(self.subnets)} subnets, {len(self.address_spaces)} address spaces"]
+        lines.append(f"Overlapping subnets: {len(self.overlaps)}")
+        for overlap in self.overlaps:
+            verb = "duplicates" if overlap.kind == "duplicate" else "contains"
+            lines.append(f"  {self.subnets[overlap.outer]} {verb} {self.subnets[overlap.inner]}")
+        lines.append(f"Outside their address space: {len(self.outside)}")
+        for outside in self.outside:
+            parent = f"declared parent {outside.parent}" if outside.parent else "no address space contains it"
+            lines.append(f"  {self.subnets[outside.subnet]} ({parent})")
+        return "\n".join(lines)
+
+
+def find_overlaps(cidrs: list[str]) -> list[Overlap]:
+    """Every pair of overlapping CIDRs in the list with one sweep over the sorted network IPs."""
+    if not cidrs:
+        return []
+
+    ip_prefix_uint, suffixes = cidr_np.split_cidr(cidrs)
+    network_ip_uint, broadcast_ip_uint = cidr_np.get_network_and_broadcast(ip_prefix_uint, suffixes)
+    order = np.lexsort((np.arange(len(cidrs)), suffixes, network_ip_uint)).tolist()
+    networks = network_ip_uint.tolist()
+    broadcasts = broadcast_ip_uint.tolist()
+    suffix_list = suffixes.tolist()
+
+    overlaps = []
+    stack = []
+
+    for current in order:
+        while stack and broadcasts[stack[-1]] < networks[current]:
+            stack.pop()
+
+        for outer in stack:
+            same = networks[outer] == networks[current] and suffix_list[outer] == suffix_list[current]
+            overlaps.append(Overlap(outer, current, "duplicate" if same else "contains"))
+
+        stack.append(current)
+
+    return overlaps
+
+
+def find_outside(subnets: list[str], address_spaces: list[str] = (), parents: list = None) -> list[Outside]:
+    """
+    Subnets that are not inside their declared parent (when parents has one for the subnet), or
+    not inside any of the address spaces (when there are address spaces and no declared parent).
+    """
+    if not subnets:
+        return []
+
+    ip_prefix_uint, suffixes = cidr_np.split_cidr(subnets)
+    network_ip_uint, broadcast_ip_uint = cidr_np.get_network_and_broadcast(ip_prefix_uint, suffixes)
+    parents = list(parents) if parents is not None else [None] * len(subnets)
+    outside = np.zeros(len(subnets), dtype=bool)
+
+    declared = np.array([parent is not None for parent in parents], dtype=bool)
+    if declared.any():
+        parent_prefix_uint, parent_suffixes = cidr_np.split_cidr([parent for parent in parents if parent is not None])
+        parent_network, parent_broadcast = cidr_np.get_network_and_broadcast(parent_prefix_uint, parent_suffixes)
+        outside[declared] = (network_ip_uint[declared] < parent_network) | (broadcast_ip_uint[declared] > parent_broadcast)
+
+    if len(address_spaces) and not declared.all():
+        # A subnet is inside an address space if one of the spaces containing its network IP is as big or bigger
+        index = SubnetIndex(address_spaces)
+        matches = index.lookup_all(network_ip_uint)
+        match_suffixes = np.where(matches != NO_MATCH, index.suffixes[np.clip(matches, 0, None)], 33)
+        inside_space = np.any(match_suffixes <= suffixes[:, None], axis=1)
+        outside[~declared] = ~inside_space[~declared]
+
+    return [Outside(int(i), parents[i]) for i in np.flatnonzero(outside)]
+
+
+def audit_plan(subnets: list[str], address_spaces: list[str] = (), parents: list = None) -> OverlapReport:
+    """Audits an address plan, every overlapping pair of subnets and every subnet outside its address space."""
+    subnets = list(subnets)
+    address_spaces = list(address_spaces)
+    return OverlapReport(subnets, address_spaces, find_overlaps(subnets), find_outside(subnets, address_spaces, parents))
+
+
+def load_plan(path: str) -> tuple[list[str], list[str], list]:
+    """Reads a plan JSON file, subnets can be CIDR strings or objects with cidr and parent."""
+    with open(path, encoding="utf-8") as plan_file:
+        plan = json.load(plan_file)
+
+    subnets = []
+    parents = []
+    for subnet in plan.get("subnets", []):
+        if isinstance(subnet, str):
+            subnets.append(subnet)
+            parents.append(None)
+        else:
+            subnets.append(subnet["cidr"])
+            parents.append(subnet.get("parent"))
+
+    return subnets, plan.get("address_spaces", []), parents
+
+
+def main() -> None:
+    """Audits the plan file and prints the report, exits with 1 if there are any problems."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("plan", help="Plan JSON file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = audit_plan(*load_plan(args.plan))
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.summary())
+    raise SystemExit(0 if report.ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Carves subnets out of a parent CIDR (e.g. 10.28.0.0/16 into /25 public, /25 private and /27
+private link) without trial and error Compare-Subnets checks. It is a buddy allocator: there is a
+free list for every subnet suffix, and a request for a /27 takes the lowest free /27, or splits the
+smallest bigger free block in half until there is one (the other halves go on the free lists).
+Freeing a subnet merges it back with its buddy (the other half of the block it was split from)
+while the buddy is free too. A subnet and its buddy only differ in the host bit for the suffix, so
+the blocks are always aligned to their prefix boundary and never overlap.
+
+Each allocation or free is at most 32 splits or merges, so thousands of subnets from a /8 is quick.
+"""
+
+import heapq
+
+from ip_v4_cidr_subnetting import (HOST_MASK_TABLE, SUBNET_MASK_TABLE, convert_ip_num_to_ip_str,
+                                   convert_ip_str_to_ip_uint, get_network_ip_address_uint, split_cidr)
+
+# Number of addresses in a block for each suffix, from /0 to /32
+BLOCK_SIZES = [host_mask_uint + 1 for host_mask_uint in HOST_MASK_TABLE]
+SUBNET_MASKS = SUBNET_MASK_TABLE
+
+
+class SubnetPlanner:
+    """
+    Buddy allocator for the address space of parent_cidr. Subnets that are already in use can
+    be passed in as reserved, they are taken out of the free space before anything is allocated.
+    """
+    def __init__(self, parent_cidr: str, reserved: list[str] = ()):
+        ip_str, suffix = split_cidr(parent_cidr)
+        if not 0 <= suffix <= 32:
+            raise ValueError(f"Cannot plan inside {parent_cidr}, the suffix needs to be between 0 and 32.")
+        self.parent_suffix = suffix
+        self.parent_network = get_network_ip_address_uint(convert_ip_str_to_ip_uint(ip_str), SUBNET_MASKS[suffix])
+        self.parent_cidr = f"{convert_ip_num_to_ip_str(self.parent_network)}/{suffix}"
+        self.allocated = {}
+
+        # Heap for the lowest free block of each suffix, the set says which heap entries are still free
+        self.__free_heaps = [[] for _ in range(33)]
+        self.__free_sets = [set() for _ in range(33)]
+        self.__push_free(self.parent_network, suffix)
+
+        for cidr in reserved:
+            self.reserve(cidr)
+
+    def __push_free(self, network: int, suffix: int) -> None:
+        self.__free_sets[suffix].add(network)
+        heapq.heappush(self.__free_heaps[suffix], network)
+
+    def __pop_free(self, suffix: int) -> int | None:
+        """Lowest free block for the suffix, or None when there isn't one."""
+        heap = self.__free_heaps[suffix]
+        free = self.__free_sets[suffix]
+        while heap:
+            network = heapq.heappop(heap)
+            if network in free:
+                free.remove(network)
+                return network
+        return None
+
+    def __split(self, network: int, suffix: int, target_suffix: int, keep: int) -> None:
+        """Splits the block down to target_suffix, keeping the half with keep in it and freeing the other halves."""
+        for half_suffix in range(suffix + 1, target_suffix + 1):
+            upper = network + BLOCK_SIZES[half_suffix]
+            if keep >= upper:
+                self.__push_free(network, half_suffix)
+                network = upper
+            else:
+                self.__push_free(upper, half_suffix)
+
+    def __check_suffix(self, suffix: int) -> None:
+        if not self.parent_suffix <= suffix <= 32:
+            raise ValueError(f"Cannot allocate a /{suffix} from {self.parent_cidr}, the suffix needs to be between {self.parent_suffix} and 32.")
+
+    def allocate(self, suffix: int) -> str:
+        """Allocates the lowest free subnet with the suffix and returns its CIDR."""
+        self.__check_suffix(suffix)
+
+        for block_suffix in range(suffix, self.parent_suffix - 1, -1):
+            network = self.__pop_free(block_suffix)
+            if network is not None:
+                self.__split(network, block_suffix, suffix, network)
+                self.allocated[network] = suffix
+                return f"{convert_ip_num_to_ip_str(network)}/{suffix}"
+
+        raise ValueError(f"There is no free /{suffix} left in {self.parent_cidr}.")
+
+    def reserve(self, cidr: str) -> str:
+        """Takes a specific subnet out of the free space, e.g. one that is already in use."""
+        network, suffix = self.__parse(cidr)
+
+        for block_suffix in range(suffix, self.parent_suffix - 1, -1):
+            block = network & SUBNET_MASKS[block_suffix]
+            if block in self.__free_sets[block_suffix]:
+                self.__free_sets[block_suffix].remove(block)
+                self.__split(block, block_suffix, suffix, network)
+                self.allocated[network] = suffix
+                return f"{convert_ip_num_to_ip_str(network)}/{suffix}"
+
+        raise ValueError(f"{cidr} overlaps a subnet that is already allocated in {self.parent_cidr}.")
+
+    def free(self, cidr: str) -> None:
+        """Frees an allocated subnet and merges it with its buddy while the buddy is free."""
+        network, suffix = self.__parse(cidr)
+        if self.allocated.get(network) != suffix:
+            raise ValueError(f"{cidr} is not allocated in {self.parent_cidr}.")
+        del self.allocated[network]
+
+        while suffix > self.parent_suffix:
+            buddy = network ^ BLOCK_SIZES[suffix]
+            if buddy not in self.__free_sets[suffix]:
+                break
+            self.__free_sets[suffix].remove(buddy)
+            network = min(network, buddy)
+            suffix -= 1
+
+        self.__push_free(network, suffix)
+
+    def plan(self, suffixes: list[int]) -> list[str]:
+        """
+        Allocates a subnet for each suffix, biggest subnets first so they pack without gaps, and
+        returns the CIDRs in the same order as the suffixes.
+        """
+        for suffix in suffixes:
+            self.__check_suffix(suffix)
+
+        cidrs = [None] * len(suffixes)
+        for position in sorted(range(len(suffixes)), key=lambda i: suffixes[i]):
+            cidrs[position] = self.allocate(suffixes[position])
+        return cidrs
+
+    def free_blocks(self) -> list[str]:
+        """The free blocks as CIDRs, sorted by network IP."""
+        blocks = sorted((network, suffix) for suffix in range(33) for network in self.__free_sets[suffix])
+        return [f"{convert_ip_num_to_ip_str(network)}/{suffix}" for network, suffix in blocks]
+
+    def fragmentation(self) -> dict:
+        """
+        How broken up the free space is. Fragmentation is 0 when all the free addresses are in one
+        block and gets closer to 1 the smaller the biggest free block is compared to the free space.
+        """
+        free_counts = {suffix: len(self.__free_sets[suffix]) for suffix in range(33) if self.__free_sets[suffix]}
+        free_addresses = sum(BLOCK_SIZES[suffix] * count for suffix, count in free_counts.items())
+        largest_suffix = min(free_counts, default=None)
+
+        return {
+            "TotalAddresses": BLOCK_SIZES[self.parent_suffix],
+            "AllocatedAddresses": BLOCK_SIZES[self.parent_suffix] - free_addresses,
+            "FreeAddresses": free_addresses,
+            "FreeBlocks": free_counts,
+            "LargestFreeSuffix": largest_suffix,
+            "Fragmentation": 1 - BLOCK_SIZES[largest_suffix] / free_addresses if free_addresses else 0.0,
+        }
+
+    def __parse(self, cidr: str) -> tuple[int, int]:
+        """Network IP and suffix of a CIDR inside the parent, the host bits have to be 0."""
+        ip_str, suffix = split_cidr(cidr)
+        self.__check_suffix(suffix)
+        network = convert_ip_str_to_ip_uint(ip_str)
+        if get_network_ip_address_uint(network, SUBNET_MASKS[suffix]) != network:
+            raise ValueError(f"{cidr} has host bits set, the network IP is {convert_ip_num_to_ip_str(network & SUBNET_MASKS[suffix])}/{suffix}.")
+        if network & SUBNET_MASKS[self.parent_suffix] != self.parent_network:
+            raise ValueError(f"{cidr} is not inside {self.parent_cidr}.")
+        return network, suffix
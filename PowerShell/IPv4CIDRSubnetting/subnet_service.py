@@ -0,0 +1,469 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Long running subnet query service on a Unix domain socket, so the things that need the CIDR logic
+don't each pay for starting pwsh and dot sourcing IPv4CIDRSubnetting.ps1 (or building IPv4Network
+objects) every time. The plan (one CIDR per line, or a plan.json like subnet_overlaps.py reads) is
+loaded once into a SubnetIndex and kept warm, and any number of clients can connect at the same time.
+
+The protocol is newline delimited JSON, one request per line and one response per line in the same
+order, so clients can pipeline as many requests as they like without waiting for the responses.
+Every request has an op, an optional id that is sent back, and either one value or a list of them:
+
+    {"id": 1, "op": "translate", "cidr": "10.28.0.0/16"}                Get-IPv4CIDRTranslation ("cidrs" for a list)
+    {"id": 2, "op": "contains", "ips": ["10.28.0.1"], "cidr": "10.28.0.0/25"}  Test-IPInSubnet (the plan without "cidr")
+    {"id": 3, "op": "overlaps", "a": "10.28.0.0/25", "b": "10.28.0.0/16"}      Compare-Subnets ("pairs" for a list)
+    {"id": 4, "op": "overlaps", "cidr": "10.28.1.0/24"}                 Which plan subnets overlap the CIDR
+    {"id": 5, "op": "lookup", "ips": ["10.28.0.1"], "all": false}       Most specific plan subnet (or all of them)
+    {"id": 6, "op": "stats"}                                            Request counts and latency histograms
+    {"id": 7, "op": "reload"}                                           Loads the plan file again
+
+Addresses are dotted quad strings or numbers from 0 to 4294967295 (anything else is an error,
+numbers are never wrapped around). Responses are {"id": 1, "ok": true, "result": ...} or
+{"id": 1, "ok": false, "error": "..."}, a bad request only fails itself and not the connection.
+Reloading (or sending the service SIGHUP) builds the new index off the event loop and swaps it in,
+connections stay open and requests that already started finish on the old plan. Clients can only
+reload the plan the service was started with, a different plan means restarting it with --plan.
+
+    python subnet_service.py --plan plan.txt --socket /tmp/subnet_service.sock
+    python subnet_service.py --socket /tmp/subnet_service.sock --query '{"op": "lookup", "ips": ["10.28.0.1"]}'
+"""
+
+import argparse
+import asyncio
+import bisect
+import functools
+import itertools
+import json
+import os
+import signal
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+from ip_v4_cidr_subnetting import (UINT_MAX_VALUE, compare_subnets, convert_ip_num_to_ip_str, convert_ip_str_to_ip_uint,
+                                   get_ipv4_cidr_translation, is_ip_in_subnet)
+from log_classifier import read_cidrs
+from subnet_index import NO_MATCH, SubnetIndex
+from subnet_overlaps import load_plan
+
+DEFAULT_SOCKET = "/tmp/subnet_service.sock"
+# Lines can hold big batches of addresses
+LINE_LIMIT = 64 << 20
+# Batches bigger than this are worked out on a thread so they don't hold up the other clients
+OFFLOAD_SIZE = 50000
+# Upper bounds of the latency histogram buckets in microseconds, the last bucket is everything slower
+LATENCY_BUCKETS_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000, 1000000)
+OPS = ("translate", "contains", "overlaps", "lookup", "stats", "reload")
+
+
+class ServiceError(Exception):
+    """The service answered a request with an error."""
+
+
+class SubnetPlan(NamedTuple):
+    """
+    A loaded plan, the index is built once and shared by every request until the next reload. The
+    intervals are kept as lists too, so single addresses are looked up with bisect instead of
+    going through the NumPy batch code (which costs more than the lookup for one address).
+    """
+    path: str
+    index: SubnetIndex
+    loaded_at: float
+    build_ms: float
+    interval_starts: list
+    interval_owners: list
+    parents: list
+
+    def lookup_one(self, ip_str: str) -> list[int]:
+        """Positions of every CIDR containing the address, most specific first."""
+        slot = bisect.bisect_right(self.interval_starts, convert_ip_str_to_ip_uint(ip_str)) - 1
+        position = self.interval_owners[slot] if slot >= 0 else NO_MATCH
+        positions = []
+        while position != NO_MATCH:
+            positions.append(position)
+            position = self.parents[position]
+        return positions
+
+
+def load_subnet_plan(path: str) -> SubnetPlan:
+    """Reads the plan file (JSON plans use their subnets and address spaces) and builds the index."""
+    started = time.perf_counter()
+    if path.endswith(".json"):
+        subnets, address_spaces, _ = load_plan(path)
+        cidrs = list(address_spaces) + subnets
+    else:
+        cidrs = read_cidrs(path)
+    index = SubnetIndex(cidrs)
+    return SubnetPlan(path, index, time.time(), (time.perf_counter() - started) * 1000,
+                      index.interval_starts.tolist(), index.interval_owners.tolist(), index.parents.tolist())
+
+
+@functools.lru_cache(maxsize=65536)
+def _translation(cidr: str) -> tuple[dict, tuple]:
+    """Get-IPv4CIDRTranslation and its warnings, the same CIDRs come up over and over so they are cached."""
+    warnings = []
+    return get_ipv4_cidr_translation(cidr, warnings), tuple(warnings)
+
+
+def _values(request: dict, singular: str, plural: str) -> tuple[list, bool]:
+    """The list of values in a request and whether it was sent as a single value."""
+    if plural in request:
+        if not isinstance(request[plural], list):
+            raise ValueError(f"{plural} needs to be a list.")
+        return request[plural], False
+    if singular in request:
+        return [request[singular]], True
+    raise ValueError(f"The {request['op']} request needs {singular} or {plural}.")
+
+
+def _ips(request: dict) -> tuple[list, bool]:
+    """The addresses in a request and whether one was sent, numbers have to fit in a [uint]."""
+    ips, single = _values(request, "ip", "ips")
+    for ip in ips:
+        if isinstance(ip, bool) or not isinstance(ip, (str, int)):
+            raise ValueError(f"{json.dumps(ip)} is not an IPv4 address, it needs to be a string or a number.")
+        if isinstance(ip, int) and not 0 <= ip <= UINT_MAX_VALUE:
+            raise ValueError(f"Cannot convert value \"{ip}\" to type \"System.UInt32\". Value was either too large or too small for a UInt32.")
+    if single and isinstance(ips[0], int):
+        return [convert_ip_num_to_ip_str(ips[0])], True
+    return ips, single
+
+
+def _ip_array(ips: list) -> np.ndarray:
+    """Addresses from _ips as uint32."""
+    ips = np.asarray(ips)
+    return cidr_np.convert_ip_str_to_ip_uint(ips) if ips.dtype.kind == "U" else ips.astype(np.uint32)
+
+
+def request_size(request: dict) -> int:
+    """Number of values in a request, to decide whether it is big enough to go on a thread."""
+    return max((len(value) for value in request.values() if isinstance(value, list)), default=1)
+
+
+def handle_request(plan: SubnetPlan, request: dict):
+    """Result of a translate, contains, overlaps or lookup request against a plan (raises ValueError for bad requests)."""
+    op = request["op"]
+    index = plan.index
+
+    if op == "translate":
+        cidrs, single = _values(request, "cidr", "cidrs")
+        results = []
+        for cidr in cidrs:
+            translation, warnings = _translation(cidr)
+            results.append({**translation, "Warnings": list(warnings)} if warnings else translation)
+        return results[0] if single else results
+
+    if op == "contains":
+        ips, single = _ips(request)
+        if "cidr" in request:
+            if single:
+                return is_ip_in_subnet(ips[0], request["cidr"])
+            ip_prefix_uint, suffixes = cidr_np.split_cidr([request["cidr"]])
+            found = cidr_np.is_ip_in_subnet(_ip_array(ips), ip_prefix_uint, suffixes)
+        elif single:
+            return bool(plan.lookup_one(ips[0]))
+        else:
+            found = index.contains(ips)
+        return found.tolist()
+
+    if op == "overlaps":
+        if "cidr" in request:
+            ip_prefix_uint, suffixes = cidr_np.split_cidr([request["cidr"]])
+            network_ip_uint, broadcast_ip_uint = cidr_np.get_network_and_broadcast(ip_prefix_uint, suffixes)
+            overlapping = (index.network_ip_uint <= broadcast_ip_uint[0]) & (index.broadcast_ip_uint >= network_ip_uint[0])
+            return [index.cidrs[position] for position in np.flatnonzero(overlapping).tolist()]
+        if "pairs" in request:
+            pairs = request["pairs"]
+            if not pairs:
+                return []
+            ip_prefix_uint_a, suffixes_a = cidr_np.split_cidr([pair[0] for pair in pairs])
+            ip_prefix_uint_b, suffixes_b = cidr_np.split_cidr([pair[1] for pair in pairs])
+            return cidr_np.compare_subnets(ip_prefix_uint_a, suffixes_a, ip_prefix_uint_b, suffixes_b).tolist()
+        if "a" in request and "b" in request:
+            return compare_subnets(request["a"], request["b"])
+        raise ValueError("The overlaps request needs a and b, pairs or cidr.")
+
+    if op == "lookup":
+        ips, single = _ips(request)
+        if single:
+            positions = plan.lookup_one(ips[0])
+            if request.get("all"):
+                return [index.cidrs[position] for position in positions]
+            return index.cidrs[positions[0]] if positions else None
+        if request.get("all"):
+            matches = [[index.cidrs[position] for position in row if position != NO_MATCH] for row in index.lookup_all(ips).tolist()]
+        else:
+            matches = index.lookup_cidrs(ips)
+        return matches
+
+    raise ValueError(f"Unknown op {op}, it needs to be one of {', '.join(OPS)}.")
+
+
+class LatencyHistogram:
+    """Request count and latency histogram for one op."""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_US) + 1)
+
+    def add(self, latency_us: float, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.total_us += latency_us
+        self.max_us = max(self.max_us, latency_us)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_US, latency_us)] += 1
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}us" for bound in LATENCY_BUCKETS_US] + [f">{LATENCY_BUCKETS_US[-1]}us"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_us": round(self.total_us / self.count, 1) if self.count else 0.0,
+            "max_us": round(self.max_us, 1),
+            "histogram": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class SubnetService:
+    """
+    The service, start() listens on the socket and every connection gets its own task. Requests on
+    a connection are answered in order, requests on different connections interleave.
+    """
+    def __init__(self, plan_path: str, socket_path: str = DEFAULT_SOCKET):
+        self.socket_path = socket_path
+        self.plan_path = plan_path
+        self.plan = load_subnet_plan(plan_path)
+        self.reloads = 0
+        self.started_at = time.time()
+        self.connections = 0
+        self.total_connections = 0
+        self.latency = {}
+        self.__server = None
+        self.__reload_lock = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.__reload_lock = asyncio.Lock()
+        self.__server = await asyncio.start_unix_server(self.__serve_client, self.socket_path, limit=LINE_LIMIT)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.__reload_on_signal()))
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Not on Unix, or not running in the main thread (like in the tests)
+            pass
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def __aenter__(self) -> "SubnetService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def reload(self) -> dict:
+        """Builds the plan again off the event loop and swaps it in, the old plan stays if the new one fails."""
+        async with self.__reload_lock:
+            plan = await asyncio.get_running_loop().run_in_executor(None, load_subnet_plan, self.plan_path)
+            self.plan = plan
+            self.reloads += 1
+        return self.plan_info()
+
+    async def __reload_on_signal(self) -> None:
+        try:
+            info = await self.reload()
+            print(f"Reloaded {info['cidrs']} CIDRs from {info['path']}")
+        except (ValueError, OSError) as error:
+            print(f"Reloading the plan failed, still serving the old one: {error}")
+
+    def plan_info(self) -> dict:
+        return {"path": self.plan.path, "cidrs": len(self.plan.index), "loaded_at": self.plan.loaded_at,
+                "build_ms": round(self.plan.build_ms, 2), "reloads": self.reloads}
+
+    def stats(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "connections": self.connections,
+            "total_connections": self.total_connections,
+            "requests": sum(histogram.count for histogram in self.latency.values()),
+            "plan": self.plan_info(),
+            "ops": {op: histogram.to_dict() for op, histogram in sorted(self.latency.items())},
+        }
+
+    async def __answer(self, line: bytes) -> dict:
+        started = time.perf_counter()
+        request_id = None
+        op = "invalid"
+        response = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or not isinstance(request.get("op"), str):
+                raise ValueError("A request needs to be a JSON object with an op.")
+            request_id = request.get("id")
+            op = request["op"] if request["op"] in OPS else "invalid"
+
+            if op == "stats":
+                result = self.stats()
+            elif op == "reload":
+                # Clients don't get to open files on the server, only the configured plan is loaded again
+                if "path" in request:
+                    raise ValueError("Only the plan the service was started with can be reloaded.")
+                result = await self.reload()
+            elif request_size(request) > OFFLOAD_SIZE:
+                result = await asyncio.get_running_loop().run_in_executor(None, handle_request, self.plan, request)
+            else:
+                result = handle_request(self.plan, request)
+            response = {"id": request_id, "ok": True, "result": result}
+        except (ValueError, TypeError, KeyError, IndexError, OverflowError, OSError) as error:
+            response = {"id": request_id, "ok": False, "error": str(error) or type(error).__name__}
+
+        self.latency.setdefault(op, LatencyHistogram()).add((time.perf_counter() - started) * 1e6, not response["ok"])
+        return response
+
+    async def __serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.total_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than LINE_LIMIT, the rest of the stream can't be framed any more
+                    writer.write(json.dumps({"id": None, "ok": False, "error": "Request line is too long."}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                response = await self.__answer(line)
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                # Only waits when the client isn't reading its responses and the buffer is full
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class SubnetServiceClient:
+    """
+    Client for the service. request() sends one request and waits for its response, pipeline()
+    sends a list of requests in one go and then reads all the responses.
+
+        async with SubnetServiceClient("/tmp/subnet_service.sock") as client:
+            await client.request("lookup", ips=["10.28.0.1"])
+    """
+    def __init__(self, socket_path: str = DEFAULT_SOCKET):
+        self.socket_path = socket_path
+        self.__ids = itertools.count(1)
+        self.__reader = None
+        self.__writer = None
+
+    async def connect(self) -> "SubnetServiceClient":
+        self.__reader, self.__writer = await asyncio.open_unix_connection(self.socket_path, limit=LINE_LIMIT)
+        return self
+
+    async def close(self) -> None:
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+            self.__writer = None
+
+    async def __aenter__(self) -> "SubnetServiceClient":
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def pipeline(self, requests: list[dict]) -> list[dict]:
+        """Sends the requests (ids are added when they don't have one) and returns the raw responses in order."""
+        requests = [request if "id" in request else {**request, "id": next(self.__ids)} for request in requests]
+        self.__writer.write(b"".join(json.dumps(request, separators=(",", ":")).encode() + b"\n" for request in requests))
+        await self.__writer.drain()
+
+        responses = []
+        for _ in requests:
+            line = await self.__reader.readline()
+            if not line:
+                raise ConnectionError("The subnet service closed the connection.")
+            responses.append(json.loads(line))
+        return responses
+
+    async def request(self, op: str, **arguments):
+        """Result of one request, raises ServiceError when the service answers with an error."""
+        response = (await self.pipeline([{"op": op, **arguments}]))[0]
+        if not response["ok"]:
+            raise ServiceError(response["error"])
+        return response["result"]
+
+
+async def _query(socket_path: str, lines: list[str]) -> None:
+    async with SubnetServiceClient(socket_path) as client:
+        for response in await client.pipeline([json.loads(line) for line in lines]):
+            print(json.dumps(response))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plan", help="Plan file to serve, one CIDR per line or a plan.json")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Path of the Unix domain socket")
+    parser.add_argument("--query", nargs="+", help="Send these JSON requests to a running service and print the responses")
+    args = parser.parse_args()
+
+    if args.query:
+        asyncio.run(_query(args.socket, args.query))
+    elif args.plan:
+        service = SubnetService(args.plan, args.socket)
+        print(f"Serving {len(service.plan.index)} CIDRs from {args.plan} on {args.socket}")
+        try:
+            asyncio.run(service.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        parser.error("Either --plan (to run the service) or --query (to ask it something) is needed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the benchmark suite (bench_cidr_operations.py), the workloads have to be the same for
+the same seed, every backend has to give the same answers, and compare has to catch regressions.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import bench_cidr_operations as bench
+
+
+class TestBenchCIDROperations(unittest.TestCase):
+    """
+    Testing workloads, backends, result files and compare
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_workloads_are_reproducible(self):
+        """Testing the same seed and size give the same workload, and a different seed doesn't"""
+        self.assertEqual(bench.generate_workload(7, 100), bench.generate_workload(7, 100))
+        self.assertNotEqual(bench.generate_workload(7, 100), bench.generate_workload(8, 100))
+        workload = bench.generate_workload(7, 1000)
+        self.assertEqual(len(workload), 1000)
+        self.assertEqual(workload.head(10).cidrs_b, workload.cidrs_b[:10])
+        self.assertTrue(0 < sum(bench.TWIN_OPERATIONS["Compare-Subnets"](workload)) < 1000)
+
+    def test_backends_agree(self):
+        """Testing ipaddress, the twin, NumPy and the fake worker give the same answers for every operation"""
+        workload = bench.generate_workload(3, 200)
+        with bench.BenchmarkRunner() as runner:
+            for operation in bench.OPERATIONS:
+                twin = bench.TWIN_OPERATIONS[operation](workload)
+                fake = [result.value for result in runner.task(operation, "fake-batch", workload)()]
+                numpy_result = bench.NUMPY_OPERATIONS[operation](workload)
+                address = bench.IPADDRESS_OPERATIONS[operation](workload)
+
+                if operation == "Get-IPv4CIDRTranslation":
+                    keys = ("NetworkIP", "BroadcastIP", "SubnetMask", "HostMask", "FirstHost", "LastHost")
+                    twin_values = [tuple(entry[key]["Numerical"] for key in keys) + (entry["TotalAddresses"],) for entry in twin]
+                    self.assertEqual(twin_values, address)
+                    self.assertEqual(list(zip(*(numpy_result[key].tolist() for key in keys + ("TotalAddresses",)))), address)
+                    self.assertEqual([entry["TotalAddresses"] for entry in fake], [entry["TotalAddresses"] for entry in twin])
+                else:
+                    self.assertEqual(twin, address, operation)
+                    self.assertEqual(np.asarray(numpy_result).tolist(), twin, operation)
+                    self.assertEqual(fake, twin, operation)
+
+    def test_sampled_measurement(self):
+        """Testing slow backends are measured on a sample and extrapolated to the whole workload"""
+        with mock.patch.dict(bench.SAMPLE_LIMITS, {"twin": 50}), mock.patch.object(bench, "MIN_ROUND_SECONDS", 0.001):
+            with bench.BenchmarkRunner(seed=1) as runner:
+                sampled = runner.run("Get-SubnetMaskUInt", "twin", 500)
+                numpy_measurement = runner.run("Get-SubnetMaskUInt", "numpy", 500)
+            with bench.BenchmarkRunner(seed=1, full=True) as runner:
+                full = runner.run("Get-SubnetMaskUInt", "twin", 500)
+
+        self.assertEqual((sampled.measured_ops, sampled.extrapolated), (50, True))
+        self.assertAlmostEqual(sampled.estimated_seconds, sampled.ns_per_op * 500 / 1e9)
+        self.assertEqual((numpy_measurement.measured_ops, numpy_measurement.extrapolated), (500, False))
+        self.assertEqual((full.measured_ops, full.extrapolated), (500, False))
+        self.assertGreater(sampled.ops_per_second, 0)
+
+    def test_compare(self):
+        """Testing compare flags regressions and improvements beyond the threshold and exits with 1 on a regression"""
+        with mock.patch.object(bench, "MIN_ROUND_SECONDS", 0.001):
+            old = bench.run_suite([1, 100], ["Get-SubnetMaskUInt", "Compare-Subnets"], ["twin", "numpy"], seed=5)
+        self.assertEqual(len(old["results"]), 8)
+        self.assertEqual(old["environment"]["seed"], 5)
+
+        new = json.loads(json.dumps(old))
+        new["results"][0]["ns_per_op"] *= 1.5
+        new["results"][1]["ns_per_op"] *= 0.5
+        new["results"][2]["ns_per_op"] *= 1.05
+        del new["results"][3]
+        changes = bench.compare_results(old, new, threshold=0.1)
+        self.assertEqual(len(changes), 8)
+        self.assertEqual([change.status for change in changes[:3]], ["regression", "improvement", "unchanged"])
+        # The deleted result is still reported, last and with no new time
+        self.assertEqual(changes[-1].status, "missing")
+        self.assertEqual(changes[-1][:4], tuple(old["results"][3][key] for key in ("operation", "backend", "size", "ns_per_op")))
+        self.assertEqual([change.status for change in changes].count("missing"), 1)
+        self.assertEqual(bench.compare_results(old, new, threshold=0.6)[0].status, "unchanged")
+
+        paths = []
+        for name, results in (("old.json", old), ("new.json", new), ("same.json", old)):
+            paths.append(os.path.join(self.directory, name))
+            with open(paths[-1], "w", encoding="utf-8") as results_file:
+                json.dump(results, results_file)
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_cidr_operations.py")
+        regressed = subprocess.run([sys.executable, script, "compare", paths[0], paths[1]], capture_output=True, text=True, check=False)
+        self.assertEqual(regressed.returncode, 1)
+        self.assertIn("7 compared, 1 regressions, 1 improvements, 1 missing", regressed.stdout)
+        same = subprocess.run([sys.executable, script, "compare", paths[0], paths[2]], capture_output=True, text=True, check=False)
+        self.assertEqual(same.returncode, 0)
+
+        new["environment"]["machine"] = "arm64"
+        self.assertEqual(len(bench.environment_differences(old, new)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
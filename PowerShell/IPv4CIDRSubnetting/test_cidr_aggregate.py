@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the interval based CIDR aggregation (cidr_aggregate.py) against collapse_addresses
+and summarize_address_range from the ipaddress module, and against Python sets of addresses.
+"""
+
+import random
+import unittest
+from ipaddress import IPv4Address, IPv4Network, collapse_addresses, summarize_address_range
+
+from cidr_aggregate import AddressRanges, collapse_cidrs
+
+
+def random_cidrs(rng: random.Random, count: int, base: int = 0x0A000000, host_bits: int = 16) -> list[str]:
+    """Random CIDRs and host IPs in a small address space so that plenty of them overlap"""
+    cidrs = []
+    for _ in range(count):
+        ip = str(IPv4Address(base + rng.getrandbits(host_bits)))
+        cidrs.append(ip if rng.random() < 0.2 else str(IPv4Network(f"{ip}/{rng.randint(32 - host_bits, 32)}", strict=False)))
+    return cidrs
+
+
+def addresses_of(cidrs: list[str]) -> set[int]:
+    """Every address in the CIDRs as a set of integers"""
+    return {int(ip) for cidr in cidrs for ip in IPv4Network(cidr)}
+
+
+class TestCollapseCIDRs(unittest.TestCase):
+    """
+    Testing collapsing CIDRs and host IPs into the fewest blocks
+    """
+    def test_against_collapse_addresses(self):
+        """Testing random CIDRs and host IPs against collapse_addresses"""
+        rng = random.Random(8)
+        for count in (1, 10, 1000, 5000):
+            cidrs = random_cidrs(rng, count)
+            expected = [str(network) for network in collapse_addresses(IPv4Network(cidr) for cidr in cidrs)]
+            self.assertEqual(collapse_cidrs(cidrs), expected)
+
+    def test_edges(self):
+        """Testing the start and end of the address space and host bits set"""
+        self.assertEqual(collapse_cidrs(["0.0.0.0/0", "10.0.0.1"]), ["0.0.0.0/0"])
+        self.assertEqual(collapse_cidrs(["255.255.255.255", "255.255.255.254"]), ["255.255.255.254/31"])
+        self.assertEqual(collapse_cidrs(["0.0.0.0/1", "128.0.0.0/1"]), ["0.0.0.0/0"])
+        self.assertEqual(collapse_cidrs(["10.28.0.128/16"]), ["10.28.0.0/16"])
+        self.assertEqual(collapse_cidrs([]), [])
+
+    def test_ranges(self):
+        """Testing first to last IP ranges against summarize_address_range"""
+        rng = random.Random(80)
+        for _ in range(200):
+            first, last = sorted(rng.getrandbits(32) for _ in range(2))
+            expected = [str(network) for network in summarize_address_range(IPv4Address(first), IPv4Address(last))]
+            self.assertEqual(AddressRanges.from_ranges([first], [last]).to_cidrs(), expected)
+        self.assertEqual(AddressRanges.from_ranges(["10.28.1.0"], ["10.28.1.39"]).to_cidrs(), ["10.28.1.0/27", "10.28.1.32/29"])
+
+
+class TestAddressRangeSets(unittest.TestCase):
+    """
+    Testing union, intersection, difference and complement against Python sets of addresses
+    """
+    def test_set_operations(self):
+        """Testing random sets of CIDRs against sets of addresses"""
+        rng = random.Random(88)
+        for _ in range(20):
+            a_cidrs = random_cidrs(rng, 30, host_bits=12)
+            b_cidrs = random_cidrs(rng, 30, host_bits=12)
+            a, b = AddressRanges.from_cidrs(a_cidrs), AddressRanges.from_cidrs(b_cidrs)
+            a_set, b_set = addresses_of(a_cidrs), addresses_of(b_cidrs)
+
+            for result, expected in [(a | b, a_set | b_set), (a & b, a_set & b_set), (a - b, a_set - b_set), (b - a, b_set - a_set)]:
+                self.assertEqual(addresses_of(result.to_cidrs()), expected)
+                self.assertEqual(result.total_addresses, len(expected))
+                self.assertEqual(result.to_cidrs(), [str(network) for network in collapse_addresses(IPv4Network(cidr) for cidr in result.to_cidrs())])
+
+    def test_address_space_minus_allocated(self):
+        """Testing the free space left in the private class A layout"""
+        space = AddressRanges.from_cidrs(["10.28.0.0/16"])
+        free = space - AddressRanges.from_cidrs(["10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27"])
+
+        self.assertEqual(free.to_cidrs()[:3], ["10.28.1.32/27", "10.28.1.64/26", "10.28.1.128/25"])
+        self.assertEqual(free.total_addresses, 65536 - 288)
+        self.assertIn("10.28.1.32", free)
+        self.assertNotIn("10.28.1.31", free)
+        self.assertEqual(free | AddressRanges.from_cidrs(["10.28.0.0/24", "10.28.1.0/27"]), space)
+
+    def test_complement(self):
+        """Testing the complement covers the rest of the IPv4 address space"""
+        self.assertEqual((~AddressRanges()).to_cidrs(), ["0.0.0.0/0"])
+        self.assertEqual((~AddressRanges.from_cidrs(["0.0.0.0/0"])).to_cidrs(), [])
+        self.assertEqual((~AddressRanges.from_cidrs(["128.0.0.0/1", "0.0.0.0/2"])).to_cidrs(), ["64.0.0.0/2"])
+        private = AddressRanges.from_cidrs(["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"])
+        self.assertEqual((~private).total_addresses, (1 << 32) - private.total_addresses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the differential harness (differential.py), a small run on the process pool and the
+case generator, shrinking and replaying failures.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import differential
+import ps_worker
+
+
+class TestDifferential(unittest.TestCase):
+    """
+    Testing the generated cases and the harness around them
+    """
+    def test_small_run(self):
+        """Testing a few thousand generated cases on two worker processes"""
+        summary = differential.run_differential(3000, seed=10, workers=2, share_size=500, failures_file=None)
+
+        self.assertEqual(summary["count"], 3000)
+        self.assertEqual(summary["failures"], [])
+
+    def test_cases_cover_every_kind_and_suffix(self):
+        """Testing the generator is repeatable and covers every cmdlet with every suffix and the edge addresses"""
+        cases = [differential.make_case(10, index) for index in range(len(differential.KINDS) * 33 * 4)]
+
+        self.assertEqual(cases[:50], [differential.make_case(10, index) for index in range(50)])
+        self.assertNotEqual(cases[:50], [differential.make_case(11, index) for index in range(50)])
+        self.assertEqual({(case.kind, case.suffixes[0]) for case in cases}, {(kind, suffix) for kind in differential.KINDS for suffix in range(33)})
+        addresses = {address for case in cases for address in case.addresses}
+        self.assertIn(0, addresses)
+        self.assertIn(differential.UINT_MAX_VALUE, addresses)
+
+    def test_shrink_and_replay(self):
+        """Testing a failing case is shrunk to the fewest address bits and can be replayed from the file"""
+        def fails_with_bit_5(case, result):
+            return "bit 5 is set" if case.addresses[0] & 0x20 else None
+
+        case = differential.Case(0, "Convert-IPNumToIpStr", (differential.UINT_MAX_VALUE,), (0,))
+        with mock.patch.object(differential, "check", fails_with_bit_5), ps_worker.PSWorkerPool() as pool:
+            self.assertEqual(differential.shrink(pool, case).addresses, (0x20,))
+
+        real_case = differential.make_case(10, 5)
+        handle, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(handle, "w") as failures_file:
+            json.dump({"seed": 10, "failures": [{"case": real_case._asdict()}]}, failures_file)
+        try:
+            self.assertEqual(differential.replay(path), [])
+            with mock.patch.object(differential, "check", lambda case, result: "still failing"):
+                self.assertEqual(len(differential.replay(path)), 1)
+        finally:
+            os.remove(path)
+
+    def test_process_mode_is_refused(self):
+        """Testing the command line only offers the modes the worker pool runs"""
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "differential.py")
+        for arguments, environment in ((["--mode", "process"], {}), ([], {"PSCOMMAND_MODE": "process"})):
+            result = subprocess.run([sys.executable, script, "--count", "10", *arguments], capture_output=True, text=True,
+                                    env={**os.environ, **environment}, check=False)
+            self.assertEqual(result.returncode, 2, result.stderr)
+            self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
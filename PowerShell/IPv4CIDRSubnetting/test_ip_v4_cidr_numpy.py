@@ -0,0 +1,166 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the vectorised NumPy version of the CIDR pipeline (ip_v4_cidr_numpy.py) and
+comparing it to the ipaddress module and the Python twin of the script.
+"""
+
+import random
+import unittest
+from ipaddress import IPv4Address, IPv4Network
+
+import numpy as np
+
+import ip_v4_cidr_numpy as cidr_np
+import ip_v4_cidr_subnetting as cidr
+
+
+class TestMaskTables(unittest.TestCase):
+    """
+    Testing the 33 entry mask tables against IPv4Network
+    """
+    def test_masks(self):
+        """Testing host mask, subnet mask and total count for every suffix"""
+        suffixes = np.arange(33)
+        self.assertEqual(cidr_np.get_subnet_mask_uint(suffixes).tolist(), [int(IPv4Network((0, s)).netmask) for s in range(33)])
+        self.assertEqual(cidr_np.get_host_mask_uint(32 - suffixes).tolist(), [int(IPv4Network((0, s)).hostmask) for s in range(33)])
+        self.assertEqual(cidr_np.get_host_bits_byte(suffixes).tolist(), [cidr.get_host_bits_byte(s) for s in range(33)])
+        self.assertEqual(cidr_np.get_total_count_of_ip_address(suffixes).tolist(), [IPv4Network((0, s)).num_addresses for s in range(33)])
+
+    def test_suffix_out_of_range(self):
+        """Testing suffixes outside of 0 to 32"""
+        with self.assertRaises(ValueError):
+            cidr_np.get_subnet_mask_uint([24, 33])
+        with self.assertRaises(ValueError):
+            cidr_np.get_host_mask_uint([-1])
+
+
+class TestConvertIP(unittest.TestCase):
+    """
+    Testing vectorised dotted quad parsing and formatting
+    """
+    def test_round_trip(self):
+        """Testing random addresses and edge cases both ways"""
+        rng = random.Random(7)
+        numbers = [0, 1, 255, 256, 3232235776, 169607168, 4294967295] + [rng.getrandbits(32) for _ in range(5000)]
+        strings = [str(IPv4Address(number)) for number in numbers]
+
+        self.assertEqual(cidr_np.convert_ip_str_to_ip_uint(strings).tolist(), numbers)
+        self.assertEqual(cidr_np.convert_ip_num_to_ip_str(numbers).tolist(), strings)
+
+    def test_invalid_addresses(self):
+        """Testing the same addresses the ValidatePattern regex rejects"""
+        invalid = ["256.0.0.1", "1.2.3", "1.2.3.4.5", "01.2.3.4", "1.2.3.04", "1..2.3", "a.b.c.d", "1.2.3.4 ",
+                   "", "1.2.3.4/24", "1234.1.1.1", "1.2.3.4444", "255.255.255.2555", "1.2.3.4" + "x" * 20]
+        addresses, valid = cidr_np.convert_ip_str_to_ip_uint(invalid + ["10.28.0.23"], errors="mask")
+
+        for ip_str in invalid:
+            self.assertIsNone(cidr.IP_PATTERN.match(ip_str), ip_str)
+        self.assertEqual(valid.tolist(), [False] * len(invalid) + [True])
+        self.assertEqual(addresses[-1], cidr.convert_ip_str_to_ip_uint("10.28.0.23"))
+
+        with self.assertRaises(ValueError):
+            cidr_np.convert_ip_str_to_ip_uint(["10.28.0.23", "10.28.0.256"])
+
+    def test_split_cidr(self):
+        """Testing CIDR strings are split into address and suffix, and validated"""
+        addresses, suffixes = cidr_np.split_cidr(["10.28.0.0/16", "192.168.1.128/25", "0.0.0.0/0", "255.255.255.255/32"])
+        self.assertEqual(addresses.tolist(), [169607168, 3232235904, 0, 4294967295])
+        self.assertEqual(suffixes.tolist(), [16, 25, 0, 32])
+
+        invalid = ["10.28.0.0", "10.28.0.0/33", "10.28.0.0/05", "10.28.0.0/", "10.28.0.0/16/1", "10.28.0.0/1x", "10.280.0.0/16", "10.28.0.0/123"]
+        _, _, valid = cidr_np.split_cidr(invalid + ["10.28.1.0/27"], errors="mask")
+
+        for cidr_str in invalid:
+            self.assertIsNone(cidr.CIDR_PATTERN.match(cidr_str), cidr_str)
+        self.assertEqual(valid.tolist(), [False] * len(invalid) + [True])
+
+
+class TestVectorisedPipeline(unittest.TestCase):
+    """
+    Testing the whole pipeline over every suffix with random addresses against IPv4Network
+    """
+    def __init__(self, methodName):
+        rng = np.random.default_rng(20250101)
+        self.addresses = np.concatenate([[0, 4294967295, 169607169], rng.integers(0, 1 << 32, 2000, dtype=np.uint64)]).astype(np.uint32)
+        self.suffixes = np.arange(len(self.addresses)) % 33
+        super().__init__(methodName)
+
+    def test_cidr_translation(self):
+        """Testing the Get-IPv4CIDRTranslation arrays"""
+        translation = cidr_np.get_ipv4_cidr_translation(self.addresses, self.suffixes)
+
+        for i, (address, suffix) in enumerate(zip(self.addresses.tolist(), self.suffixes.tolist())):
+            network = IPv4Network((address, suffix), strict=False)
+            self.assertEqual(translation["NetworkIP"][i], int(network.network_address))
+            self.assertEqual(translation["BroadcastIP"][i], int(network.broadcast_address))
+            self.assertEqual(translation["SubnetMask"][i], int(network.netmask))
+            self.assertEqual(translation["HostMask"][i], int(network.hostmask))
+            self.assertEqual(translation["TotalAddresses"][i], network.num_addresses)
+            self.assertEqual(translation["HostBitsSet"][i], address != int(network.network_address))
+
+            if suffix != 0:
+                expected = cidr.get_ipv4_cidr_translation(f"{IPv4Address(address)}/{suffix}")
+                self.assertEqual(translation["FirstHost"][i], expected["FirstHost"]["Numerical"])
+                self.assertEqual(translation["LastHost"][i], expected["LastHost"]["Numerical"])
+
+    def test_cidr_records(self):
+        """Testing the columnar records against the Python twin's Get-IPv4CIDRTranslation hashtable"""
+        cidrs = [f"{IPv4Address(address)}/{suffix}" for address, suffix in zip(self.addresses.tolist(), self.suffixes.tolist())]
+        records = cidr_np.IPv4CIDRRecords.from_cidrs(cidrs)
+        self.assertEqual(records.nbytes, 5 * len(cidrs))
+
+        columns = {key: (getattr(records, key), records.octets(key), records.binary(key)) for key in cidr.TRANSLATION_KEYS}
+        for i, cidr_address in enumerate(cidrs):
+            self.assertEqual(records[i], cidr.convert_to_ipv4_cidr_record(cidr_address))
+            self.assertEqual(records.TotalAddresses[i], records[i].TotalAddresses)
+            if self.suffixes[i] == 0:
+                continue
+
+            expected = cidr.get_ipv4_cidr_translation(cidr_address)
+            for key, (numerical, octets, binary) in columns.items():
+                self.assertEqual((numerical[i], octets[i], binary[i]), tuple(expected[key].values()))
+
+    def test_ip_in_subnet(self):
+        """Testing Test-IPInSubnet element wise against IPv4Network"""
+        ips = np.roll(self.addresses, 1)
+        ips[::3] = self.addresses[::3] ^ 1
+        actual = cidr_np.is_ip_in_subnet(ips, self.addresses, self.suffixes)
+        expected = [IPv4Address(ip) in IPv4Network((address, suffix), strict=False)
+                    for ip, address, suffix in zip(ips.tolist(), self.addresses.tolist(), self.suffixes.tolist())]
+
+        self.assertEqual(actual.tolist(), expected)
+
+    def test_compare_subnets(self):
+        """Testing Compare-Subnets element wise against IPv4Network.overlaps"""
+        other_addresses = np.roll(self.addresses, 5)
+        other_suffixes = np.roll(self.suffixes, 11)
+        actual = cidr_np.compare_subnets(self.addresses, self.suffixes, other_addresses, other_suffixes)
+        expected = [IPv4Network((a, sa), strict=False).overlaps(IPv4Network((b, sb), strict=False))
+                    for a, sa, b, sb in zip(self.addresses.tolist(), self.suffixes.tolist(), other_addresses.tolist(), other_suffixes.tolist())]
+
+        self.assertEqual(actual.tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,7 +29,34 @@ is what I use at home and work 😜.
 import unittest
 from ipaddress import IPv4Network, IPv4Address
 import subprocess
+import random
 import os
+import time
+
+import ps_cache
+import ps_timing
+import ps_worker
+import ip_v4_cidr_subnetting
+
+
+def setUpModule():
+    """Starting the shared worker pool once for all the test classes (see ps_worker.py)."""
+    if ps_worker.resolve_mode() != "process":
+        ps_worker.get_shared_pool()
+
+
+def tearDownModule():
+    """Stopping the shared worker pool, closing the result cache and writing the timing report."""
+    ps_worker.close_shared_pool()
+
+    report_paths = ps_timing.write_report()
+    if report_paths is not None:
+        print(f"PSCommand timings written to {' and '.join(report_paths)}")
+
+    cache = ps_cache.get_shared_cache()
+    if cache is not None:
+        print(cache.summary())
+        ps_cache.close_shared_cache()
 
 
 class PSCommand:
@@ -37,6 +64,15 @@ class PSCommand:
     Created the PSCommand class to run my powershell commands with the subprocess module, 
     the output and error pipes are all converted to text. So casting is needed to in order 
     to test for correctness.
+
+    The cmdlets are sent to the long running worker from ps_worker.py, so pwsh only starts and
+    dot-sources the script once. Set PSCOMMAND_MODE=process to start pwsh for every cmdlet.
+
+    Results are cached on disk by ps_cache.py, so a rerun against an unchanged script doesn't
+    go to PowerShell at all. Set PSCOMMAND_CACHE=refresh to run everything live.
+
+    Every invocation is timed by phase when PSCOMMAND_TIMING is set or a hook is added to
+    ps_timing.py.
     """
     def __init__(self, ps_cmd_let: str):
         """
@@ -45,14 +81,48 @@ class PSCommand:
         executed from the file.
         """
         # pylint: disable=line-too-long
+        self.__ps_cmd_let = ps_cmd_let
         self.__ps_script_cmd_str = ". " + os.path.dirname(__file__) + os.sep + "IPv4CIDRSubnetting.ps1; " + ps_cmd_let
         self.__ps_cmd_lst = ["pwsh", "-Command", self.__ps_script_cmd_str]
+        self.__live_timing = None
 
     def run_ps_command(self) -> str:
         """
         Executing the PowerShell command using pipes where stdout and stderr back to results 
         variable where the output is of type string.
         """
+        started = time.perf_counter()
+        mode = ps_worker.resolve_mode()
+        cache = ps_cache.get_shared_cache()
+        self.__live_timing = None
+        reply = cache.run(mode, self.__ps_cmd_let, self.__run_live) if cache is not None else self.__run_live()
+
+        if reply["error"] is not None:
+            print(f"PowerShell Error: {reply['error']}")
+
+        if ps_timing.enabled():
+            live = self.__live_timing or {}
+            ps_timing.record(ps_timing.call_timing(
+                [self.__ps_cmd_let], mode, started, cached=0 if self.__live_timing else 1,
+                return_code=live.get("return_code", 0 if reply["error"] is None else 1),
+                live_timings=[live["worker"]] if "worker" in live else [],
+                process_ms=live.get("process_ms", 0.0), trace=live.get("trace", ())))
+
+        return reply["output"]
+
+    def __run_live(self) -> dict:
+        """Runs the cmdlet on the shared worker pool, or in its own pwsh process in process mode."""
+        if ps_worker.resolve_mode() != "process":
+            if ps_timing.trace_enabled():
+                reply = ps_worker.get_shared_pool().request({"command": self.__ps_cmd_let, "trace": True})
+            else:
+                reply = ps_worker.get_shared_pool().run(self.__ps_cmd_let)
+
+            self.__live_timing = {"worker": {**reply["timing"], "execute_ms": reply.get("execute_ms") or 0.0},
+                                  "trace": reply.get("trace") or ()}
+            return {"output": reply["output"], "error": reply["error"]}
+
+        started = time.perf_counter()
         results = subprocess.run(
             self.__ps_cmd_lst,
             stdout=subprocess.PIPE,
@@ -61,12 +131,56 @@ class PSCommand:
             check=False
         )
 
-        if results.returncode != 0:
-            print(f"PowerShell Error: {results.stderr}")
+        self.__live_timing = {"process_ms": (time.perf_counter() - started) * 1000, "return_code": results.returncode}
+        return {"output": results.stdout, "error": results.stderr if results.returncode != 0 else None}
+
+    @staticmethod
+    def run_batch(ps_cmd_lets: list[str]) -> list[ps_worker.CmdletResult]:
+        """
+        Executing a batch of cmdlets in one round trip. The values come back as JSON so there is
+        no need to parse the text output, and each cmdlet has its own error so one bad input does
+        not fail the whole batch. Only the cmdlets that aren't in the result cache are run.
+        """
+        started = time.perf_counter()
+        mode = ps_worker.resolve_mode()
+        cache = ps_cache.get_shared_cache()
+        live_timings = [] if ps_timing.enabled() else None
+
+        def run_live(commands: list[str]) -> list[ps_worker.CmdletResult]:
+            return PSCommand.__run_batch_live(commands, live_timings)
+
+        hits = cache.hits if cache is not None else 0
+        results = cache.run_batch(mode, ps_cmd_lets, run_live) if cache is not None else run_live(ps_cmd_lets)
 
-        return results.stdout
+        if live_timings is not None:
+            ps_timing.record(ps_timing.call_timing(
+                list(ps_cmd_lets), mode, started, batch=True, cached=cache.hits - hits if cache is not None else 0,
+                return_code=sum(not result.ok for result in results), live_timings=live_timings))
 
-class TestCompareCIDRPrivateClassA(unittest.TestCase):
+        return results
+
+    @staticmethod
+    def __run_batch_live(ps_cmd_lets: list[str], timings: list[dict] = None) -> list[ps_worker.CmdletResult]:
+        """Runs the batch on the shared worker pool, or on a pwsh worker of its own in process mode."""
+        if ps_worker.resolve_mode() != "process":
+            return ps_worker.get_shared_pool().run_batch(ps_cmd_lets, timings=timings)
+
+        with ps_worker.PSWorkerPool(mode="pwsh") as pool:
+            return pool.run_batch(ps_cmd_lets, timings=timings)
+
+class PSTestCase(unittest.TestCase):
+    """
+    Base class for the tests that run cmdlets, so the timings from ps_timing.py know which test
+    (and test class) each cmdlet was for.
+    """
+    def setUp(self):
+        ps_timing.start_test(self.id())
+
+    def tearDown(self):
+        ps_timing.stop_test()
+
+
+class TestCompareCIDRPrivateClassA(PSTestCase):
 
     # pylint: disable=line-too-long
     """
@@ -343,7 +457,7 @@ class TestCompareCIDRPrivateClassA(unittest.TestCase):
         ps_cmd_actual = PSCommand('Test-IPInSubnet -IPStr "10.28.1.5" -CIDRAddress "10.28.1.0/27"').run_ps_command().strip().lower() == "true"
         self.assertTrue(ps_cmd_actual)
 
-class TestCompareCIDRPrivateClassC(unittest.TestCase):
+class TestCompareCIDRPrivateClassC(PSTestCase):
     """
     Testing Private Class C IPv4 Addresses with a subnet range of 192.168.1.0 to 192.168.1.255
     """
@@ -428,7 +542,7 @@ class TestCompareCIDRPrivateClassC(unittest.TestCase):
         ps_cmd_actual = PSCommand('Test-IPInSubnet -IPStr "192.168.2.254" -CIDRAddress "192.168.1.0/24"').run_ps_command().strip().lower() == "true"
         self.assertFalse(ps_cmd_actual)
 
-class TestSubnets(unittest.TestCase):
+class TestSubnets(PSTestCase):
     """
     Performing some min and max values of CIDR Subnet Prefix
     """
@@ -457,6 +571,129 @@ class TestSubnets(unittest.TestCase):
         ps_cmd_actual = PSCommand('Get-SubnetMaskUInt -SubnetSuffixNum 32').run_ps_command().strip()
         self.assertEqual(int(ps_cmd_actual), self.subnet_mask_num_expected)
 
+class TestBatchCompareCIDR(PSTestCase):
+    """
+    Comparing a lot more networks to IPv4Network with PSCommand.run_batch, every subnet suffix
+    from /0 to /32 with a set of random addresses.
+    """
+    def __init__(self, methodName):
+        rng = random.Random(20250101)
+        self.addresses = [0, 4294967295, 169607168, 3232235776] + [rng.getrandbits(32) for _ in range(28)]
+        self.networks = [IPv4Network((address, suffix), strict=False) for address in self.addresses for suffix in range(33)]
+        super().__init__(methodName)
+
+    def test_masks(self):
+        """Testing subnet mask, host mask and total address count for every suffix"""
+        commands = []
+        for suffix in range(33):
+            commands.append(f"Get-SubnetMaskUInt -SubnetSuffixNum {suffix}")
+            commands.append(f"Get-HostMaskUInt -HostBitsByte {32 - suffix}")
+            commands.append(f"Get-TotalCountOfIPAddress -subnetSuffixNum {suffix}")
+
+        results = PSCommand.run_batch(commands)
+
+        for suffix in range(33):
+            network = IPv4Network((0, suffix))
+            subnet_mask, host_mask, total = results[suffix * 3:suffix * 3 + 3]
+            self.assertEqual(subnet_mask.value, int(network.netmask))
+            self.assertEqual(host_mask.value, int(network.hostmask))
+
+            # 2^32 does not fit in a [uint] so the /0 count throws, but it only fails that one cmdlet
+            if suffix == 0:
+                self.assertFalse(total.ok)
+            else:
+                self.assertEqual(total.value, network.num_addresses)
+
+    def test_network_and_broadcast(self):
+        """Testing network and broadcast ip address for every suffix"""
+        commands = []
+        for address, network in zip([a for a in self.addresses for _ in range(33)], self.networks):
+            commands.append(f"Get-NetworkIpAddressUInt -IpPrefixUInt {address} -subnetMaskUInt {int(network.netmask)}")
+            commands.append(f"Get-BroadcastIpAddressUInt -networkIpUInt {int(network.network_address)} -hostMaskUInt {int(network.hostmask)}")
+
+        results = PSCommand.run_batch(commands)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([result.value for result in results[0::2]], [int(network.network_address) for network in self.networks])
+        self.assertEqual([result.value for result in results[1::2]], [int(network.broadcast_address) for network in self.networks])
+
+    def test_cidr_translation(self):
+        """Testing the Get-IPv4CIDRTranslation hashtable for every suffix"""
+        commands = [f'Get-IPv4CIDRTranslation -CIDRAddress "{IPv4Address(address)}/{suffix}"' for address in self.addresses for suffix in range(1, 33)]
+        networks = [network for network in self.networks if network.prefixlen != 0]
+
+        results = PSCommand.run_batch(commands)
+
+        for address, network, result in zip([a for a in self.addresses for _ in range(1, 33)], networks, results):
+            # The first host of 255.255.255.255/32 and last host of 0.0.0.0/32 don't fit the [uint] of Convert-IPNumToIpStr
+            if str(network) in ("0.0.0.0/32", "255.255.255.255/32"):
+                self.assertFalse(result.ok)
+                self.assertIn("IpPrefixUInt", result.error)
+                continue
+            self.assertTrue(result.ok, result.error)
+            self.assertEqual(result.value["NetworkIP"]["Numerical"], int(network.network_address))
+            self.assertEqual(result.value["NetworkIP"]["Octets"], str(network.network_address))
+            self.assertEqual(result.value["BroadcastIP"]["Octets"], str(network.broadcast_address))
+            self.assertEqual(result.value["SubnetMask"]["Binary"], format(int(network.netmask), "032b"))
+            self.assertEqual(result.value["HostMask"]["Numerical"], int(network.hostmask))
+            self.assertEqual(result.value["TotalAddresses"], network.num_addresses)
+            self.assertEqual(len(result.warnings), 1 if address != int(network.network_address) else 0)
+
+    def test_cidr_record(self):
+        """Testing the lean ConvertTo-IPv4CIDRRecord record for every suffix, including /0"""
+        commands = [f'ConvertTo-IPv4CIDRRecord -CIDRAddress "{IPv4Address(address)}/{suffix}"' for address in self.addresses for suffix in range(33)]
+
+        results = PSCommand.run_batch(commands)
+
+        for address, network, result in zip([a for a in self.addresses for _ in range(33)], self.networks, results):
+            self.assertTrue(result.ok, result.error)
+            self.assertEqual(result.value, {"NetworkIP": int(network.network_address), "SubnetSuffix": network.prefixlen})
+            self.assertEqual(len(result.warnings), 1 if address != int(network.network_address) else 0)
+
+            record = ip_v4_cidr_subnetting.IPv4CIDRRecord.from_json(result.value)
+            self.assertEqual(record.BroadcastIP, int(network.broadcast_address))
+            self.assertEqual(record["SubnetMask"]["Octets"], str(network.netmask))
+            self.assertEqual(record["HostMask"]["Binary"], format(int(network.hostmask), "032b"))
+            self.assertEqual(record.TotalAddresses, network.num_addresses)
+            self.assertEqual(str(record), str(network))
+            # The translation throws for /0 and for the first or last host outside a [uint] at the /32 edges
+            if network.prefixlen and str(network) not in ("0.0.0.0/32", "255.255.255.255/32"):
+                self.assertEqual(record.to_dict(), ip_v4_cidr_subnetting.get_ipv4_cidr_translation(str(network)))
+
+    def test_ip_in_subnet_and_compare_subnets(self):
+        """Testing Test-IPInSubnet and Compare-Subnets against IPv4Network"""
+        ip_commands = []
+        ip_expected = []
+        compare_commands = []
+        compare_expected = []
+        for network in self.networks:
+            for address in self.addresses[:8]:
+                ip_commands.append(f'Test-IPInSubnet -IPStr "{IPv4Address(address)}" -CIDRAddress "{network}"')
+                ip_expected.append(IPv4Address(address) in network)
+
+            other = IPv4Network((self.addresses[-1], (network.prefixlen * 7) % 33), strict=False)
+            compare_commands.append(f'Compare-Subnets -CIDRAddressA "{network}" -CIDRAddressB "{other}"')
+            compare_expected.append(network.overlaps(other))
+
+        results = PSCommand.run_batch(ip_commands + compare_commands)
+
+        self.assertEqual([result.value for result in results[:len(ip_commands)]], ip_expected)
+        self.assertEqual([result.value for result in results[len(ip_commands):]], compare_expected)
+
+    def test_errors_are_per_cmdlet(self):
+        """Testing that a bad input only fails its own cmdlet"""
+        results = PSCommand.run_batch([
+            "Get-SubnetMaskUInt -SubnetSuffixNum 24",
+            "Get-SubnetMaskUInt -SubnetSuffixNum 33",
+            'Test-IPInSubnet -IPStr "10.28.0.256" -CIDRAddress "10.28.0.0/16"',
+            'Test-IPInSubnet -IPStr "10.28.0.23" -CIDRAddress "10.28.0.0/16"',
+        ])
+
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertEqual(results[0].value, 4294967040)
+        self.assertIsNone(results[1].value)
+        self.assertTrue(results[3].value)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,185 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the IPv6 version of the vectorised CIDR pipeline (ip_v6_cidr_numpy.py) against the
+ipaddress module, with random addresses over every suffix from /0 to /128 plus the edge cases.
+"""
+
+import random
+import unittest
+from ipaddress import IPv6Address, IPv6Network
+
+import numpy as np
+
+import ip_v6_cidr_numpy as cidr_v6
+
+MAX_ADDRESS = (1 << 128) - 1
+
+
+def random_addresses(seed: int, count: int) -> list[int]:
+    """Edge addresses, then random ones, half of them with long runs of zero groups so :: shows up in all sorts of places."""
+    rng = random.Random(seed)
+    addresses = [0, 1, MAX_ADDRESS, 1 << 64, (1 << 64) - 1, 0x20010DB8 << 96, 0xFE80 << 112 | 1, 1 << 127]
+    while len(addresses) < count:
+        address = rng.getrandbits(128)
+        if rng.random() < 0.5:
+            for group in range(8):
+                if rng.random() < 0.5:
+                    address &= ~(0xFFFF << (16 * group))
+        addresses.append(address)
+    return addresses
+
+
+class TestMaskTables(unittest.TestCase):
+    """
+    Testing the 129 entry mask tables against IPv6Network
+    """
+    def test_masks(self):
+        """Testing host mask, subnet mask and total count for every suffix"""
+        suffixes = np.arange(129)
+        self.assertEqual(cidr_v6.from_uint64_pairs(cidr_v6.get_subnet_mask_uint(suffixes)), [int(IPv6Network((0, s)).netmask) for s in range(129)])
+        self.assertEqual(cidr_v6.from_uint64_pairs(cidr_v6.get_host_mask_uint(suffixes)), [int(IPv6Network((0, s)).hostmask) for s in range(129)])
+        self.assertEqual([int(count) for count in cidr_v6.get_total_count_of_ip_address(suffixes)], [IPv6Network((0, s)).num_addresses for s in range(129)])
+
+    def test_suffix_out_of_range(self):
+        """Testing suffixes outside of 0 to 128"""
+        with self.assertRaises(ValueError):
+            cidr_v6.get_subnet_mask_uint([64, 129])
+        with self.assertRaises(ValueError):
+            cidr_v6.get_host_mask_uint([-1])
+
+
+class TestConvertIP(unittest.TestCase):
+    """
+    Testing IPv6 parsing and compressed formatting
+    """
+    def test_round_trip(self):
+        """Testing random addresses and edge cases both ways, formatted like str(IPv6Address)"""
+        numbers = random_addresses(11, 5000)
+        strings = [str(IPv6Address(number)) for number in numbers]
+        exploded = [IPv6Address(number).exploded for number in numbers]
+
+        self.assertEqual(cidr_v6.from_uint64_pairs(cidr_v6.convert_ip_str_to_ip_uint(strings)), numbers)
+        self.assertEqual(cidr_v6.from_uint64_pairs(cidr_v6.convert_ip_str_to_ip_uint(exploded)), numbers)
+        self.assertEqual(cidr_v6.convert_ip_num_to_ip_str(cidr_v6.to_uint64_pairs(numbers)).tolist(), strings)
+        self.assertEqual(cidr_v6.from_uint64_pairs(cidr_v6.convert_ip_str_to_ip_uint(["::ffff:10.28.0.1"])), [int(IPv6Address("::ffff:10.28.0.1"))])
+
+    def test_invalid_addresses(self):
+        """Testing addresses IPv6Address rejects"""
+        invalid = ["1:2:3:4:5:6:7:8:9", "1::2::3", "12345::", "g::1", "1:2:3:4:5:6:7", "10.28.0.1", "", ":1", "1:", "::1 ", "::256.0.0.1"]
+        addresses, valid = cidr_v6.convert_ip_str_to_ip_uint(invalid + ["2001:db8::1"], errors="mask")
+
+        for ip_str in invalid:
+            with self.assertRaises(ValueError, msg=ip_str):
+                IPv6Address(ip_str)
+        self.assertEqual(valid.tolist(), [False] * len(invalid) + [True])
+        self.assertEqual(cidr_v6.from_uint64_pairs(addresses), [0] * len(invalid) + [int(IPv6Address("2001:db8::1"))])
+
+        with self.assertRaises(ValueError):
+            cidr_v6.convert_ip_str_to_ip_uint(["2001:db8::1", "2001:db8::g"])
+
+    def test_split_cidr(self):
+        """Testing CIDR strings are split into address and suffix, and validated"""
+        addresses, suffixes = cidr_v6.split_cidr(["2001:db8::/32", "fd00:1:2:3::7/64", "::/0", "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff/128"])
+        self.assertEqual(cidr_v6.from_uint64_pairs(addresses), [0x20010DB8 << 96, (0xFD000001 << 96) | (0x00020003 << 64) | 7, 0, MAX_ADDRESS])
+        self.assertEqual(suffixes.tolist(), [32, 64, 0, 128])
+
+        invalid = ["2001:db8::", "2001:db8::/129", "2001:db8::/032", "2001:db8::/", "2001:db8::/32/1", "2001:db8::/3x", "2001:db8:::/32", "10.28.0.0/16"]
+        _, _, valid = cidr_v6.split_cidr(invalid + ["2001:db8::/48"], errors="mask")
+        self.assertEqual(valid.tolist(), [False] * len(invalid) + [True])
+
+        self.assertEqual(cidr_v6.is_ipv6_str(["10.28.0.0/16", "2001:db8::/32", "::ffff:10.28.0.1"]).tolist(), [False, True, True])
+
+
+class TestVectorisedPipeline(unittest.TestCase):
+    """
+    Testing the whole pipeline over every suffix with random addresses against IPv6Network
+    """
+    def __init__(self, methodName):
+        self.numbers = random_addresses(20250101, 3000)
+        self.addresses = cidr_v6.to_uint64_pairs(self.numbers)
+        self.suffixes = np.arange(len(self.numbers)) % 129
+        self.networks = [IPv6Network((number, int(suffix)), strict=False) for number, suffix in zip(self.numbers, self.suffixes)]
+        super().__init__(methodName)
+
+    def test_cidr_translation(self):
+        """Testing the translation arrays"""
+        translation = cidr_v6.get_ipv6_cidr_translation(self.addresses, self.suffixes)
+        columns = {key: cidr_v6.from_uint64_pairs(translation[key]) for key in ("NetworkIP", "BroadcastIP", "SubnetMask", "HostMask", "FirstHost", "LastHost")}
+
+        for i, (number, network) in enumerate(zip(self.numbers, self.networks)):
+            self.assertEqual(columns["NetworkIP"][i], int(network.network_address))
+            self.assertEqual(columns["BroadcastIP"][i], int(network.broadcast_address))
+            self.assertEqual(columns["SubnetMask"][i], int(network.netmask))
+            self.assertEqual(columns["HostMask"][i], int(network.hostmask))
+            self.assertEqual(int(translation["TotalAddresses"][i]), network.num_addresses)
+            self.assertEqual(translation["HostBitsSet"][i], number != int(network.network_address))
+
+            first_host = next(iter(network.hosts()))
+            last_host = network.broadcast_address if network.prefixlen < 128 else network.network_address
+            self.assertEqual((columns["FirstHost"][i], columns["LastHost"][i]), (int(first_host), int(last_host)))
+
+    def test_cidr_records(self):
+        """Testing the columnar records against IPv6Network"""
+        cidrs = [f"{IPv6Address(number)}/{suffix}" for number, suffix in zip(self.numbers, self.suffixes.tolist())]
+        records = cidr_v6.IPv6CIDRRecords.from_cidrs(cidrs)
+        self.assertEqual(records.nbytes, 17 * len(cidrs))
+        self.assertEqual(len(records), len(cidrs))
+
+        network_strs = records.addresses("NetworkIP")
+        broadcast_strs = records.addresses("BroadcastIP")
+        for i, network in enumerate(self.networks):
+            self.assertEqual(records[i], network)
+            self.assertEqual((network_strs[i], broadcast_strs[i]), (str(network.network_address), str(network.broadcast_address)))
+
+        ips = self.addresses[:50]
+        expected = [[IPv6Address(number) in network for network in self.networks[:40]] for number in self.numbers[:50]]
+        self.assertEqual(cidr_v6.IPv6CIDRRecords(self.addresses[:40], self.suffixes[:40]).contains(ips).tolist(), expected)
+
+    def test_ip_in_subnet(self):
+        """Testing Test-IPInSubnet element wise against IPv6Network"""
+        ips = np.roll(self.addresses, 1, axis=0)
+        ips[::3] = self.addresses[::3] ^ np.array([0, 1], dtype=np.uint64)
+        ips[1::3] = self.addresses[1::3] ^ np.array([1, 0], dtype=np.uint64)
+        actual = cidr_v6.is_ip_in_subnet(ips, self.addresses, self.suffixes)
+        expected = [IPv6Address(ip) in network for ip, network in zip(cidr_v6.from_uint64_pairs(ips), self.networks)]
+
+        self.assertEqual(actual.tolist(), expected)
+        self.assertEqual(cidr_v6.is_ip_in_subnet(["2001:db8::1", "2001:db9::"], ["2001:db8::"], [32]).tolist(), [True, False])
+
+    def test_compare_subnets(self):
+        """Testing Compare-Subnets element wise against IPv6Network.overlaps"""
+        other_addresses = np.roll(self.addresses, 5, axis=0)
+        other_suffixes = np.roll(self.suffixes, 11)
+        # Some pairs that share the top bits, so plenty of them overlap
+        other_addresses[::2] = self.addresses[::2] ^ np.array([0, 0xFF], dtype=np.uint64)
+        actual = cidr_v6.compare_subnets(self.addresses, self.suffixes, other_addresses, other_suffixes)
+        expected = [network.overlaps(IPv6Network((other, int(suffix)), strict=False))
+                    for network, other, suffix in zip(self.networks, cidr_v6.from_uint64_pairs(other_addresses), other_suffixes)]
+
+        self.assertEqual(actual.tolist(), expected)
+        self.assertTrue(0 < sum(expected) < len(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the streaming log classifier (log_classifier.py) against classifying each line
+with IPv4Network.
+"""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from ipaddress import IPv4Address, IPv4Network
+
+import log_classifier
+
+CIDRS = ["10.28.0.0/16", "10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27", "192.168.1.0/24"]
+
+
+def expected_subnet(ip: str) -> str:
+    """Most specific subnet for the address the slow way"""
+    matches = [IPv4Network(cidr) for cidr in CIDRS if IPv4Address(ip) in IPv4Network(cidr)]
+    return str(max(matches, key=lambda network: network.prefixlen)) if matches else log_classifier.NO_SUBNET
+
+
+class TestLogClassifier(unittest.TestCase):
+    """
+    Testing the chunked pipeline gives the same answer no matter how the file is chunked
+    """
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(6)
+        prefixes = ["10.28.0.", "10.28.1.", "10.28.7.", "192.168.1.", "172.16.0."]
+        cls.rows = []
+        for i in range(500):
+            src = rng.choice(prefixes) + str(rng.randint(0, 255))
+            dst = rng.choice(prefixes) + str(rng.randint(0, 255))
+            cls.rows.append((f"{i},{src},{dst},443,ACCEPT", [src, dst]))
+        cls.rows.append(("no addresses here, version 1.2.3.4.5 or 999.1.1.1", []))
+
+        handle, cls.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", newline="\n") as log_file:
+            log_file.write("id,src,dst,port,action\n")
+            log_file.writelines(row + "\n" for row, _ in cls.rows)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def expected_lines(self) -> list[str]:
+        """Rows with the subnet column worked out one address at a time"""
+        return [f"{row},{';'.join(expected_subnet(ip) for ip in ips)}" for row, ips in self.rows]
+
+    def test_enrich_in_process(self):
+        """Testing enriched rows with small chunks, plain reads and memory mapped"""
+        for use_mmap in (False, True):
+            output = io.BytesIO()
+            log_classifier.enrich_file(self.path, CIDRS, output, header=True, chunk_size=256, workers=0, use_mmap=use_mmap)
+            lines = output.getvalue().decode().splitlines()
+            self.assertEqual(lines[0], "id,src,dst,port,action,subnet")
+            self.assertEqual(lines[1:], self.expected_lines())
+
+    def test_counts_on_process_pool(self):
+        """Testing per subnet counts on a process pool match counting one address at a time"""
+        expected = Counter(expected_subnet(ip) for _, ips in self.rows for ip in ips)
+        expected = {(None if subnet == log_classifier.NO_SUBNET else subnet): count for subnet, count in expected.items()}
+
+        self.assertEqual(log_classifier.count_subnets(self.path, CIDRS, chunk_size=1024, workers=2), expected)
+
+    def test_enrich_on_process_pool_keeps_order(self):
+        """Testing the ordered merge of chunks classified on a process pool"""
+        output = io.BytesIO()
+        log_classifier.enrich_file(self.path, CIDRS, output, header=True, chunk_size=300, workers=2)
+        self.assertEqual(output.getvalue().decode().splitlines()[1:], self.expected_lines())
+
+    def test_only_valid_addresses(self):
+        """Testing only whole, valid dotted quads get a subnet"""
+        log_classifier._init_worker(["0.0.0.0/0"])
+        text = b"from 10.0.0.1, to 256.1.1.1 via 1.2.3.4.5 and 192.168.001.1 ends 8.8.8.8.\r\n"
+        self.assertEqual(log_classifier.enrich_chunk(text, b"|"), text[:-2] + b"|0.0.0.0/0;0.0.0.0/0\r\n")
+        self.assertEqual(log_classifier.count_chunk(text).tolist(), [2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
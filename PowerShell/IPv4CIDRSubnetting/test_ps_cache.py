@@ -0,0 +1,113 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the cmdlet result cache from ps_cache.py with a cache file in a temporary directory,
+the cmdlets are run with the fake worker.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import ps_cache
+import ps_worker
+
+
+class TestPSResultCache(unittest.TestCase):
+    """
+    Testing hits, misses, invalidation and eviction
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "ps_cache.sqlite")
+        self.live_commands = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_live(self, commands: list[str]) -> list[ps_worker.CmdletResult]:
+        self.live_commands += commands
+        results = ps_worker.run_fake_batch(commands)["results"]
+        return [ps_worker.CmdletResult(command, result["value"], result["warnings"], result["error"])
+                for command, result in zip(commands, results)]
+
+    def test_hits_skip_the_worker(self):
+        """Testing a rerun only runs the cmdlets that weren't cached, in the same order, with errors cached too"""
+        commands = ["Get-SubnetMaskUInt -SubnetSuffixNum 24", "Get-SubnetMaskUInt -SubnetSuffixNum 33"]
+        with ps_cache.PSResultCache(self.path, cache_mode="on") as cache:
+            first = cache.run_batch("fake", commands, self.run_live)
+
+        with ps_cache.PSResultCache(self.path, cache_mode="on") as cache:
+            second = cache.run_batch("fake", ["Get-HostMaskUInt -HostBits 8"] + commands, self.run_live)
+            reply = cache.run("fake", commands[0], lambda: ps_worker.run_fake_command(commands[0]))
+            self.assertEqual(cache.run("fake", commands[0], self.fail), reply)
+            self.assertEqual((cache.hits, cache.misses), (3, 2))
+
+        self.assertEqual(second[1:], first)
+        self.assertEqual(second[0].value, 255)
+        self.assertEqual(first[0].value, 4294967040)
+        self.assertFalse(first[1].ok)
+        self.assertEqual(self.live_commands, commands + ["Get-HostMaskUInt -HostBits 8"])
+
+    def test_script_edit_invalidates(self):
+        """Testing a changed implementation hash misses and deletes the old rows, and refresh always runs live"""
+        commands = ["Get-TotalCountOfIPAddress -SubnetSuffixNum 24"]
+        with ps_cache.PSResultCache(self.path, cache_mode="on") as cache:
+            cache.run_batch("fake", commands, self.run_live)
+            self.assertEqual(cache.stats()["Entries"], 1)
+
+        with mock.patch.object(ps_cache, "implementation_hash", lambda mode: "edited"), \
+                ps_cache.PSResultCache(self.path, cache_mode="on") as cache:
+            cache.run_batch("fake", commands, self.run_live)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertEqual(cache.stats()["Entries"], 1)
+
+        with mock.patch.object(ps_cache, "implementation_hash", lambda mode: "edited"), \
+                ps_cache.PSResultCache(self.path, cache_mode="refresh") as cache:
+            cache.run_batch("fake", commands, self.run_live)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        self.assertEqual(self.live_commands, commands * 3)
+
+    def test_lru_eviction(self):
+        """Testing the least recently used results are evicted once the cache is over max_bytes"""
+        commands = [f"Get-HostMaskUInt -HostBits {bits}" for bits in range(33)]
+        with ps_cache.PSResultCache(self.path, max_bytes=1000, cache_mode="on") as cache:
+            for command in commands:
+                cache.run_batch("fake", [command], self.run_live)
+                # Keeps the first result in use so it is never the least recently used
+                cache.run_batch("fake", commands[:1], self.run_live)
+
+            stats = cache.stats()
+            self.assertLessEqual(stats["StoredBytes"], 1000)
+            self.assertGreater(stats["Evictions"], 0)
+
+            self.live_commands.clear()
+            cache.run_batch("fake", [commands[0], commands[-1], commands[1]], self.run_live)
+            self.assertEqual(self.live_commands, [commands[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the invocation timings and report from ps_timing.py, with the fake worker for the
+phases and made up timings for the report.
+"""
+
+import unittest
+
+import ps_timing
+import ps_worker
+
+
+class TestPSTiming(unittest.TestCase):
+    """
+    Testing the phases from the worker replies, the hooks and the report
+    """
+    def test_worker_phases(self):
+        """Testing the first reply of a worker has the startup time and later ones only the round trip"""
+        timings = []
+        with ps_worker.PSWorkerPool(mode="fake") as pool:
+            pool.run_batch(["Get-HostMaskUInt -HostBits 8"] * 3, chunk_size=2, timings=timings)
+
+        self.assertEqual(len(timings), 2)
+        self.assertGreater(timings[0]["spawn_ms"], 0)
+        self.assertNotIn("spawn_ms", timings[1])
+        self.assertTrue(all(timing["round_trip_ms"] >= timing["execute_ms"] > 0 for timing in timings))
+
+        phases = ps_timing.worker_phases(timings)
+        self.assertAlmostEqual(phases["execute"] + phases["ipc"], sum(timing["round_trip_ms"] for timing in timings))
+
+    def test_hooks(self):
+        """Testing hooks get every call with the current test and the phases add up to the total"""
+        calls = []
+        ps_timing.add_hook(calls.append)
+        try:
+            self.assertTrue(ps_timing.enabled())
+            ps_timing.start_test("test_module.TestClass.test_one")
+            started = 0.0
+            timing = ps_timing.call_timing(['Compare-Subnets -CIDRAddressA "10.28.0.0/16" -CIDRAddressB "10.28.0.0/25"'], "fake", started,
+                                           live_timings=[{"round_trip_ms": 2.0, "execute_ms": 1.5}])
+            ps_timing.record(timing)
+            ps_timing.stop_test()
+        finally:
+            ps_timing.remove_hook(calls.append)
+
+        self.assertEqual(calls, [timing])
+        self.assertEqual((timing.test, timing.cmdlet), ("test_module.TestClass.test_one", "Compare-Subnets"))
+        self.assertEqual(timing.arguments, '-CIDRAddressA "10.28.0.0/16" -CIDRAddressB "10.28.0.0/25"')
+        self.assertAlmostEqual(sum(timing.phases.values()), timing.total_ms)
+        self.assertEqual((timing.phases["execute"], timing.phases["ipc"]), (1.5, 0.5))
+        self.assertIn("test_module.TestClass.test_one", ps_timing.test_durations)
+
+    def test_report(self):
+        """Testing percentiles, the totals per test class and the script hot spots between Write-Debug messages"""
+        recorder = ps_timing.TimingRecorder()
+        for milliseconds in range(1, 101):
+            recorder(ps_timing.CallTiming("module.TestA.test_a", "Get-HostMaskUInt", f"-HostBits {milliseconds % 33}", "pwsh", 1, 0, 0,
+                                          float(milliseconds), {"execute": float(milliseconds)}))
+        recorder(ps_timing.CallTiming("module.TestB.test_b", "Convert-IPStrToIPUInt", '-IPStr "10.28.0.1"', "pwsh", 1, 0, 0, 10.0, {"execute": 10.0},
+                                      ({"ms": 2.0, "message": "Octet 1: 10 << 24 = 167772160"}, {"ms": 7.0, "message": "IP Unsigned Integer Value: 169607169"})))
+
+        report = recorder.report()
+        latency = report["cmdlet_latency"]["Get-HostMaskUInt"]
+        self.assertEqual((latency["p50_ms"], latency["p90_ms"], latency["p99_ms"], latency["max_ms"]), (50.0, 90.0, 99.0, 100.0))
+        self.assertEqual(report["test_classes"]["module.TestA"]["ps_ms"], 5050.0)
+        self.assertEqual(report["slowest_calls"][0]["total_ms"], 100.0)
+        self.assertEqual(report["script_hot_spots"]["Octet #: # << # = # -> IP Unsigned Integer Value: #"], {"count": 1, "total_ms": 5.0})
+        self.assertIn("Script hot spots", recorder.text_report(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the worker pool from ps_worker.py with the fake worker, so these run with or
+without pwsh installed. The line protocol, crash detection and respawning are the same for
+the pwsh worker.
+"""
+
+import sys
+import unittest
+
+import ps_worker
+
+
+class TestFakeCmdlets(unittest.TestCase):
+    """
+    Testing the fake cmdlet parsing, it needs to bind parameters the same way PowerShell does
+    """
+    def test_abbreviated_parameter(self):
+        """Testing shortened and case insensitive parameter names"""
+        reply = ps_worker.run_fake_command("Get-HostMaskUInt -HostBits 16")
+        self.assertEqual(reply["output"].strip(), "65535")
+
+        reply = ps_worker.run_fake_command("get-totalcountofipaddress -SUBNETSUFFIXNUM 24")
+        self.assertEqual(reply["output"].strip(), "256")
+
+    def test_quoted_and_positional_arguments(self):
+        """Testing quoted named arguments and positional arguments"""
+        reply = ps_worker.run_fake_command('Test-IPInSubnet -IPStr "10.28.0.23" -CIDRAddress "10.28.0.0/16"')
+        self.assertEqual(reply["output"].strip(), "True")
+
+        reply = ps_worker.run_fake_command('Compare-Subnets "192.168.1.0/25" "192.168.1.128/25"')
+        self.assertEqual(reply["output"].strip(), "False")
+
+    def test_validation_errors(self):
+        """Testing ValidateRange, ValidatePattern and [uint] conversion errors"""
+        reply = ps_worker.run_fake_command("Get-SubnetMaskUInt -SubnetSuffixNum 33")
+        self.assertEqual(reply["output"], "")
+        self.assertIn("greater than the maximum allowed range of 32", reply["error"])
+
+        reply = ps_worker.run_fake_command('Convert-IPStrToIPUInt -IPStr "256.0.0.1"')
+        self.assertIn("does not match", reply["error"])
+
+        reply = ps_worker.run_fake_command("Convert-IPNumToIpStr -IpPrefixUInt 4294967296")
+        self.assertIn("System.UInt32", reply["error"])
+
+        reply = ps_worker.run_fake_command("Get-TotalCountOfIPAddress -subnetSuffixNum 0")
+        self.assertIn("System.UInt32", reply["error"])
+
+        reply = ps_worker.run_fake_command("Get-Nothing -Value 1")
+        self.assertIn("is not recognized", reply["error"])
+
+    def test_host_bits_warning(self):
+        """Testing the host bits warning from Get-IPv4CIDRTranslation"""
+        reply = ps_worker.run_fake_command('Get-IPv4CIDRTranslation -CIDRAddress "10.0.1.0/16"')
+        self.assertIsNone(reply["error"])
+        self.assertEqual(len(reply["warnings"]), 1)
+
+        reply = ps_worker.run_fake_command('Get-IPv4CIDRTranslation -CIDRAddress "10.0.0.0/16"')
+        self.assertEqual(reply["warnings"], [])
+
+
+class TestPSWorkerPool(unittest.TestCase):
+    """
+    Testing the worker pool with the fake worker process
+    """
+    def setUp(self):
+        self.pool = ps_worker.PSWorkerPool(size=2, mode="fake", timeout=10)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_run(self):
+        """Testing a round trip through the line protocol"""
+        reply = self.pool.run("Get-SubnetMaskUInt -SubnetSuffixNum 24")
+        self.assertEqual(reply["output"].strip(), "4294967040")
+        self.assertIsNone(reply["error"])
+
+    def test_run_batch(self):
+        """Testing a batch split into chunks over both workers keeps the order"""
+        commands = [f"Convert-IPNumToIpStr -IpPrefixUInt {i * 65537}" for i in range(2500)]
+        commands[1234] = "Convert-IPNumToIpStr -IpPrefixUInt -1"
+
+        results = self.pool.run_batch(commands, chunk_size=300)
+
+        self.assertEqual(len(results), 2500)
+        self.assertEqual(results[0].value, "0.0.0.0")
+        self.assertEqual(results[2499].value, "9.195.9.195")
+        self.assertFalse(results[1234].ok)
+        self.assertEqual(sum(result.ok for result in results), 2499)
+        self.assertEqual(len(self.pool.workers), 2)
+
+    def test_worker_is_reused(self):
+        """Testing the worker stays up between requests"""
+        first = ps_worker.PSWorker(ps_worker.worker_argv("fake"), timeout=10)
+        first.start()
+        try:
+            pid = first.ready_frame["pid"]
+            for suffix in range(33):
+                reply = first.request({"command": f"Get-SubnetMaskUInt -SubnetSuffixNum {suffix}"})
+                self.assertEqual(int(reply["output"]), (0xFFFFFFFF << (32 - suffix)) & 0xFFFFFFFF)
+            self.assertTrue(first.alive)
+            self.assertEqual(first.process.pid, pid)
+        finally:
+            first.close()
+        self.assertFalse(first.alive)
+
+    def test_reply_for_another_request(self):
+        """Testing a reply with the wrong id is treated as a crashed worker"""
+        script = (f"import json, sys; print({ps_worker.FRAME_PREFIX!r} + json.dumps({{'ready': True}}), flush=True); sys.stdin.readline(); "
+                  f"print({ps_worker.FRAME_PREFIX!r} + json.dumps({{'id': 99, 'output': ''}}), flush=True); sys.stdin.readline()")
+        worker = ps_worker.PSWorker([sys.executable, "-c", script], timeout=10)
+        worker.start()
+        with self.assertRaisesRegex(ps_worker.PSWorkerCrashed, "Expected the reply to request 1, got one for 99"):
+            worker.request({"command": "Get-HostBitsByte -SubnetSuffixNum 24"})
+        self.assertFalse(worker.alive)
+
+    def test_respawn_after_crash(self):
+        """Testing a crashed worker is replaced and the request is sent again"""
+        worker = ps_worker.PSWorker(ps_worker.worker_argv("fake"), timeout=10)
+        worker.start()
+        worker.kill()
+        with self.assertRaises(ps_worker.PSWorkerCrashed):
+            worker.request({"command": "Get-HostBitsByte -SubnetSuffixNum 24"})
+
+        self.pool.run("Get-HostBitsByte -SubnetSuffixNum 24")
+        for worker in self.pool.workers:
+            worker.kill()
+
+        reply = self.pool.run("Get-HostBitsByte -SubnetSuffixNum 24")
+        self.assertEqual(reply["output"].strip(), "8")
+        self.assertEqual(self.pool.respawn_count, 1)
+
+    def test_unknown_mode(self):
+        """Testing an unknown mode is rejected"""
+        with self.assertRaises(ValueError):
+            ps_worker.resolve_mode("bash")
+
+
+if __name__ == '__main__':
+    unittest.main()
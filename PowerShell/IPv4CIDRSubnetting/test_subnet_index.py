@@ -0,0 +1,98 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the longest prefix match index (subnet_index.py) against a loop of
+IPv4Address in IPv4Network checks.
+"""
+
+import random
+import unittest
+from ipaddress import IPv4Address, IPv4Network
+
+import numpy as np
+
+from subnet_index import NO_MATCH, SubnetIndex
+
+
+def naive_lookup_all(networks: list[IPv4Network], ip: int) -> list[int]:
+    """Every network the address is in, most specific (longest prefix) first."""
+    address = IPv4Address(ip)
+    matches = [i for i, network in enumerate(networks) if address in network]
+    return sorted(matches, key=lambda i: (-networks[i].prefixlen, -i))
+
+
+class TestSubnetIndex(unittest.TestCase):
+    """
+    Testing lookups on the Databricks VNet layout and on random plans
+    """
+    def test_vnet_layout(self):
+        """Testing the private class A layout from test_ip_v4_cidr_subnetting.py"""
+        index = SubnetIndex(["10.28.0.0/16", "10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27"])
+
+        self.assertEqual(index.lookup_cidrs(["10.28.0.23", "10.28.0.129", "10.28.1.5", "10.28.1.36", "10.29.2.128"]),
+                         ["10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27", "10.28.0.0/16", None])
+        self.assertEqual(index.lookup_all(["10.28.1.5"]).tolist(), [[3, 0]])
+        self.assertEqual(index.contains(["10.28.255.255", "10.27.255.255"]).tolist(), [True, False])
+
+    def test_edges(self):
+        """Testing /0, /32, duplicates and addresses right at the network and broadcast"""
+        index = SubnetIndex(["0.0.0.0/0", "255.255.255.255/32", "192.168.1.0/24", "192.168.1.0/24", "192.168.1.255/32"])
+
+        self.assertEqual(index.lookup(np.array([0, 4294967295, 3232235776, 3232236031, 3232236032], dtype=np.uint32)).tolist(), [0, 1, 3, 4, 0])
+        self.assertEqual(index.lookup_all(["192.168.1.255"]).tolist(), [[4, 3, 2, 0]])
+
+    def test_out_of_range_numbers(self):
+        """Testing numbers that don't fit in 32 bits are refused instead of wrapping around to another address"""
+        index = SubnetIndex(["0.0.0.0/0", "10.0.0.0/8"])
+        self.assertEqual(index.lookup([0, 167772161, 4294967295]).tolist(), [0, 1, 0])
+        for ips in ([-1], [1, 2 ** 32 + 5], [2 ** 70], np.array([-5], dtype=np.int64), [1.5]):
+            with self.assertRaisesRegex(ValueError, "UInt32"):
+                index.lookup(ips)
+
+    def test_empty(self):
+        """Testing an index without any CIDRs"""
+        index = SubnetIndex([])
+        self.assertEqual(index.lookup(["10.0.0.1"]).tolist(), [NO_MATCH])
+        self.assertEqual(index.lookup_all(["10.0.0.1"]).tolist(), [[NO_MATCH]])
+
+    def test_random_plan(self):
+        """Testing random nested plans against a loop of IPv4Network checks"""
+        rng = random.Random(4)
+        networks = []
+        for _ in range(300):
+            parent = rng.choice(networks) if networks and rng.random() < 0.7 else IPv4Network((rng.getrandbits(32), rng.randint(4, 20)), strict=False)
+            suffix = min(32, parent.prefixlen + rng.randint(0, 6))
+            offset = rng.getrandbits(32 - parent.prefixlen) if parent.prefixlen < 32 else 0
+            networks.append(IPv4Network((int(parent.network_address) + offset, suffix), strict=False))
+
+        index = SubnetIndex([str(network) for network in networks])
+        ips = [int(rng.choice(networks).network_address) + rng.getrandbits(8) for _ in range(1500)]
+        ips = [ip & 0xFFFFFFFF for ip in ips] + [rng.getrandbits(32) for _ in range(500)]
+        all_matches = index.lookup_all(np.array(ips, dtype=np.uint32))
+
+        for ip, matches in zip(ips, all_matches.tolist()):
+            self.assertEqual([match for match in matches if match != NO_MATCH], naive_lookup_all(networks, ip))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the bulk overlap audit (subnet_overlaps.py) against comparing every pair of
+subnets with IPv4Network.overlaps.
+"""
+
+import random
+import unittest
+from ipaddress import IPv4Network
+
+from subnet_overlaps import Outside, audit_plan, find_overlaps
+
+
+class TestSubnetOverlaps(unittest.TestCase):
+    """
+    Testing the sweep finds the same pairs as the O(N^2) comparison
+    """
+    def test_vnet_layout(self):
+        """Testing the private class A layout with an extra subnet overlapping the private subnet"""
+        subnets = ["10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27", "10.28.0.192/26", "10.29.0.0/24"]
+        report = audit_plan(subnets, address_spaces=["10.28.0.0/16"])
+
+        self.assertEqual(report.to_dict()["overlaps"], [["10.28.0.128/25", "10.28.0.192/26", "contains"]])
+        self.assertEqual(report.outside, [Outside(4, None)])
+        self.assertFalse(report.ok)
+        self.assertIn("10.29.0.0/24 (no address space contains it)", report.summary())
+
+    def test_declared_parents(self):
+        """Testing subnets outside their declared parent even when another address space contains them"""
+        report = audit_plan(["10.28.0.0/25", "10.30.0.0/24", "10.28.0.0/15"],
+                            address_spaces=["10.28.0.0/16", "10.30.0.0/16"],
+                            parents=["10.28.0.0/16", "10.28.0.0/16", None])
+
+        self.assertEqual(report.to_dict()["outside"], [["10.30.0.0/24", "10.28.0.0/16"], ["10.28.0.0/15", None]])
+        self.assertEqual(report.to_dict()["overlaps"], [["10.28.0.0/15", "10.28.0.0/25", "contains"]])
+
+    def test_duplicates_and_clean_plan(self):
+        """Testing duplicate subnets and a plan without any problems"""
+        self.assertEqual([overlap.kind for overlap in find_overlaps(["192.168.1.0/24", "192.168.1.0/24"])], ["duplicate"])
+        self.assertTrue(audit_plan(["192.168.1.0/25", "192.168.1.128/25"], ["192.168.1.0/24"]).ok)
+        self.assertTrue(audit_plan([]).ok)
+
+    def test_random_plan(self):
+        """Testing a random plan against every pair with IPv4Network.overlaps"""
+        rng = random.Random(5)
+        networks = [IPv4Network((rng.getrandbits(32) & 0x0AFFFFFF, rng.randint(8, 30)), strict=False) for _ in range(400)]
+        cidrs = [str(network) for network in networks]
+
+        expected = {frozenset((i, j)) for i in range(len(networks)) for j in range(i + 1, len(networks)) if networks[i].overlaps(networks[j])}
+        actual = [frozenset((overlap.outer, overlap.inner)) for overlap in find_overlaps(cidrs)]
+
+        self.assertEqual(len(actual), len(set(actual)))
+        self.assertEqual(set(actual), expected)
+        for overlap in find_overlaps(cidrs):
+            self.assertTrue(networks[overlap.inner].subnet_of(networks[overlap.outer]))
+
+
+if __name__ == '__main__':
+    unittest.main()
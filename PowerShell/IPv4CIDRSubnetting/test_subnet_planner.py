@@ -0,0 +1,106 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the buddy allocator (subnet_planner.py), the allocations are checked for overlaps
+with the overlap audit.
+"""
+
+import random
+import unittest
+from ipaddress import IPv4Network
+
+from subnet_overlaps import audit_plan
+from subnet_planner import SubnetPlanner
+
+
+class TestSubnetPlanner(unittest.TestCase):
+    """
+    Testing allocating, reserving and freeing subnets
+    """
+    def test_vnet_layout(self):
+        """Testing the private class A layout from the Compare-Subnets tests"""
+        planner = SubnetPlanner("10.28.0.0/16")
+        self.assertEqual(planner.plan([25, 27, 25]), ["10.28.0.0/25", "10.28.1.0/27", "10.28.0.128/25"])
+
+        report = planner.fragmentation()
+        self.assertEqual(report["AllocatedAddresses"], 288)
+        self.assertEqual(report["FreeAddresses"], 65536 - 288)
+        self.assertEqual(report["LargestFreeSuffix"], 17)
+        self.assertEqual(planner.free_blocks()[:2], ["10.28.1.32/27", "10.28.1.64/26"])
+
+    def test_reserve_and_free(self):
+        """Testing reserved subnets are skipped and freeing merges the buddies back together"""
+        planner = SubnetPlanner("192.168.1.0/24", reserved=["192.168.1.0/26"])
+        self.assertEqual(planner.allocate(26), "192.168.1.64/26")
+        self.assertEqual(planner.allocate(25), "192.168.1.128/25")
+
+        with self.assertRaises(ValueError):
+            planner.allocate(30)
+        with self.assertRaises(ValueError):
+            planner.reserve("192.168.1.64/27")
+
+        planner.free("192.168.1.64/26")
+        planner.free("192.168.1.0/26")
+        self.assertEqual(planner.free_blocks(), ["192.168.1.0/25"])
+        planner.free("192.168.1.128/25")
+        self.assertEqual(planner.free_blocks(), ["192.168.1.0/24"])
+        self.assertEqual(planner.fragmentation()["Fragmentation"], 0)
+
+    def test_invalid_requests(self):
+        """Testing suffixes and CIDRs outside the parent"""
+        planner = SubnetPlanner("10.28.5.7/16")
+        self.assertEqual(planner.parent_cidr, "10.28.0.0/16")
+        for cidr in ["10.29.0.0/24", "10.28.0.1/24", "10.28.0.0/15"]:
+            with self.assertRaises(ValueError):
+                planner.reserve(cidr)
+        with self.assertRaises(ValueError):
+            planner.allocate(33)
+        with self.assertRaises(ValueError):
+            planner.free("10.28.0.0/24")
+        for parent_cidr in ["10.28.0.0/40", "10.28.0.0/-1", "10.28.0.0/33"]:
+            with self.assertRaises(ValueError):
+                SubnetPlanner(parent_cidr)
+
+    def test_random_allocations(self):
+        """Testing random allocations and frees never overlap and everything merges back at the end"""
+        rng = random.Random(7)
+        planner = SubnetPlanner("10.0.0.0/8")
+        live = []
+        for _ in range(3000):
+            if live and rng.random() < 0.3:
+                planner.free(live.pop(rng.randrange(len(live))))
+            else:
+                live.append(planner.allocate(rng.randint(16, 30)))
+
+        self.assertTrue(audit_plan(live + planner.free_blocks(), ["10.0.0.0/8"]).ok)
+        used = sum(IPv4Network(cidr).num_addresses for cidr in live)
+        self.assertEqual(planner.fragmentation()["AllocatedAddresses"], used)
+        self.assertEqual(planner.fragmentation()["FreeAddresses"] + used, 1 << 24)
+
+        for cidr in live:
+            planner.free(cidr)
+        self.assertEqual(planner.free_blocks(), ["10.0.0.0/8"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing the subnet query service (subnet_service.py) on a socket in a temporary directory,
+answers are checked against the Python twin of the cmdlets and IPv4Network.
+"""
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from ipaddress import IPv4Address, IPv4Network
+from unittest import mock
+
+import subnet_service
+from ip_v4_cidr_subnetting import get_ipv4_cidr_translation
+
+PLAN = ["10.28.0.0/16", "10.28.0.0/25", "10.28.0.128/25", "10.28.1.0/27"]
+
+
+class TestSubnetService(unittest.IsolatedAsyncioTestCase):
+    """
+    Testing every op, pipelining from lots of clients, reloading and stats
+    """
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plan_path = os.path.join(self.directory, "plan.txt")
+        self.write_plan(PLAN)
+        self.service = subnet_service.SubnetService(self.plan_path, os.path.join(self.directory, "service.sock"))
+        await self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        shutil.rmtree(self.directory)
+
+    def write_plan(self, cidrs: list[str]) -> None:
+        with open(self.plan_path, "w", encoding="utf-8") as plan_file:
+            plan_file.write("# Databricks VNet\n" + "\n".join(cidrs) + "\n")
+
+    def client(self) -> subnet_service.SubnetServiceClient:
+        return subnet_service.SubnetServiceClient(self.service.socket_path)
+
+    async def test_ops(self):
+        """Testing translate, contains, overlaps and lookup give the same answers as the cmdlets"""
+        async with self.client() as client:
+            self.assertEqual(await client.request("translate", cidr="10.28.0.0/16"), get_ipv4_cidr_translation("10.28.0.0/16"))
+            translations = await client.request("translate", cidrs=["10.28.0.5/24", "10.0.0.0/8"])
+            self.assertEqual(translations[0]["NetworkIP"]["Octets"], "10.28.0.0")
+            self.assertEqual(len(translations[0]["Warnings"]), 1)
+            self.assertEqual(translations[1]["TotalAddresses"], 1 << 24)
+
+            self.assertTrue(await client.request("contains", ip="10.28.0.127", cidr="10.28.0.0/25"))
+            self.assertEqual(await client.request("contains", ips=["10.28.0.127", "10.28.0.128"], cidr="10.28.0.0/25"), [True, False])
+            self.assertEqual(await client.request("contains", ips=["10.28.255.255", "10.29.0.0"]), [True, False])
+
+            self.assertTrue(await client.request("overlaps", a="10.28.0.0/25", b="10.28.0.0/16"))
+            self.assertEqual(await client.request("overlaps", pairs=[["10.28.0.0/25", "10.28.0.128/25"], ["10.28.1.0/27", "10.28.1.16/28"]]),
+                             [False, True])
+            self.assertEqual(await client.request("overlaps", cidr="10.28.1.0/24"), ["10.28.0.0/16", "10.28.1.0/27"])
+            self.assertEqual(await client.request("overlaps", pairs=[]), [])
+
+            self.assertEqual(await client.request("lookup", ip="10.28.1.5"), "10.28.1.0/27")
+            self.assertEqual(await client.request("lookup", ip="10.28.1.5", all=True), ["10.28.1.0/27", "10.28.0.0/16"])
+            self.assertIsNone(await client.request("lookup", ip="10.29.0.1"))
+            self.assertEqual([await client.request("contains", ip=ip) for ip in ("10.28.0.0", "10.27.255.255")], [True, False])
+            self.assertEqual(await client.request("lookup", ips=["10.28.1.5", "10.28.2.1", "10.29.0.1"], all=True),
+                             [["10.28.1.0/27", "10.28.0.0/16"], ["10.28.0.0/16"], []])
+
+            # Bad requests get an error back and the connection carries on
+            responses = await client.pipeline([{"op": "translate", "cidr": "10.28.0.0/33"}, {"op": "explode"},
+                                               {"op": "lookup"}, {"op": "overlaps", "a": "10.28.0.0/16"},
+                                               {"op": "lookup", "ip": "10.28.0.256"}])
+            self.assertEqual([response["ok"] for response in responses], [False] * 5)
+            self.assertIn("CIDRAddress", responses[0]["error"])
+            with self.assertRaises(subnet_service.ServiceError):
+                await client.request("contains", ips="10.28.0.1")
+
+            # Numbers outside a [uint] are refused instead of wrapping around to another address
+            self.assertEqual(await client.request("lookup", ips=[0x0A1C0001, 0x0A1C00C8]), ["10.28.0.0/25", "10.28.0.128/25"])
+            self.assertEqual(await client.request("lookup", ip=0x0A1C0001), "10.28.0.0/25")
+            self.assertEqual(await client.request("contains", ips=[0x0A1C0001], cidr="10.28.0.0/25"), [True])
+            responses = await client.pipeline([{"op": "lookup", "ips": [2 ** 70]}, {"op": "lookup", "ips": [-1]},
+                                               {"op": "lookup", "ip": 2 ** 32 + 5}, {"op": "contains", "ips": [1, True]},
+                                               {"op": "contains", "ips": [2 ** 70], "cidr": "10.28.0.0/25"},
+                                               {"id": 10, "op": "lookup", "ip": "10.28.0.1"}])
+            self.assertEqual([response["ok"] for response in responses], [False] * 5 + [True])
+            self.assertIn("UInt32", responses[0]["error"])
+            self.assertEqual(responses[-1], {"id": 10, "ok": True, "result": "10.28.0.0/25"})
+
+
+        # Lines that aren't JSON get an error too, on a plain socket connection
+        reader, writer = await asyncio.open_unix_connection(self.service.socket_path)
+        writer.write(b'not json\n\n{"id": 9, "op": "lookup", "ip": "10.28.0.1"}\n')
+        self.assertEqual(json.loads(await reader.readline())["ok"], False)
+        self.assertEqual(json.loads(await reader.readline()), {"id": 9, "ok": True, "result": "10.28.0.0/25"})
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_pipelined_clients(self):
+        """Testing lots of clients pipelining random lookups at the same time get their own answers in order"""
+        networks = [IPv4Network(cidr) for cidr in PLAN]
+        generator = random.Random(16)
+
+        async def run_client(number: int) -> None:
+            ips = [str(IPv4Address(generator.randrange(0x0A1B0000, 0x0A1D0000))) for _ in range(200)]
+            requests = [{"id": f"{number}-{i}", "op": "lookup", "ip": ip} for i, ip in enumerate(ips)]
+            async with self.client() as client:
+                responses = await client.pipeline(requests)
+
+            self.assertEqual([response["id"] for response in responses], [request["id"] for request in requests])
+            for ip, response in zip(ips, responses):
+                matches = [network for network in networks if IPv4Address(ip) in network]
+                expected = str(max(matches, key=lambda network: network.prefixlen)) if matches else None
+                self.assertEqual(response["result"], expected, ip)
+
+        await asyncio.gather(*(run_client(number) for number in range(20)))
+        self.assertEqual(self.service.total_connections, 20)
+
+    async def test_reload(self):
+        """Testing reloading swaps the plan without dropping connections, and a bad plan keeps the old one"""
+        async with self.client() as client:
+            self.assertIsNone(await client.request("lookup", ip="192.168.1.1"))
+
+            self.write_plan(PLAN + ["192.168.0.0/16"])
+            info = await client.request("reload")
+            self.assertEqual((info["cidrs"], info["reloads"]), (5, 1))
+            self.assertEqual(await client.request("lookup", ip="192.168.1.1"), "192.168.0.0/16")
+
+            self.write_plan(["192.168.0.0/16", "not a cidr"])
+            with self.assertRaises(subnet_service.ServiceError):
+                await client.request("reload")
+            # Clients can't point the service at another file
+            with self.assertRaisesRegex(subnet_service.ServiceError, "Only the plan the service was started with"):
+                await client.request("reload", path=os.path.join(self.directory, "plan.txt"))
+            self.assertEqual(await client.request("lookup", ip="10.28.0.200"), "10.28.0.128/25")
+
+            stats = await client.request("stats")
+            self.assertEqual(stats["connections"], 1)
+            self.assertEqual(stats["plan"]["cidrs"], 5)
+            self.assertEqual(stats["ops"]["reload"]["count"], 3)
+            self.assertEqual(stats["ops"]["reload"]["errors"], 2)
+            self.assertEqual(stats["ops"]["lookup"]["count"], 3)
+            self.assertEqual(sum(stats["ops"]["lookup"]["histogram"].values()), 3)
+
+    async def test_big_batches(self):
+        """Testing batches over OFFLOAD_SIZE are answered from a thread the same as small ones"""
+        ips = [str(IPv4Address(0x0A1C0000 + i * 7)) for i in range(1000)]
+        async with self.client() as client:
+            small = await client.request("lookup", ips=ips)
+            with mock.patch.object(subnet_service, "OFFLOAD_SIZE", 100), \
+                 mock.patch.object(subnet_service, "handle_request", wraps=subnet_service.handle_request) as handle_request:
+                self.assertEqual(await client.request("lookup", ips=ips), small)
+                handle_request.assert_called_once()
+        self.assertEqual(small.count(None), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
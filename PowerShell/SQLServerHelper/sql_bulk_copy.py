@@ -0,0 +1,436 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Python version of Copy-SqlBulk from MSSqlServerHelpers.ps1 that streams. Copy-SqlBulk needs the
+whole source in a System.Data.DataTable (filled by Get-SqlData) before WriteToServer writes
+anything, so memory grows with the table and nothing is written until the read has finished.
+
+Here the source table is split into key ranges (on a unique integer key column like ProductID) and
+each range is read by its own thread on its own connection, batch_size rows at a time. The batches
+go through a bounded queue to one writer that inserts them with executemany, so reading and writing
+overlap and there are never more than a few batches in memory whatever the size of the table.
+
+Each batch is committed together with a checkpoint row in the destination database (the last key
+written for its range), in the same transaction. If the copy is interrupted, running it again
+with the same job name picks up every range after its last committed key, nothing is copied
+twice and nothing is skipped. When the copy finishes the job's checkpoint rows are deleted, so
+running the same job again is a new copy.
+
+Connections are DB-API: paths to SQLite files (or sqlite:///path) open with sqlite3, and the ADO.NET
+style connection strings in config.json are turned into ODBC connection strings for pyodbc
+(which is only imported when it's needed). Both use ? placeholders.
+
+    python sql_bulk_copy.py --config config.json --table Production.Product --key ProductID --batch-size 5000 --readers 4
+"""
+
+import argparse
+import json
+import queue
+import re
+import threading
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_READERS = 4
+DEFAULT_QUEUE_BATCHES = 8
+CHECKPOINT_TABLE = "BulkCopyCheckpoint"
+ODBC_DRIVER = "ODBC Driver 18 for SQL Server"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# ADO.NET connection string keywords to their ODBC names
+ODBC_KEYWORDS = {
+    "server": "SERVER", "data source": "SERVER", "database": "DATABASE", "initial catalog": "DATABASE",
+    "user id": "UID", "uid": "UID", "password": "PWD", "pwd": "PWD", "trustservercertificate": "TrustServerCertificate",
+    "encrypt": "Encrypt", "integrated security": "Trusted_Connection", "trusted_connection": "Trusted_Connection",
+}
+
+# One keyword=value pair of an ADO.NET connection string, a value in single or double quotes can
+# have ; in it and doubles the quote to escape it
+ADO_NET_PAIR = re.compile(r"""[\s;]*([^=;]+?)\s*=\s*("(?:[^"]|"")*"|'(?:[^']|'')*'|(?:[^;'"\s][^;]*?)?)\s*(?:;|$)""")
+
+
+class Partition(NamedTuple):
+    """A key range [low, high) of the source table and the last key that has been written for it."""
+    index: int
+    low: int
+    high: int
+    last_key: int | None
+    rows: int
+
+
+class CopyReport(NamedTuple):
+    """What a copy did. Rows are the ones copied by this run, not the ones from an earlier interrupted run."""
+    job: str
+    rows: int
+    batches: int
+    seconds: float
+    rows_per_second: float
+    peak_memory_bytes: int | None
+    partitions: int
+    resumed: bool
+
+    def summary(self) -> str:
+        memory = f", peak memory {self.peak_memory_bytes / 2 ** 20:.1f} MB" if self.peak_memory_bytes is not None else ""
+        return (f"{self.job}: {self.rows} rows in {self.batches} batches over {self.partitions} ranges in {self.seconds:.2f} s "
+                f"({self.rows_per_second:.0f} rows/s{memory}){' resumed' if self.resumed else ''}")
+
+
+def parse_connection_string(connection_string: str) -> dict[str, str]:
+    """Keywords (lower case) and values of an ADO.NET style connection string, quotes removed."""
+    pairs = {}
+    position = 0
+    while connection_string[position:].strip(" \t;"):
+        match = ADO_NET_PAIR.match(connection_string, position)
+        if match is None:
+            raise ValueError(f"Invalid connection string, can't parse it from position {position}")
+        key, value = match.groups()
+        if value[:1] in ("'", '"'):
+            value = value[1:-1].replace(value[0] * 2, value[0])
+        pairs[key.lower()] = value
+        position = match.end()
+    return pairs
+
+
+def to_odbc_connection_string(connection_string: str) -> str:
+    """ADO.NET style SQL Server connection string (like in config.json) as an ODBC connection string."""
+    parts = [f"DRIVER={{{ODBC_DRIVER}}}"]
+    for key, value in parse_connection_string(connection_string).items():
+        odbc_key = ODBC_KEYWORDS.get(key, key)
+        if value.lower() in ("true", "sspi"):
+            value = "yes"
+        elif value.lower() == "false":
+            value = "no"
+        # ODBC values in braces can have ; in them, a } inside is doubled
+        if any(character in value for character in ";{}") or value != value.strip():
+            value = "{" + value.replace("}", "}}") + "}"
+        parts.append(f"{odbc_key}={value}")
+    return ";".join(parts) + ";"
+
+
+def open_connection(connection_string: str):
+    """DB-API connection, sqlite3 for SQLite files and pyodbc for SQL Server connection strings."""
+    if connection_string.startswith("sqlite:///") or connection_string.lower().endswith(SQLITE_SUFFIXES):
+        import sqlite3  # pylint: disable=import-outside-toplevel
+        # Each reader opens its own connection and the writer's is only used by the writer thread
+        return sqlite3.connect(connection_string.removeprefix("sqlite:///"), check_same_thread=False)
+
+    try:
+        import pyodbc  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError("pyodbc is needed to copy to or from SQL Server (pip install pyodbc)") from error
+    return pyodbc.connect(to_odbc_connection_string(connection_string))
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a (schema qualified) name, Production.Product becomes "Production"."Product"."""
+    return ".".join('"' + part.strip('[]"').replace('"', '""') + '"' for part in name.split("."))
+
+
+class BulkCopy:
+    """
+    Streams a table from a source connection to a destination connection. connect_source is called
+    once per reader to give it its own connection, destination is used by the writer thread only.
+    The destination table has to exist already (like for Copy-SqlBulk).
+    """
+    def __init__(self, connect_source: Callable[[], object], destination, source_table: str, destination_table: str = None,
+                 key_column: str = None, columns: list[str] = None, where: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 readers: int = DEFAULT_READERS, queue_batches: int = DEFAULT_QUEUE_BATCHES, job: str = None,
+                 checkpoint_table: str = CHECKPOINT_TABLE):
+        if batch_size < 1 or readers < 1 or queue_batches < 1:
+            raise ValueError("batch_size, readers and queue_batches all need to be at least 1")
+        if readers > 1 and key_column is None:
+            raise ValueError("A key_column is needed to split the table between more than one reader")
+
+        self.connect_source = connect_source
+        self.destination = destination
+        self.source_table = source_table
+        self.destination_table = destination_table or source_table
+        self.key_column = key_column
+        self.columns = columns
+        self.where = where
+        self.batch_size = batch_size
+        self.readers = readers
+        self.queue_batches = queue_batches
+        self.job = job or f"{source_table} -> {self.destination_table}"
+        self.checkpoint_table = checkpoint_table
+        self.__stop = threading.Event()
+
+    def __select(self, source) -> tuple[list[str], int | None]:
+        """
+        Column names to copy and the position of the key column in them. The key has to be unique
+        and not NULL, a range is resumed after its last key so rows sharing that key would be skipped.
+        """
+        column_list = ", ".join(quote_identifier(column) for column in self.columns) if self.columns else "*"
+        cursor = source.cursor()
+        cursor.execute(f"SELECT {column_list} FROM {quote_identifier(self.source_table)} WHERE 1 = 0")
+        columns = [description[0] for description in cursor.description]
+        cursor.close()
+
+        if self.key_column is None:
+            return columns, None
+        lowered = [column.lower() for column in columns]
+        if self.key_column.lower() not in lowered:
+            raise ValueError(f"The key column {self.key_column} has to be one of the copied columns")
+
+        key = quote_identifier(self.key_column)
+        cursor = source.cursor()
+        cursor.execute(f"SELECT COUNT(*), COUNT(DISTINCT {key}) FROM {quote_identifier(self.source_table)}{self.__filter()}")
+        rows, keys = cursor.fetchone()
+        cursor.close()
+        if rows != keys:
+            raise ValueError(f"The key column {self.key_column} has to be unique and not NULL, {rows} rows only have {keys} different keys")
+        return columns, lowered.index(self.key_column.lower())
+
+    def __filter(self, *conditions: str) -> str:
+        conditions = [condition for condition in (f"({self.where})" if self.where else None, *conditions) if condition]
+        return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    def __ensure_checkpoint_table(self) -> None:
+        cursor = self.destination.cursor()
+        try:
+            cursor.execute(f"SELECT 1 FROM {quote_identifier(self.checkpoint_table)} WHERE 1 = 0")
+        except Exception:  # pylint: disable=broad-except
+            # There's no portable IF NOT EXISTS, so the table is made when selecting from it fails
+            self.destination.rollback()
+            cursor.execute(f"CREATE TABLE {quote_identifier(self.checkpoint_table)} (Job VARCHAR(400) NOT NULL, PartitionIndex INT NOT NULL, "
+                           "LowKey BIGINT NULL, HighKey BIGINT NULL, LastKey BIGINT NULL, CopiedRows BIGINT NOT NULL, "
+                           "PRIMARY KEY (Job, PartitionIndex))")
+            self.destination.commit()
+        cursor.close()
+
+    def partitions(self) -> tuple[list[Partition], bool]:
+        """
+        Key ranges for the job, from the checkpoint table when the job was started before (so a
+        resumed copy uses the same ranges), otherwise split evenly between the smallest and largest
+        key and saved to the checkpoint table. Returns the ranges and whether they were resumed.
+        """
+        self.__ensure_checkpoint_table()
+        cursor = self.destination.cursor()
+        cursor.execute(f"SELECT PartitionIndex, LowKey, HighKey, LastKey, CopiedRows FROM {quote_identifier(self.checkpoint_table)} "
+                       "WHERE Job = ? ORDER BY PartitionIndex", (self.job,))
+        saved = [Partition(*row) for row in cursor.fetchall()]
+        if saved:
+            cursor.close()
+            return saved, True
+
+        if self.key_column is None:
+            partitions = [Partition(0, None, None, None, 0)]
+        else:
+            source = self.connect_source()
+            try:
+                source_cursor = source.cursor()
+                key = quote_identifier(self.key_column)
+                source_cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {quote_identifier(self.source_table)}{self.__filter()}")
+                low, high = source_cursor.fetchone()
+            finally:
+                source.close()
+
+            if low is None:
+                partitions = [Partition(0, 0, 0, None, 0)]
+            else:
+                low, high = int(low), int(high) + 1
+                step = -(-(high - low) // self.readers)
+                partitions = [Partition(index, start, min(start + step, high), None, 0)
+                              for index, start in enumerate(range(low, high, step))]
+
+        cursor.executemany(f"INSERT INTO {quote_identifier(self.checkpoint_table)} (Job, PartitionIndex, LowKey, HighKey, LastKey, CopiedRows) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", [(self.job, *partition[:4], 0) for partition in partitions])
+        self.destination.commit()
+        cursor.close()
+        return partitions, False
+
+    def __read(self, partition: Partition, columns: list[str], batches: queue.Queue) -> None:
+        """Reader thread, puts (partition, rows, last key) on the queue and None when the range is done."""
+        try:
+            source = self.connect_source()
+            try:
+                cursor = source.cursor()
+                column_list = ", ".join(quote_identifier(column) for column in columns)
+                sql = f"SELECT {column_list} FROM {quote_identifier(self.source_table)}"
+                parameters = ()
+
+                if self.key_column is not None:
+                    key = quote_identifier(self.key_column)
+                    start_condition = f"{key} > ?" if partition.last_key is not None else f"{key} >= ?"
+                    sql += self.__filter(start_condition, f"{key} < ?") + f" ORDER BY {key}"
+                    parameters = (partition.last_key if partition.last_key is not None else partition.low, partition.high)
+                else:
+                    sql += self.__filter()
+
+                cursor.execute(sql, parameters)
+                while not self.__stop.is_set():
+                    rows = cursor.fetchmany(self.batch_size)
+                    if not rows:
+                        break
+                    self.__put(batches, (partition.index, rows))
+            finally:
+                source.close()
+            self.__put(batches, (partition.index, None))
+        except Exception as error:  # pylint: disable=broad-except
+            self.__put(batches, (partition.index, error))
+
+    def __put(self, batches: queue.Queue, item) -> None:
+        """Waits for room on the queue, gives up when the copy is stopping."""
+        while not self.__stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self, progress: Callable[[int, int], None] = None, track_memory: bool = True) -> CopyReport:
+        """
+        Copies the table and returns the report, the job's checkpoint is deleted once every range is
+        copied. progress(rows, batches) is called after every committed batch. With track_memory the
+        peak of Python's allocations during the copy is measured with tracemalloc (which slows the
+        copy down a little).
+        """
+        started = time.perf_counter()
+        if track_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        try:
+            source = self.connect_source()
+            try:
+                columns, key_position = self.__select(source)
+            finally:
+                source.close()
+
+            partitions, resumed = self.partitions()
+            if self.key_column is None and resumed and partitions[0].rows:
+                raise ValueError(f"Job {self.job} was interrupted and can't be resumed without a key column, clear its checkpoint first")
+
+            rows, batch_count = self.__copy(partitions, columns, key_position, progress)
+            # Finished, so the next run of the job is a new copy rather than a resume of this one
+            self.clear_checkpoint()
+            peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+
+        seconds = time.perf_counter() - started
+        return CopyReport(self.job, rows, batch_count, seconds, rows / seconds if seconds else 0.0, peak, len(partitions), resumed)
+
+    def __copy(self, partitions: list[Partition], columns: list[str], key_position: int | None, progress) -> tuple[int, int]:
+        """Starts a reader per unfinished range and writes the batches as they come off the queue."""
+        self.__stop.clear()
+        batches = queue.Queue(maxsize=self.queue_batches)
+        pending = [partition for partition in partitions if partition.last_key is None or partition.high is None
+                   or partition.last_key < partition.high - 1]
+        readers = [threading.Thread(target=self.__read, args=(partition, columns, batches), daemon=True) for partition in pending]
+        copied_rows = {partition.index: partition.rows for partition in partitions}
+
+        insert = (f"INSERT INTO {quote_identifier(self.destination_table)} ({', '.join(quote_identifier(column) for column in columns)}) "
+                  f"VALUES ({', '.join('?' * len(columns))})")
+        checkpoint = (f"UPDATE {quote_identifier(self.checkpoint_table)} SET LastKey = ?, CopiedRows = ? "
+                      "WHERE Job = ? AND PartitionIndex = ?")
+        rows_written = batch_count = 0
+
+        for reader in readers:
+            reader.start()
+        try:
+            cursor = self.destination.cursor()
+            running = len(readers)
+            while running:
+                index, rows = batches.get()
+                if rows is None:
+                    running -= 1
+                    continue
+                if isinstance(rows, Exception):
+                    raise rows
+
+                cursor.executemany(insert, rows)
+                copied_rows[index] += len(rows)
+                last_key = rows[-1][key_position] if key_position is not None else None
+                cursor.execute(checkpoint, (last_key, copied_rows[index], self.job, index))
+                self.destination.commit()
+
+                rows_written += len(rows)
+                batch_count += 1
+                if progress is not None:
+                    progress(rows_written, batch_count)
+            cursor.close()
+        except BaseException:
+            self.destination.rollback()
+            raise
+        finally:
+            self.__stop.set()
+            for reader in readers:
+                reader.join()
+
+        return rows_written, batch_count
+
+    def clear_checkpoint(self) -> None:
+        """Forgets the job's progress, so the next run starts from the beginning."""
+        self.__ensure_checkpoint_table()
+        cursor = self.destination.cursor()
+        cursor.execute(f"DELETE FROM {quote_identifier(self.checkpoint_table)} WHERE Job = ?", (self.job,))
+        self.destination.commit()
+        cursor.close()
+
+
+def copy_table(source_connection_string: str, destination_connection_string: str, source_table: str, destination_table: str = None,
+               **options) -> CopyReport:
+    """Opens the connections from connection strings (like the ones in config.json) and runs a BulkCopy."""
+    destination = open_connection(destination_connection_string)
+    try:
+        bulk_copy = BulkCopy(lambda: open_connection(source_connection_string), destination, source_table, destination_table,
+                             **{key: value for key, value in options.items() if key not in ("progress", "track_memory")})
+        return bulk_copy.run(options.get("progress"), options.get("track_memory", True))
+    finally:
+        destination.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streams a table from the source to the destination database in batches.")
+    parser.add_argument("--config", default="config.json", help="JSON file with SourceConnectionString and DestinationConnectionString")
+    parser.add_argument("--table", required=True, help="Source table, e.g. Production.Product")
+    parser.add_argument("--destination-table", default=None, help="Destination table (the same name as the source by default)")
+    parser.add_argument("--key", default=None, help="Unique integer key column to split the table into ranges on, e.g. ProductID")
+    parser.add_argument("--columns", nargs="+", default=None, help="Columns to copy (all of them by default)")
+    parser.add_argument("--where", default=None, help="Filter on the source rows, e.g. \"ProductLine = 'R'\"")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS)
+    parser.add_argument("--job", default=None, help="Name for the checkpoint, the same job name resumes an interrupted copy")
+    parser.add_argument("--restart", action="store_true", help="Clear the job's checkpoint and copy from the start")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+
+    destination = open_connection(config["DestinationConnectionString"])
+    try:
+        bulk_copy = BulkCopy(lambda: open_connection(config["SourceConnectionString"]), destination, args.table, args.destination_table,
+                             args.key, args.columns, args.where, args.batch_size, args.readers if args.key else 1, job=args.job)
+        if args.restart:
+            bulk_copy.clear_checkpoint()
+        print(bulk_copy.run(lambda rows, batches: print(f"\r{rows} rows", end="", flush=True)).summary())
+    finally:
+        destination.close()
+
+
+if __name__ == "__main__":
+    main()
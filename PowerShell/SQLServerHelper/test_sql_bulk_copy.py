@@ -0,0 +1,264 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing sql_bulk_copy.py end to end with SQLite files in a temporary directory standing in for
+the source and destination servers in config.json, with a Production.Product like table.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+import sql_bulk_copy
+
+PRODUCT_TABLE = """CREATE TABLE Product (ProductID INTEGER PRIMARY KEY, Name TEXT NOT NULL, ProductNumber TEXT NOT NULL,
+                   Color TEXT NULL, ListPrice REAL NOT NULL, SellStartDate TEXT NOT NULL)"""
+
+
+class Interrupted(Exception):
+    """Stands in for the copy being killed part way through."""
+
+
+class TestBulkCopy(unittest.TestCase):
+    """
+    Testing full copies, resuming interrupted copies and the batch and queue limits
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, "source.db")
+        self.destination_path = os.path.join(self.directory, "destination.db")
+
+        source = sqlite3.connect(self.source_path)
+        source.execute(PRODUCT_TABLE)
+        # Gaps in the keys so the ranges don't all have the same number of rows
+        source.executemany("INSERT INTO Product VALUES (?, ?, ?, ?, ?, ?)",
+                           [(product_id, f"Product {product_id}", f"PN-{product_id:05}", None if product_id % 3 else "Red",
+                             product_id * 1.25, "2025-01-01") for product_id in range(1, 5000) if product_id % 7 not in (2, 3)])
+        source.commit()
+        self.source_rows = source.execute("SELECT * FROM Product ORDER BY ProductID").fetchall()
+        source.close()
+
+        self.destination = sqlite3.connect(self.destination_path, check_same_thread=False)
+        self.destination.execute(PRODUCT_TABLE)
+        self.destination.commit()
+
+    def tearDown(self):
+        self.destination.close()
+        shutil.rmtree(self.directory)
+
+    def bulk_copy(self, **options) -> sql_bulk_copy.BulkCopy:
+        options = {"key_column": "ProductID", "batch_size": 100, "readers": 4, **options}
+        return sql_bulk_copy.BulkCopy(lambda: sqlite3.connect(self.source_path), self.destination, "Product", **options)
+
+    def destination_rows(self) -> list[tuple]:
+        return self.destination.execute("SELECT * FROM Product ORDER BY ProductID").fetchall()
+
+    def test_full_copy(self):
+        """Testing every row is copied once, with and without a key column and a filter"""
+        report = self.bulk_copy().run()
+        self.assertEqual(self.destination_rows(), self.source_rows)
+        self.assertEqual(report.rows, len(self.source_rows))
+        self.assertEqual(report.partitions, 4)
+        self.assertGreaterEqual(report.batches, len(self.source_rows) // 100)
+        self.assertFalse(report.resumed)
+        self.assertGreater(report.rows_per_second, 0)
+        self.assertGreater(report.peak_memory_bytes, 0)
+
+        self.destination.execute("DELETE FROM Product")
+        self.destination.commit()
+        report = self.bulk_copy(key_column=None, readers=1, job="no key").run(track_memory=False)
+        self.assertEqual(self.destination_rows(), self.source_rows)
+        self.assertIsNone(report.peak_memory_bytes)
+
+        self.destination.execute("DELETE FROM Product")
+        self.destination.commit()
+        self.bulk_copy(columns=["ProductID", "Name", "ProductNumber", "ListPrice", "SellStartDate"], where="Color = 'Red'",
+                       job="red").run()
+        self.assertEqual(self.destination_rows(), [row[:3] + (None,) + row[4:] for row in self.source_rows if row[3] == "Red"])
+
+        with self.assertRaises(ValueError):
+            self.bulk_copy(key_column=None)
+        with self.assertRaises(ValueError):
+            self.bulk_copy(columns=["Name"], job="missing key").run()
+
+    def test_resume(self):
+        """Testing an interrupted copy carries on from its checkpoint without copying any row twice"""
+        def interrupt(rows, batches):
+            if batches == 7:
+                raise Interrupted()
+
+        with self.assertRaises(Interrupted):
+            self.bulk_copy().run(interrupt)
+        copied = self.destination_rows()
+        self.assertEqual(len(copied), 700)
+        checkpoints = self.destination.execute("SELECT SUM(CopiedRows) FROM BulkCopyCheckpoint WHERE Job = 'Product -> Product'").fetchone()
+        self.assertEqual(checkpoints[0], 700)
+
+        # ProductID is the primary key, so a row copied twice would fail the insert
+        report = self.bulk_copy(readers=2).run()
+        self.assertTrue(report.resumed)
+        self.assertEqual(report.partitions, 4)
+        self.assertEqual(report.rows, len(self.source_rows) - 700)
+        self.assertEqual(self.destination_rows(), self.source_rows)
+        # The finished job leaves no checkpoint behind
+        self.assertEqual(self.destination.execute("SELECT COUNT(*) FROM BulkCopyCheckpoint").fetchone()[0], 0)
+
+        # Clearing the checkpoint of an interrupted job starts it again
+        self.destination.execute("DELETE FROM Product")
+        self.destination.commit()
+        with self.assertRaises(Interrupted):
+            self.bulk_copy().run(interrupt)
+        bulk_copy = self.bulk_copy()
+        bulk_copy.clear_checkpoint()
+        self.destination.execute("DELETE FROM Product")
+        self.destination.commit()
+        self.assertFalse(bulk_copy.run().resumed)
+        self.assertEqual(self.destination_rows(), self.source_rows)
+
+    def test_run_twice(self):
+        """Testing running a finished job again copies everything again, with and without a key column"""
+        for options in ({}, {"key_column": None, "readers": 1}):
+            for _ in range(2):
+                self.destination.execute("DELETE FROM Product")
+                self.destination.commit()
+                report = self.bulk_copy(**options).run()
+                self.assertFalse(report.resumed)
+                self.assertEqual(report.rows, len(self.source_rows))
+                self.assertEqual(self.destination_rows(), self.source_rows)
+
+    def test_resume_with_duplicate_key(self):
+        """Testing a key that isn't unique is refused before anything is copied, including when resuming"""
+        sale_table = "CREATE TABLE Sale (SaleID INTEGER NOT NULL, ProductID INTEGER NOT NULL, Quantity INTEGER NOT NULL)"
+        source = sqlite3.connect(self.source_path)
+        source.execute(sale_table)
+        source.executemany("INSERT INTO Sale VALUES (?, ?, ?)", [(sale_id, sale_id % 50, sale_id % 4 + 1) for sale_id in range(1, 1001)])
+        source.commit()
+        self.destination.execute(sale_table)
+        self.destination.commit()
+
+        def sales(key_column: str) -> sql_bulk_copy.BulkCopy:
+            return sql_bulk_copy.BulkCopy(lambda: sqlite3.connect(self.source_path), self.destination, "Sale",
+                                          key_column=key_column, batch_size=100, readers=2)
+
+        with self.assertRaisesRegex(ValueError, "has to be unique"):
+            sales("ProductID").run()
+        self.assertEqual(self.destination.execute("SELECT COUNT(*) FROM Sale").fetchone()[0], 0)
+
+        def interrupt(rows, batches):
+            if batches == 3:
+                raise Interrupted()
+
+        with self.assertRaises(Interrupted):
+            sales("SaleID").run(interrupt)
+        copied = self.destination.execute("SELECT COUNT(*) FROM Sale").fetchone()[0]
+        self.assertEqual(copied, 300)
+
+        # A second row with the last committed key of a range would be skipped by the resume
+        last_key = self.destination.execute("SELECT MAX(LastKey) FROM BulkCopyCheckpoint WHERE Job = 'Sale -> Sale'").fetchone()[0]
+        source.execute("INSERT INTO Sale VALUES (?, 0, 9)", (last_key,))
+        source.commit()
+        with self.assertRaisesRegex(ValueError, "1001 rows only have 1000 different keys"):
+            sales("SaleID").run()
+        self.assertEqual(self.destination.execute("SELECT COUNT(*) FROM Sale").fetchone()[0], copied)
+
+        source.execute("DELETE FROM Sale WHERE Quantity = 9")
+        source.commit()
+        source.close()
+        self.assertTrue(sales("SaleID").run().resumed)
+        self.assertEqual(self.destination.execute("SELECT COUNT(*), COUNT(DISTINCT SaleID) FROM Sale").fetchone(), (1000, 1000))
+
+    def test_failed_batch_rolls_back(self):
+        """Testing a batch that fails to insert leaves neither its rows nor its checkpoint behind"""
+        self.destination.execute("INSERT INTO Product VALUES (250, 'Already there', 'PN-00250', NULL, 1.0, '2025-01-01')")
+        self.destination.commit()
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.bulk_copy(readers=1).run()
+        # The batch with ProductID 250 in it fails, the ones before it were committed
+        failed_batch = [row[0] for row in self.source_rows].index(250) // 100
+        committed = self.source_rows[:failed_batch * 100]
+        self.assertEqual(len(self.destination_rows()), 1 + len(committed))
+        last_key = self.destination.execute("SELECT LastKey FROM BulkCopyCheckpoint").fetchone()[0]
+        self.assertEqual(last_key, committed[-1][0])
+
+    def test_bounded_memory(self):
+        """Testing batches are never bigger than batch_size and memory doesn't grow with the table like reading it all first"""
+        batch_sizes = []
+        report = self.bulk_copy(batch_size=64, queue_batches=2).run(lambda rows, batches: batch_sizes.append(rows - sum(batch_sizes)))
+        self.assertEqual(sum(batch_sizes), len(self.source_rows))
+        self.assertLessEqual(max(batch_sizes), 64)
+
+        # What Copy-SqlBulk does, the whole table in memory before writing
+        tracemalloc.start()
+        source = sqlite3.connect(self.source_path)
+        rows = source.execute("SELECT * FROM Product").fetchall()
+        materialised_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        source.close()
+        self.assertEqual(len(rows), len(self.source_rows))
+        self.assertLess(report.peak_memory_bytes, materialised_peak / 2)
+
+    def test_command_line(self):
+        """Testing the command line with a config.json pointing at the SQLite files"""
+        config_path = os.path.join(self.directory, "config.json")
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump({"SourceConnectionString": self.source_path, "DestinationConnectionString": f"sqlite:///{self.destination_path}"},
+                      config_file)
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql_bulk_copy.py")
+        output = subprocess.run([sys.executable, script, "--config", config_path, "--table", "Product", "--key", "ProductID",
+                                 "--batch-size", "500", "--readers", "3"], capture_output=True, text=True, check=True).stdout
+        self.assertIn(f"{len(self.source_rows)} rows", output)
+        self.assertEqual(self.destination_rows(), self.source_rows)
+
+
+class TestConnectionStrings(unittest.TestCase):
+    """
+    Testing config.json connection strings are turned into ODBC ones
+    """
+    def test_odbc_connection_string(self):
+        """Testing the ADO.NET keywords are renamed, booleans become yes and no and quoted values keep their ; and }"""
+        odbc = sql_bulk_copy.to_odbc_connection_string(
+            'Server=localhost;Database=AdventureWorks2022;User Id=sa;Password="p;a}ss";TrustServerCertificate=True;Encrypt=False;')
+        self.assertEqual(odbc, "DRIVER={ODBC Driver 18 for SQL Server};SERVER=localhost;DATABASE=AdventureWorks2022;UID=sa;PWD={p;a}}ss};"
+                               "TrustServerCertificate=yes;Encrypt=no;")
+
+        self.assertEqual(sql_bulk_copy.parse_connection_string("Data Source = sql01 ; Password='it''s;ok';;Integrated Security=SSPI"),
+                         {"data source": "sql01", "password": "it's;ok", "integrated security": "SSPI"})
+        with self.assertRaises(ValueError):
+            sql_bulk_copy.parse_connection_string('Server=localhost;Password="p;ass')
+
+    def test_quote_identifier(self):
+        """Testing schema qualified and bracketed names"""
+        self.assertEqual(sql_bulk_copy.quote_identifier("Production.Product"), '"Production"."Product"')
+        self.assertEqual(sql_bulk_copy.quote_identifier("[Production].[Product]"), '"Production"."Product"')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark of the HTTPSClient (https_pool.py) against cold handshakes, all against the local
+HTTPS stand-in from local_https.py with a test CA:
+
+    notebook - what requests.get(url, verify=RelativeCertPath) does every call, a new SSLContext
+               that reads the CA file, a new connection and a full handshake
+    cold     - shared SSLContext, but still a new connection and a full handshake every request
+    resumed  - shared SSLContext, new connection every request that resumes the TLS session
+    pooled   - shared SSLContext and keep-alive connections, handshakes only for the first requests
+
+    python bench_https_pool.py --requests 2000 --concurrency 8 --key-type rsa
+"""
+
+import argparse
+import http.client
+import shutil
+import ssl
+import tempfile
+from urllib.parse import urlsplit
+
+from https_pool import HTTPSClient, run_requests
+from local_https import LocalHTTPSServer, make_localhost_certificates
+
+
+class NotebookClient:
+    """A new SSLContext and connection for every request, like requests.get with verify set to the CA file."""
+    def __init__(self, ca_bundle: str):
+        self.ca_bundle = ca_bundle
+
+    def request(self, method: str, url: str):
+        parts = urlsplit(url)
+        context = ssl.create_default_context()
+        context.load_verify_locations(self.ca_bundle)
+        connection = http.client.HTTPSConnection(parts.hostname, parts.port, context=context)
+        try:
+            connection.request(method, parts.path)
+            response = connection.getresponse()
+            response.read()
+            return response
+        finally:
+            connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads sending requests")
+    parser.add_argument("--key-type", choices=("ec", "rsa"), default="rsa", help="Key type of the test certificates")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        ca_bundle, cert, key = make_localhost_certificates(directory, args.key_type)
+        with LocalHTTPSServer(cert, key) as server:
+            urls = [f"{server.url}/weatherforecast"] * args.requests
+            clients = {
+                "notebook": NotebookClient(ca_bundle),
+                "cold": HTTPSClient(ca_bundle, args.concurrency, keep_alive=False, resume_sessions=False),
+                "resumed": HTTPSClient(ca_bundle, args.concurrency, keep_alive=False),
+                "pooled": HTTPSClient(ca_bundle, args.concurrency),
+            }
+
+            print(f"|{'Mode':<10}|{'Req/s':>8}|{'p50':>10}|{'p99':>10}|{'Full handshakes':>16}|{'Resumed':>8}|")
+            print(f"|{'-' * 10}|{'-' * 8}|{'-' * 10}|{'-' * 10}|{'-' * 16}|{'-' * 8}|")
+            for mode, client in clients.items():
+                report = run_requests(client, urls, args.concurrency)
+                stats = client.stats() if isinstance(client, HTTPSClient) else {"FullHandshakes": report.requests, "ResumedHandshakes": 0}
+                print(f"|{mode:<10}|{report.requests_per_second:>8.0f}|{report.p50_ms:>7.2f} ms|{report.p99_ms:>7.2f} ms|"
+                      f"{stats['FullHandshakes']:>16}|{stats['ResumedHandshakes']:>8}|")
+                if report.errors:
+                    print(f"  {report.errors} errors, first one: {report.first_error}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
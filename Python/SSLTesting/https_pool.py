@@ -0,0 +1,320 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Client for API smoke test loops, instead of calling requests.get(url, verify=RelativeCertPath)
+over and over like the notebook does. Every one of those calls opens a new connection, does a
+full TLS handshake and reads the CA file again. HTTPSClient keeps:
+
+    * one SSLContext per CA bundle, built once and shared by every connection
+    * a keep-alive connection pool per host, so a connection is used for request after request
+    * the TLS session of each host, so a new connection resumes it (a shorter handshake with no
+      certificate exchange or chain check) instead of doing a full handshake
+
+It's built on http.client from the standard library, so it doesn't need requests installed.
+run_requests sends a list of requests from a thread pool and reports the throughput and the
+p50/p99 latency:
+
+    client = HTTPSClient(ca_bundle=RelativeCertPath)
+    client.get("https://localhost:7276/weatherforecast").json()
+    print(run_requests(client, ["https://localhost:7276/weatherforecast"] * 1000, concurrency=10).summary())
+
+bench_https_pool.py compares it to cold handshakes against a local HTTPS server.
+"""
+
+import concurrent.futures
+import http.client
+import json
+import math
+import queue
+import socket
+import ssl
+import threading
+import time
+from typing import Iterable, NamedTuple
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 10
+# Sending these again can't change anything the first attempt did (RFC 9110, 9.2.2)
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+_contexts = {}
+_contexts_lock = threading.Lock()
+
+
+def get_ssl_context(ca_bundle: str = None) -> ssl.SSLContext:
+    """
+    Shared client SSLContext for a CA bundle (None for the system CA certificates), the bundle is
+    only read the first time.
+    """
+    with _contexts_lock:
+        context = _contexts.get(ca_bundle)
+        if context is None:
+            context = _contexts[ca_bundle] = ssl.create_default_context(cafile=ca_bundle)
+        return context
+
+
+class Response(NamedTuple):
+    """Response with the whole body read, and how the connection for it was made."""
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed_ms: float
+    reused_connection: bool
+    resumed_session: bool
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that resumes a TLS session from an earlier connection to the same host."""
+    def __init__(self, host: str, port: int, context: ssl.SSLContext, timeout: float, session: ssl.SSLSession = None):
+        super().__init__(host, port, timeout=timeout, context=context)
+        self.ssl_context = context
+        self.tls_session = session
+
+    def connect(self) -> None:
+        sock = socket.create_connection((self.host, self.port), self.timeout, self.source_address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host, session=self.tls_session)
+
+
+class HTTPSConnectionPool:
+    """
+    Keep-alive connections to one host. Like PSWorkerPool, the idle queue starts with a None for
+    each connection allowed and connections are only opened when they are first needed, so there
+    are never more than max_connections open at once.
+    """
+    def __init__(self, host: str, port: int, context: ssl.SSLContext, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: float = DEFAULT_TIMEOUT, keep_alive: bool = True, resume_sessions: bool = True):
+        self.host = host
+        self.port = port
+        self.context = context
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.resume_sessions = resume_sessions
+        self.connections_opened = 0
+        self.full_handshakes = 0
+        self.resumed_handshakes = 0
+        self.__session = None
+        self.__idle = queue.LifoQueue()
+        self.__lock = threading.Lock()
+
+        for _ in range(max_connections):
+            self.__idle.put(None)
+
+    def request(self, method: str, path: str, body: bytes = None, headers: dict = None) -> Response:
+        """
+        Sends a request on an idle connection (or a new one) and reads the whole response. A
+        kept-alive connection the server has already closed is replaced and an idempotent request
+        is sent again once. Others (e.g. a POST) raise instead, the server may have acted on them
+        before it closed the connection.
+        """
+        connection = self.__idle.get()
+        try:
+            started = time.perf_counter()
+            reused = connection is not None
+            if connection is None:
+                connection = self.__open()
+
+            try:
+                response = self.__send(connection, method, path, body, headers)
+            except (http.client.RemoteDisconnected, ConnectionError, ssl.SSLEOFError):
+                if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                connection.close()
+                reused = False
+                connection = self.__open()
+                response = self.__send(connection, method, path, body, headers)
+
+            resumed = connection.sock.session_reused if connection.sock is not None else False
+            response_body = response.read()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            # TLS 1.3 session tickets only turn up after the handshake, so the session is taken once a response has been read
+            if self.resume_sessions and connection.sock is not None:
+                with self.__lock:
+                    self.__session = connection.sock.session
+
+            if not self.keep_alive or response.will_close:
+                connection.close()
+                connection = None
+
+            return Response(response.status, dict(response.getheaders()), response_body, elapsed_ms, reused, resumed)
+        except Exception:
+            if connection is not None:
+                connection.close()
+            connection = None
+            raise
+        finally:
+            self.__idle.put(connection)
+
+    def __open(self) -> _HTTPSConnection:
+        with self.__lock:
+            session = self.__session if self.resume_sessions else None
+        connection = _HTTPSConnection(self.host, self.port, self.context, self.timeout, session)
+        connection.connect()
+
+        with self.__lock:
+            self.connections_opened += 1
+            if connection.sock.session_reused:
+                self.resumed_handshakes += 1
+            else:
+                self.full_handshakes += 1
+        return connection
+
+    @staticmethod
+    def __send(connection: _HTTPSConnection, method: str, path: str, body: bytes, headers: dict) -> http.client.HTTPResponse:
+        connection.request(method, path, body=body, headers=headers or {})
+        return connection.getresponse()
+
+    def close(self) -> None:
+        """Closes the idle connections."""
+        connections = []
+        while True:
+            try:
+                connections.append(self.__idle.get_nowait())
+            except queue.Empty:
+                break
+
+        for connection in connections:
+            if connection is not None:
+                connection.close()
+            self.__idle.put(None)
+
+
+class HTTPSClient:
+    """
+    HTTPS client with a connection pool per host and an SSLContext per CA bundle. keep_alive and
+    resume_sessions can be turned off to see what each one is worth.
+    """
+    def __init__(self, ca_bundle: str = None, max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT,
+                 keep_alive: bool = True, resume_sessions: bool = True):
+        self.ca_bundle = ca_bundle
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.resume_sessions = resume_sessions
+        self.pools = {}
+        self.__lock = threading.Lock()
+
+    def pool_for(self, host: str, port: int) -> HTTPSConnectionPool:
+        """Connection pool for a host and port, made the first time it's needed."""
+        with self.__lock:
+            pool = self.pools.get((host, port))
+            if pool is None:
+                pool = self.pools[(host, port)] = HTTPSConnectionPool(
+                    host, port, get_ssl_context(self.ca_bundle), self.max_connections_per_host, self.timeout, self.keep_alive, self.resume_sessions)
+            return pool
+
+    def request(self, method: str, url: str, body: bytes = None, headers: dict = None) -> Response:
+        """Sends a request to an https:// URL."""
+        parts = urlsplit(url)
+        if parts.scheme != "https":
+            raise ValueError(f"Only https URLs are supported, got {url}")
+
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        return self.pool_for(parts.hostname, parts.port or 443).request(method, path, body, headers)
+
+    def get(self, url: str, headers: dict = None) -> Response:
+        return self.request("GET", url, headers=headers)
+
+    def stats(self) -> dict:
+        """Connections opened and handshakes done, added up over every host."""
+        pools = list(self.pools.values())
+        return {
+            "ConnectionsOpened": sum(pool.connections_opened for pool in pools),
+            "FullHandshakes": sum(pool.full_handshakes for pool in pools),
+            "ResumedHandshakes": sum(pool.resumed_handshakes for pool in pools),
+        }
+
+    def close(self) -> None:
+        for pool in list(self.pools.values()):
+            pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest rank percentile of values that are already sorted."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0), len(sorted_values) - 1)]
+
+
+class LoadReport(NamedTuple):
+    """Throughput and latency of a run_requests run, latencies in milliseconds."""
+    requests: int
+    errors: int
+    seconds: float
+    requests_per_second: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    statuses: dict[int, int]
+    first_error: str | None
+
+    def summary(self) -> str:
+        return (f"{self.requests} requests ({self.errors} errors) in {self.seconds:.2f} s, {self.requests_per_second:.0f} req/s, "
+                f"p50 {self.p50_ms:.2f} ms, p99 {self.p99_ms:.2f} ms")
+
+
+def run_requests(client, urls: Iterable[str], concurrency: int = DEFAULT_MAX_CONNECTIONS, method: str = "GET") -> LoadReport:
+    """
+    Sends a request to every URL from concurrency threads and measures each one. client can be
+    anything with a request(method, url) method, e.g. the HTTPSClient.
+    """
+    urls = list(urls)
+
+    def send(url: str) -> tuple[float, int] | Exception:
+        """Latency in milliseconds and status of one request, or the error."""
+        started = time.perf_counter()
+        try:
+            response = client.request(method, url)
+            return (time.perf_counter() - started) * 1000, response.status
+        except (OSError, http.client.HTTPException, ssl.SSLError) as error:
+            return error
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(send, urls))
+    seconds = time.perf_counter() - started
+
+    latencies = sorted(outcome[0] for outcome in outcomes if not isinstance(outcome, Exception))
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    statuses = {}
+    for outcome in outcomes:
+        if not isinstance(outcome, Exception):
+            statuses[outcome[1]] = statuses.get(outcome[1], 0) + 1
+
+    return LoadReport(len(urls), len(errors), seconds, len(urls) / seconds if seconds else 0.0, percentile(latencies, 50),
+                      percentile(latencies, 99), latencies[-1] if latencies else 0.0, statuses,
+                      f"{type(errors[0]).__name__}: {errors[0]}" if errors else None)
+
@@ -0,0 +1,120 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Local stand-ins for the tests and benchmarks, so nothing needs the network or the real dev cert:
+a test CA with certificates made by the openssl command line tool, and a small HTTPS server that
+answers /weatherforecast like the ASP.NET Core Web API template the notebook calls.
+"""
+
+import http.server
+import json
+import os
+import ssl
+import subprocess
+import threading
+
+
+def openssl(*arguments: str) -> None:
+    subprocess.run(["openssl", *arguments], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+
+
+def make_certificate(directory: str, name: str, alt_names: str | None, ca_name: str = None, days: int = 30, key_type: str = "ec") -> None:
+    """
+    Key and certificate as name.key and name.crt in directory, self-signed (a CA) when there's
+    no ca_name, otherwise signed by the CA. A negative days makes a certificate that has expired.
+    key_type is "ec" (P-256, quick to make) or "rsa" (2048 bit, like the dotnet dev cert).
+    """
+    key, cert = os.path.join(directory, f"{name}.key"), os.path.join(directory, f"{name}.crt")
+    key_options = ["-pkeyopt", "ec_paramgen_curve:prime256v1"] if key_type == "ec" else ["-pkeyopt", "rsa_keygen_bits:2048"]
+    new_key = ["-newkey", key_type, *key_options, "-nodes", "-keyout", key]
+
+    if ca_name is None:
+        openssl("req", "-x509", *new_key, "-out", cert, "-subj", f"/CN={name}", "-days", str(days))
+        return
+
+    csr, extensions = os.path.join(directory, f"{name}.csr"), os.path.join(directory, f"{name}.ext")
+    with open(extensions, "w", encoding="utf-8") as extensions_file:
+        extensions_file.write(f"subjectAltName={alt_names}\n")
+    openssl("req", *new_key, "-out", csr, "-subj", f"/CN={name}")
+    openssl("x509", "-req", "-in", csr, "-CA", os.path.join(directory, f"{ca_name}.crt"), "-CAkey", os.path.join(directory, f"{ca_name}.key"),
+            "-CAcreateserial", "-out", cert, "-days", str(days), "-extfile", extensions)
+
+
+def make_localhost_certificates(directory: str, key_type: str = "ec") -> tuple[str, str, str]:
+    """Test CA plus a localhost certificate signed by it, returns the CA bundle, cert and key paths."""
+    make_certificate(directory, "test-ca", None, key_type=key_type)
+    make_certificate(directory, "localhost", "DNS:localhost,IP:127.0.0.1", "test-ca", key_type=key_type)
+    return tuple(os.path.join(directory, file_name) for file_name in ("test-ca.crt", "localhost.crt", "localhost.key"))
+
+
+class WeatherForecastHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP/1.1 (so keep-alive) handler with the same /weatherforecast JSON as the Web API template."""
+    protocol_version = "HTTP/1.1"
+    # The headers and body are separate writes, with Nagle's algorithm each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+    body = json.dumps([{"date": "2025-06-01", "temperatureC": 21, "temperatureF": 69, "summary": "Mild"}] * 5).encode()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.split("?")[0].rstrip("/").lower() != "/weatherforecast":
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class LocalHTTPSServer:
+    """
+    Threaded HTTPS server on 127.0.0.1 with a random port, used as a context manager:
+
+        with LocalHTTPSServer(cert, key) as server:
+            url = f"{server.url}/weatherforecast"
+
+    The handshake happens in the handler's thread (on the first read), not in the accept loop, so
+    slow handshakes don't hold up new connections. TLS session tickets are on, like most servers.
+    """
+    def __init__(self, cert: str, key: str, handler=WeatherForecastHandler):
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(cert, key)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.server.socket = self.context.wrap_socket(self.server.socket, server_side=True, do_handshake_on_connect=False)
+        self.port = self.server.server_address[1]
+        self.url = f"https://localhost:{self.port}"
+        self.__thread = None
+
+    def __enter__(self):
+        self.__thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.server.shutdown()
+        self.server.server_close()
+        self.__thread.join()
@@ -0,0 +1,120 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing https_pool.py against the local HTTPS stand-in from local_https.py, skipped when
+openssl isn't installed to make the test certificates.
+"""
+
+import http.client
+import shutil
+import ssl
+import tempfile
+import unittest
+
+import https_pool
+from local_https import LocalHTTPSServer, WeatherForecastHandler, make_localhost_certificates
+
+
+class SilentCloseHandler(WeatherForecastHandler):
+    """Closes the connection after every response without a Connection: close header, like a server's idle timeout."""
+    posts = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        super().do_GET()
+        self.close_connection = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        SilentCloseHandler.posts += 1
+        self.do_GET()
+
+
+@unittest.skipIf(shutil.which("openssl") is None, "openssl is needed to make the test certificates")
+class TestHTTPSClient(unittest.TestCase):
+    """
+    Testing keep-alive pooling, session resumption and the load runner
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.ca_bundle, cls.cert, cls.key = make_localhost_certificates(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_pooled_connections(self):
+        """Testing connections are kept alive and there are never more than the pool size"""
+        with LocalHTTPSServer(self.cert, self.key) as server, https_pool.HTTPSClient(self.ca_bundle, max_connections_per_host=4) as client:
+            first = client.get(f"{server.url}/weatherforecast")
+            second = client.get(f"{server.url}/weatherforecast?days=5")
+            report = https_pool.run_requests(client, [f"{server.url}/weatherforecast"] * 50 + [f"{server.url}/missing"], concurrency=8)
+            stats = client.stats()
+
+        self.assertEqual(first.status, 200)
+        self.assertEqual(first.json()[0]["summary"], "Mild")
+        self.assertEqual((first.reused_connection, second.reused_connection), (False, True))
+        self.assertEqual((report.requests, report.errors, report.statuses), (51, 0, {200: 50, 404: 1}))
+        self.assertLessEqual(report.p50_ms, report.p99_ms)
+        # The 404 from send_error closes its connection, so at most one more than the pool size
+        self.assertLessEqual(stats["ConnectionsOpened"], 5)
+        self.assertIs(https_pool.get_ssl_context(self.ca_bundle), client.pools[("localhost", server.port)].context)
+
+    def test_session_resumption(self):
+        """Testing new connections resume the TLS session instead of doing a full handshake"""
+        with LocalHTTPSServer(self.cert, self.key) as server:
+            with https_pool.HTTPSClient(self.ca_bundle, keep_alive=False) as client:
+                responses = [client.get(f"{server.url}/weatherforecast") for _ in range(5)]
+                resumed_stats = client.stats()
+            with https_pool.HTTPSClient(self.ca_bundle, keep_alive=False, resume_sessions=False) as client:
+                client.get(f"{server.url}/weatherforecast")
+                client.get(f"{server.url}/weatherforecast")
+                cold_stats = client.stats()
+
+        self.assertEqual([response.resumed_session for response in responses], [False, True, True, True, True])
+        self.assertEqual(resumed_stats, {"ConnectionsOpened": 5, "FullHandshakes": 1, "ResumedHandshakes": 4})
+        self.assertEqual(cold_stats, {"ConnectionsOpened": 2, "FullHandshakes": 2, "ResumedHandshakes": 0})
+
+    def test_stale_connection_is_replaced(self):
+        """Testing a kept-alive connection the server closed is replaced and the request sent again"""
+        with LocalHTTPSServer(self.cert, self.key, SilentCloseHandler) as server, https_pool.HTTPSClient(self.ca_bundle, 1) as client:
+            statuses = [client.get(f"{server.url}/weatherforecast").status for _ in range(3)]
+            stats = client.stats()
+
+        self.assertEqual(statuses, [200, 200, 200])
+        self.assertEqual(stats["ConnectionsOpened"], 3)
+
+        # A POST the server may already have acted on is not sent again on a new connection
+        SilentCloseHandler.posts = 0
+        with LocalHTTPSServer(self.cert, self.key, SilentCloseHandler) as server, https_pool.HTTPSClient(self.ca_bundle, 1) as client:
+            self.assertEqual(client.request("POST", f"{server.url}/weatherforecast", b"{}").status, 200)
+            with self.assertRaises((http.client.RemoteDisconnected, ConnectionError, ssl.SSLEOFError)):
+                client.request("POST", f"{server.url}/weatherforecast", b"{}")
+            self.assertEqual(client.request("POST", f"{server.url}/weatherforecast", b"{}").status, 200)
+        self.assertEqual(SilentCloseHandler.posts, 2)
+        with self.assertRaises(ValueError):
+            https_pool.HTTPSClient(self.ca_bundle).get("http://localhost/weatherforecast")
+
+
+if __name__ == '__main__':
+    unittest.main()
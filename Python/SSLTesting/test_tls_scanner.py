@@ -0,0 +1,214 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Unit testing tls_scanner.py against TLS servers started on localhost, so no network is needed.
+The CA and certificates are made with the openssl command line tool (see local_https.py) in a
+temporary directory, the tests are skipped when it isn't installed.
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import ssl
+import tempfile
+import unittest
+
+import tls_scanner
+from local_https import make_certificate
+
+
+def free_port() -> int:
+    """A port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@unittest.skipIf(shutil.which("openssl") is None, "openssl is needed to make the test certificates")
+class TestTLSScanner(unittest.IsolatedAsyncioTestCase):
+    """
+    Testing chain, expiry and hostname checks, timeouts and the bounded concurrency
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        make_certificate(cls.directory, "test-ca", None)
+        make_certificate(cls.directory, "other-ca", None)
+        make_certificate(cls.directory, "localhost", "DNS:localhost,IP:127.0.0.1", "test-ca")
+        make_certificate(cls.directory, "expired", "DNS:localhost,IP:127.0.0.1", "test-ca", days=-1)
+        make_certificate(cls.directory, "wrong-host", "DNS:other.internal", "test-ca")
+        make_certificate(cls.directory, "untrusted", "DNS:localhost,IP:127.0.0.1", "other-ca")
+        cls.ca_bundle = os.path.join(cls.directory, "test-ca.crt")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    async def asyncSetUp(self):
+        self.servers = []
+        self.active = 0
+        self.max_active = 0
+
+    async def asyncTearDown(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await reader.read()
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def start_server(self, cert_name: str = None) -> int:
+        """TLS server with the certificate, or a plain TCP server that never says anything without one."""
+        context = None
+        if cert_name is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(os.path.join(self.directory, f"{cert_name}.crt"), os.path.join(self.directory, f"{cert_name}.key"))
+
+        server = await asyncio.start_server(self.handle, "127.0.0.1", 0, ssl=context)
+        self.servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def test_certificate_checks(self):
+        """Testing a valid certificate, an expired one, one for the wrong host and one from another CA"""
+        ports = {name: await self.start_server(name) for name in ("localhost", "expired", "wrong-host", "untrusted")}
+        scanner = tls_scanner.TLSScanner(self.ca_bundle, timeout=5)
+
+        valid = await scanner.check(f"127.0.0.1:{ports['localhost']}")
+        self.assertTrue(valid.ok, valid.error)
+        self.assertTrue(valid.chain_valid and valid.hostname_match)
+        self.assertFalse(valid.expired)
+        self.assertGreater(valid.days_left, 29)
+        self.assertEqual(valid.subject_alt_names, ("DNS:localhost", "IP Address:127.0.0.1"))
+        self.assertEqual(valid.issuer, "commonName=test-ca")
+        self.assertGreater(valid.handshake_ms, 0)
+        self.assertTrue((await scanner.check(f"localhost:{ports['localhost']}")).hostname_match)
+
+        expired = await scanner.check(f"127.0.0.1:{ports['expired']}")
+        self.assertEqual((expired.ok, expired.chain_valid, expired.expired), (False, False, True))
+        self.assertIn("certificate has expired", expired.error)
+
+        wrong_host = await scanner.check(f"127.0.0.1:{ports['wrong-host']}")
+        self.assertEqual((wrong_host.ok, wrong_host.chain_valid, wrong_host.hostname_match), (False, True, False))
+        self.assertEqual(wrong_host.subject_alt_names, ("DNS:other.internal",))
+
+        untrusted = await scanner.check(f"127.0.0.1:{ports['untrusted']}")
+        self.assertEqual((untrusted.ok, untrusted.chain_valid), (False, False))
+        self.assertIn("Certificate verification failed", untrusted.error)
+
+        other_ca = tls_scanner.Endpoint("127.0.0.1", ports["untrusted"], os.path.join(self.directory, "other-ca.crt"))
+        self.assertTrue((await scanner.check(other_ca)).chain_valid)
+        self.assertEqual(set(scanner.contexts), {self.ca_bundle, other_ca.ca_bundle})
+
+    async def test_failures(self):
+        """Testing a server that never does the handshake times out, and refused connections and bad endpoints come back as results"""
+        silent_port = await self.start_server()
+        scanner = tls_scanner.TLSScanner(self.ca_bundle, timeout=0.5)
+
+        silent = await scanner.check(f"127.0.0.1:{silent_port}")
+        self.assertIn("Timed out after 0.5 seconds waiting for the handshake", silent.error)
+        self.assertIsNotNone(silent.connect_ms)
+
+        refused = await scanner.check(f"127.0.0.1:{free_port()}")
+        self.assertFalse(refused.ok)
+        self.assertIn("ConnectionRefusedError", refused.error)
+
+        self.assertIn("Invalid endpoint", (await scanner.check("127.0.0.1:https")).error)
+        missing_bundle = await scanner.check(tls_scanner.Endpoint("127.0.0.1", silent_port, os.path.join(self.directory, "missing.crt")))
+        self.assertIn("Could not load CA bundle", missing_bundle.error)
+
+    async def test_scan_streams_with_bounded_concurrency(self):
+        """Testing the results stream in as they finish, at most concurrency handshakes at a time and one SSLContext per CA bundle"""
+        port = await self.start_server("localhost")
+        silent_port = await self.start_server()
+        scanner = tls_scanner.TLSScanner(self.ca_bundle, concurrency=8, timeout=1)
+
+        endpoints = [f"127.0.0.1:{silent_port}"] + [f"127.0.0.1:{port}"] * 60
+        results = [result async for result in scanner.scan(endpoints)]
+
+        self.assertEqual(len(results), 61)
+        self.assertEqual(sum(result.ok for result in results), 60)
+        # The silent server is first in the list but finishes last
+        self.assertEqual(results[-1].port, silent_port)
+        self.assertLessEqual(self.max_active, 8)
+        self.assertEqual(list(scanner.contexts), [self.ca_bundle])
+
+
+    async def test_scan_with_slow_consumer(self):
+        """Testing the scan still ends when the consumer is slower than the workers and the results queue is full"""
+        scanner = tls_scanner.TLSScanner(self.ca_bundle, concurrency=2, timeout=1)
+        endpoints = [f"127.0.0.1:{free_port()}" for _ in range(6)]
+
+        async def consume():
+            results = []
+            async for result in scanner.scan(endpoints):
+                await asyncio.sleep(0.2)
+                results.append(result)
+            return results
+
+        results = await asyncio.wait_for(consume(), timeout=10)
+        self.assertEqual(len(results), 6)
+        self.assertFalse(any(result.ok for result in results))
+
+    async def test_scan_with_bad_lines(self):
+        """Testing a bad line in an endpoints file is reported as a result and the lines after it are still scanned"""
+        scanner = tls_scanner.TLSScanner(self.ca_bundle, concurrency=2, timeout=1)
+        lines = [f"127.0.0.1:{free_port()}\n", "bad:port\n", "# comment\n"] + [f"127.0.0.1:{free_port()}\n" for _ in range(4)]
+
+        async def consume():
+            return [result async for result in scanner.scan(tls_scanner.read_endpoints(lines))]
+
+        results = await asyncio.wait_for(consume(), timeout=10)
+        self.assertEqual(len(results), 6)
+        invalid = [result for result in results if result.error.startswith("Invalid endpoint")]
+        self.assertEqual([result.endpoint for result in invalid], ["bad:port"])
+
+
+class TestHostnameMatches(unittest.TestCase):
+    """
+    Testing the subject alternative name matching
+    """
+    def test_wildcards_and_ip_addresses(self):
+        """Testing a wildcard only covers the left most label and IP addresses only match IP Address entries"""
+        cert = {"subjectAltName": (("DNS", "*.corp.internal"), ("DNS", "api.internal"), ("IP Address", "10.28.0.4"))}
+
+        self.assertTrue(tls_scanner.hostname_matches(cert, "web.corp.internal"))
+        self.assertTrue(tls_scanner.hostname_matches(cert, "API.internal"))
+        self.assertTrue(tls_scanner.hostname_matches(cert, "10.28.0.4"))
+        self.assertFalse(tls_scanner.hostname_matches(cert, "a.web.corp.internal"))
+        self.assertFalse(tls_scanner.hostname_matches(cert, "corp.internal"))
+        self.assertFalse(tls_scanner.hostname_matches(cert, "10.28.0.5"))
+        self.assertEqual(tls_scanner.parse_endpoint("[::1]:8443"), tls_scanner.Endpoint("::1", 8443))
+        self.assertEqual(tls_scanner.parse_endpoint("10.28.0.4"), tls_scanner.Endpoint("10.28.0.4", 443))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,326 @@
+# MIT License
+
+# Copyright (c) 2025 Zamsheed Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Bulk version of the Certificate Validation cell in SSLTesting.ipynb. The notebook checks one
+endpoint with socket.create_connection, a default SSLContext with the exported certificate
+loaded and wrap_socket. Checking thousands of internal host:port endpoints that way means one
+blocking handshake after another and a new SSLContext (loading the CA bundle again) every time.
+
+TLSScanner does the same check with asyncio streams instead. A fixed number of workers pull
+endpoints and run the handshakes concurrently, each with its own timeout. There is one SSLContext
+per CA bundle, created the first time the bundle is needed and shared by every handshake after
+that. Results come out as soon as each endpoint is done:
+
+    async for result in TLSScanner(ca_bundle="Cert/localhost-ca.crt").scan(["localhost:7276", "10.28.0.4:443"]):
+        print(result.endpoint, result.ok, result.error)
+
+The chain is verified by the handshake (CERT_REQUIRED against the CA bundle). The hostname is
+checked here against the certificate's subject alternative names, and not by the handshake, so
+a certificate for the wrong host still comes back with its details and hostname_match=False.
+
+From the command line it reads host:port lines (optionally followed by a CA bundle for that
+endpoint) and prints one JSON result per line as they arrive:
+
+    python tls_scanner.py endpoints.txt --ca-bundle Cert/localhost-ca.crt --concurrency 200 --timeout 5
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import ssl
+import sys
+import time
+from typing import AsyncIterator, Iterable, NamedTuple
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_PORT = 443
+EXPIRED_VERIFY_CODE = 10  # X509_V_ERR_CERT_HAS_EXPIRED
+
+
+class Endpoint(NamedTuple):
+    """A host and port to check, against ca_bundle (None for the system CA certificates)."""
+    host: str
+    port: int = DEFAULT_PORT
+    ca_bundle: str | None = None
+
+
+class ScanResult(NamedTuple):
+    """
+    Result of checking one endpoint. ok is True when the chain is valid, the hostname matches
+    and the certificate hasn't expired. Times are in milliseconds, the certificate fields are
+    None when the handshake failed.
+    """
+    endpoint: str
+    host: str
+    port: int
+    ca_bundle: str | None
+    ok: bool
+    chain_valid: bool
+    hostname_match: bool | None
+    expired: bool | None
+    not_before: str | None
+    not_after: str | None
+    days_left: float | None
+    subject: str | None
+    issuer: str | None
+    subject_alt_names: tuple[str, ...]
+    tls_version: str | None
+    cipher: str | None
+    connect_ms: float | None
+    handshake_ms: float | None
+    error: str | None
+
+    def to_dict(self) -> dict:
+        """Result as a dictionary for JSON."""
+        return self._asdict()
+
+
+def parse_endpoint(endpoint: str | Endpoint, ca_bundle: str = None) -> Endpoint:
+    """
+    Endpoint from a 'host:port' string ('[::1]:443' for IPv6, the port defaults to 443). Endpoints
+    without a CA bundle of their own get ca_bundle.
+    """
+    if isinstance(endpoint, Endpoint):
+        return endpoint if endpoint.ca_bundle is not None else endpoint._replace(ca_bundle=ca_bundle)
+
+    endpoint = endpoint.strip()
+    if endpoint.startswith("["):
+        host, _, port = endpoint[1:].partition("]")
+        port = port.lstrip(":")
+    elif endpoint.count(":") == 1:
+        host, port = endpoint.split(":")
+    else:
+        host, port = endpoint, ""
+
+    return Endpoint(host, int(port) if port else DEFAULT_PORT, ca_bundle)
+
+
+def _failed_result(endpoint: str, host: str, port: int, ca_bundle: str | None, error: str = None) -> ScanResult:
+    """ScanResult for an endpoint that didn't get as far as a verified certificate."""
+    return ScanResult(endpoint, host, port, ca_bundle, False, False, None, None, None, None, None, None, None, (),
+                      None, None, None, None, error)
+
+
+def _name_to_str(name: tuple) -> str:
+    """getpeercert() subject or issuer as 'CN=localhost, O=...'."""
+    return ", ".join(f"{key}={value}" for rdn in name for key, value in rdn)
+
+
+def hostname_matches(cert: dict, host: str) -> bool:
+    """
+    True when host is in the certificate's subject alternative names, with a * wildcard only
+    matching the left most label. IP addresses only match IP Address entries.
+    """
+    alt_names = cert.get("subjectAltName", ())
+
+    try:
+        ip_address = ipaddress.ip_address(host)
+    except ValueError:
+        ip_address = None
+
+    if ip_address is not None:
+        for kind, value in alt_names:
+            if kind == "IP Address" and ipaddress.ip_address(value.strip()) == ip_address:
+                return True
+        return False
+
+    host_labels = host.lower().rstrip(".").split(".")
+    for kind, value in alt_names:
+        if kind != "DNS":
+            continue
+        labels = value.lower().rstrip(".").split(".")
+        if len(labels) != len(host_labels):
+            continue
+        if labels[0] == "*" and len(labels) > 2 and labels[1:] == host_labels[1:]:
+            return True
+        if labels == host_labels:
+            return True
+    return False
+
+
+class TLSScanner:
+    """
+    Checks TLS endpoints concurrently. At most concurrency handshakes are in flight at a time and
+    each endpoint gets timeout seconds for the TCP connection and the handshake together.
+    """
+    def __init__(self, ca_bundle: str = None, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT):
+        self.ca_bundle = ca_bundle
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.contexts = {}
+
+    def context_for(self, ca_bundle: str | None) -> ssl.SSLContext:
+        """
+        Shared SSLContext for a CA bundle, so the bundle is only loaded once. The context verifies
+        the chain but not the hostname, that is checked after the handshake (see hostname_matches).
+        """
+        context = self.contexts.get(ca_bundle)
+        if context is None:
+            context = ssl.create_default_context(cafile=ca_bundle)
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_REQUIRED
+            self.contexts[ca_bundle] = context
+        return context
+
+    async def check(self, endpoint: str | Endpoint) -> ScanResult:
+        """Connects to one endpoint, does the handshake and checks the certificate."""
+        try:
+            endpoint = parse_endpoint(endpoint, self.ca_bundle)
+        except ValueError as error:
+            return _failed_result(str(endpoint), str(endpoint), 0, self.ca_bundle, f"Invalid endpoint: {error}")
+
+        name = f"[{endpoint.host}]:{endpoint.port}" if ":" in endpoint.host else f"{endpoint.host}:{endpoint.port}"
+        failed = _failed_result(name, endpoint.host, endpoint.port, endpoint.ca_bundle)
+
+        try:
+            context = self.context_for(endpoint.ca_bundle)
+        except (OSError, ssl.SSLError) as error:
+            return failed._replace(error=f"Could not load CA bundle {endpoint.ca_bundle}: {error}")
+
+        deadline = time.perf_counter() + self.timeout
+        writer = None
+        try:
+            started = time.perf_counter()
+            _, writer = await asyncio.wait_for(asyncio.open_connection(endpoint.host, endpoint.port), self.timeout)
+            connect_ms = (time.perf_counter() - started) * 1000
+            failed = failed._replace(connect_ms=connect_ms)
+
+            started = time.perf_counter()
+            await asyncio.wait_for(writer.start_tls(context, server_hostname=endpoint.host), max(deadline - time.perf_counter(), 0))
+            handshake_ms = (time.perf_counter() - started) * 1000
+
+            ssl_object = writer.get_extra_info("ssl_object")
+            cert = ssl_object.getpeercert()
+            cipher = ssl_object.cipher()
+            tls_version = ssl_object.version()
+        except ssl.SSLCertVerificationError as error:
+            return failed._replace(expired=True if error.verify_code == EXPIRED_VERIFY_CODE else None,
+                                   error=f"Certificate verification failed: {error.verify_message}")
+        except (asyncio.TimeoutError, TimeoutError):
+            stage = "handshake" if failed.connect_ms is not None else "connection"
+            return failed._replace(error=f"Timed out after {self.timeout} seconds waiting for the {stage}")
+        except (OSError, ssl.SSLError, EOFError) as error:
+            return failed._replace(error=f"{type(error).__name__}: {error}")
+        finally:
+            if writer is not None:
+                writer.close()
+                try:
+                    await asyncio.wait_for(writer.wait_closed(), 1)
+                except (OSError, ssl.SSLError, asyncio.TimeoutError):
+                    pass
+
+        not_after = ssl.cert_time_to_seconds(cert["notAfter"])
+        days_left = (not_after - time.time()) / 86400
+        hostname_match = hostname_matches(cert, endpoint.host)
+        return ScanResult(name, endpoint.host, endpoint.port, endpoint.ca_bundle, hostname_match and days_left > 0,
+                          True, hostname_match, days_left <= 0, cert.get("notBefore"), cert["notAfter"], round(days_left, 2),
+                          _name_to_str(cert.get("subject", ())), _name_to_str(cert.get("issuer", ())),
+                          tuple(f"{kind}:{value}" for kind, value in cert.get("subjectAltName", ())),
+                          tls_version, cipher[0] if cipher else None, connect_ms, handshake_ms,
+                          None if hostname_match else f"Hostname {endpoint.host} does not match the certificate")
+
+    async def scan(self, endpoints: Iterable[str | Endpoint]) -> AsyncIterator[ScanResult]:
+        """
+        Checks every endpoint and yields the results in the order they finish. The endpoints are
+        pulled from the iterable as workers become free, so it can be a generator over a huge file.
+        """
+        endpoints = iter(endpoints)
+        results = asyncio.Queue(maxsize=self.concurrency)
+
+        async def worker():
+            # Taking the next endpoint never awaits, so the workers can share the iterator
+            for endpoint in endpoints:
+                await results.put(await self.check(endpoint))
+
+        async def close():
+            # The queue can be full while the consumer is busy, so the end marker has to wait its turn
+            await asyncio.wait(workers)
+            await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        closer = asyncio.create_task(close())
+
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+            for task in workers:
+                task.result()
+        finally:
+            for task in workers + [closer]:
+                task.cancel()
+
+    def scan_all(self, endpoints: Iterable[str | Endpoint]) -> list[ScanResult]:
+        """Runs scan in a new event loop and returns all the results."""
+        async def collect():
+            return [result async for result in self.scan(endpoints)]
+
+        return asyncio.run(collect())
+
+
+def read_endpoints(lines: Iterable[str]) -> Iterable[Endpoint | str]:
+    """
+    Endpoints from 'host:port [ca_bundle]' lines, blank lines and # comments are skipped. A line
+    that isn't a valid endpoint comes through as the string, so check() reports it as an invalid
+    endpoint instead of the error ending the scan.
+    """
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            parts = line.split()
+            try:
+                endpoint = parse_endpoint(parts[0], parts[1] if len(parts) > 1 else None)
+            except ValueError:
+                endpoint = parts[0]
+            yield endpoint
+
+
+async def _print_results(scanner: TLSScanner, endpoints: Iterable[Endpoint]) -> int:
+    failures = 0
+    async for result in scanner.scan(endpoints):
+        failures += not result.ok
+        print(json.dumps(result.to_dict()), flush=True)
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Checks the TLS certificates of lots of host:port endpoints.")
+    parser.add_argument("endpoints", help="File with one 'host:port [ca_bundle]' per line, - for stdin")
+    parser.add_argument("--ca-bundle", default=None, help="CA bundle for endpoints without one (system CA certificates by default)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Handshakes in flight at a time")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per endpoint")
+    args = parser.parse_args()
+
+    scanner = TLSScanner(args.ca_bundle, args.concurrency, args.timeout)
+    if args.endpoints == "-":
+        failures = asyncio.run(_print_results(scanner, read_endpoints(sys.stdin)))
+    else:
+        with open(args.endpoints, encoding="utf-8") as endpoints_file:
+            failures = asyncio.run(_print_results(scanner, read_endpoints(endpoints_file)))
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()